@@ -0,0 +1,150 @@
+import json
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from core.constants import ROWS_BATCH_SIZE
+
+CURSOR_VAR = "cursor"
+
+
+def get_estimated_count(queryset) -> int:
+    """Number of rows of `queryset` as estimated by the query planner, without reading them."""
+    (plan,) = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan["Plan"]["Plan Rows"])
+
+
+def iterate_in_batches(queryset, *fields, batch_size=ROWS_BATCH_SIZE):
+    """
+    Yield the rows of `queryset` as lists of up to `batch_size` (pk, *fields)
+    tuples. Each batch starts after the last primary key of the previous one,
+    so it is a range scan of the primary key index however far it is.
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch.values_list("pk", *fields)[:batch_size])
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        last_pk = rows[-1][0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts up to `exact_count_limit` rows, and takes the estimate of the query
+    planner for larger querysets instead of a COUNT(*) reading all of them.
+    """
+
+    exact_count_limit = 1000
+    is_estimated = False
+
+    @cached_property
+    def count(self):
+        count = self.object_list[: self.exact_count_limit + 1].count()
+        if count <= self.exact_count_limit:
+            return count
+        self.is_estimated = True
+        return max(get_estimated_count(self.object_list), count)
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Pages through the rows in the `ordering` of the ModelAdmin with a cursor,
+    the ordering values of the last row shown, rather than an OFFSET reading
+    and dropping every row before the page. The ordering must be total and its
+    fields not null. Sorting by a column header falls back to numbered pages.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.is_keyset_paginated = False
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Other filters, orderings and pages start from the first page
+        return super().get_query_string(new_params, [*(remove or ()), CURSOR_VAR])
+
+    def get_results(self, request):
+        super().get_results(request)
+        if (
+            ORDER_VAR in self.params
+            or not self.multi_page
+            or (self.show_all and self.can_show_all)
+        ):
+            return
+
+        self.keyset_fields = [
+            (name.removeprefix("-"), name.startswith("-"))
+            for name in self.model_admin.get_ordering(request)
+        ]
+        queryset = self.queryset
+        if self.cursor:
+            try:
+                queryset = queryset.filter(self.get_cursor_filter(self.cursor))
+            except (TypeError, ValueError, ValidationError) as e:
+                raise IncorrectLookupParameters(e) from e
+        self.result_list = queryset[: self.list_per_page]
+        self.is_keyset_paginated = True
+
+    def get_cursor_filter(self, cursor) -> Q:
+        """Rows after the cursor in the ordering of the changelist."""
+        values = json.loads(cursor)
+        if not isinstance(values, list) or len(values) != len(self.keyset_fields):
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+        values = [
+            self.lookup_opts.get_field(name).to_python(value)
+            for (name, _), value in zip(self.keyset_fields, values, strict=True)
+        ]
+        after = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.keyset_fields, values, strict=True):
+            after |= equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{name: value})
+        # Bound the first field too, so the scan of its index starts at the cursor
+        name, descending = self.keyset_fields[0]
+        return Q(**{f"{name}__{'lte' if descending else 'gte'}": values[0]}) & after
+
+    @property
+    def next_page_url(self):
+        if len(self.result_list) < self.list_per_page:
+            return None
+        last = self.result_list[len(self.result_list) - 1]
+        cursor = [
+            self.lookup_opts.get_field(name).value_to_string(last)
+            for name, _ in self.keyset_fields
+        ]
+        return self.get_query_string({CURSOR_VAR: json.dumps(cursor)})
+
+    @property
+    def first_page_url(self):
+        return self.get_query_string() if self.cursor else None
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin options for tables too large to be counted or paged by OFFSET on
+    every changelist request: estimated counts, keyset pagination and no facet
+    counts. Templates of the model include "admin/keyset_pagination.html" as
+    their pagination.html to get the cursor links.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
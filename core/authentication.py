@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.identity_map import USER_SNAPSHOT_FIELDS, get_user_snapshot_cache_key
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that serves the user from a cached snapshot.
+
+    The first request of a user runs the regular lookup and caches the
+    `USER_SNAPSHOT_FIELDS` of the user, following requests are authenticated
+    without touching the database. Snapshots are dropped whenever the user
+    is saved or deleted (see core.signals).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        cache_key = get_user_snapshot_cache_key(user_id)
+        snapshot = cache.get(cache_key)
+        if snapshot is None:
+            user = super().get_user(validated_token)
+            cache.set(
+                cache_key,
+                self.get_snapshot(user),
+                timeout=settings.AUTH_USER_CACHE_TIMEOUT,
+            )
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not snapshot["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+            != snapshot["token_version"]
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return self.build_user(snapshot)
+
+    def get_snapshot(self, user) -> dict:
+        snapshot = {field: getattr(user, field) for field in USER_SNAPSHOT_FIELDS}
+        # Tokens carry a hash of the password, it changes with the password
+        snapshot["token_version"] = get_md5_hash_password(user.password)
+        return snapshot
+
+    def build_user(self, snapshot) -> User:
+        """
+        Build the user as if it was loaded with `.only(*USER_SNAPSHOT_FIELDS)`:
+        other fields are fetched on access and `save()` only writes loaded fields.
+        """
+        return User.from_db(
+            "default",
+            list(USER_SNAPSHOT_FIELDS),
+            [snapshot[field] for field in USER_SNAPSHOT_FIELDS],
+        )
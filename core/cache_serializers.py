@@ -0,0 +1,120 @@
+import decimal
+import pickle
+import uuid
+import zlib
+from datetime import date, datetime
+
+import msgpack
+import zstandard
+from django.conf import settings
+from django.core.cache.backends.redis import RedisSerializer
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+# Values are stored as a codec marker, a compression marker and the payload, so
+# entries are decoded by what they are whatever the current settings say.
+# Bump the codec marker when the encoding of a value changes.
+MSGPACK_V1 = b"\x01"
+COMPRESSION_MARKERS = {None: b"-", ZLIB: b"z", ZSTD: b"s"}
+COMPRESSIONS = {
+    marker: compression for compression, marker in COMPRESSION_MARKERS.items()
+}
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# msgpack extension types for the values serializers and views put in the cache
+EXT_UUID = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+EXT_DECIMAL = 4
+
+
+def encode_ext(obj):
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(EXT_UUID, obj.bytes)
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, decimal.Decimal):
+        return msgpack.ExtType(EXT_DECIMAL, str(obj).encode())
+    raise TypeError(f"Cannot encode {type(obj).__name__} with msgpack")
+
+
+def decode_ext(code, data):
+    if code == EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == EXT_DECIMAL:
+        return decimal.Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    if compression == ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported cache compression {compression}")
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+    if compression == ZLIB:
+        return zlib.decompress(data)
+    if compression == ZSTD:
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported cache compression {compression}")
+
+
+class MsgpackSerializer(RedisSerializer):
+    """
+    Encodes cached values with msgpack instead of pickle, compressed with
+    `CACHE_VALUE_COMPRESSION` when they reach `CACHE_VALUE_COMPRESS_MIN_SIZE` bytes.
+
+    Like the default serializer, plain integers are stored as is so that
+    `incr()` keeps working on them. Tuples are read back as lists, and values
+    msgpack can't encode (e.g. model instances) are still pickled. Entries
+    pickled by the default serializer are read as well.
+    """
+
+    def __init__(self, protocol=None, compression=None, compress_min_size=None):
+        super().__init__(protocol)
+        self.compression = (
+            settings.CACHE_VALUE_COMPRESSION if compression is None else compression
+        ) or None
+        self.compress_min_size = (
+            settings.CACHE_VALUE_COMPRESS_MIN_SIZE
+            if compress_min_size is None
+            else compress_min_size
+        )
+
+    def dumps(self, obj):
+        if type(obj) is int:
+            return obj
+        try:
+            payload = msgpack.packb(obj, default=encode_ext, datetime=False)
+        except (TypeError, ValueError, OverflowError):
+            return pickle.dumps(obj, self.protocol)
+
+        compression = None
+        if self.compression and len(payload) >= self.compress_min_size:
+            compressed = compress(payload, self.compression)
+            # Already compressed bodies (e.g. rendered responses) don't shrink
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression = self.compression
+        return MSGPACK_V1 + COMPRESSION_MARKERS[compression] + payload
+
+    def loads(self, data):
+        if data[:1] == MSGPACK_V1:
+            compression = COMPRESSIONS[data[1:2]]
+            payload = data[2:]
+            if compression is not None:
+                payload = decompress(payload, compression)
+            return msgpack.unpackb(payload, ext_hook=decode_ext, strict_map_key=False)
+        return super().loads(data)
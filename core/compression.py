@@ -0,0 +1,93 @@
+import gzip
+import zlib
+
+import brotli
+import zstandard
+from django.conf import settings
+
+GZIP = "gzip"
+BROTLI = "br"
+ZSTD = "zstd"
+IDENTITY = "identity"
+
+# Levels favouring speed: responses are compressed on the request path
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported content encoding {encoding}")
+
+
+class BrotliCompressor:
+    """Gives brotli the `compress`/`flush` interface of zlib and zstandard."""
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def get_compressor(encoding: str):
+    """An incremental compressor with `compress(chunk)` and `flush()` methods."""
+    if encoding == GZIP:
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    if encoding == BROTLI:
+        return BrotliCompressor()
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    raise ValueError(f"Unsupported content encoding {encoding}")
+
+
+def compress_stream(chunks, encoding: str):
+    """Compress an iterable of byte chunks, yielding output as soon as there is some."""
+    compressor = get_compressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding of an Accept-Encoding header to its quality value."""
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def select_encoding(header: str) -> str | None:
+    """
+    Pick the first encoding of `COMPRESSION_ENCODINGS` (server preference)
+    accepted by the client, or None to send the response uncompressed.
+    """
+    qualities = parse_accept_encoding(header or "")
+    wildcard = qualities.get("*", 0.0)
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if qualities.get(encoding, wildcard) > 0:
+            return encoding
+    return None
@@ -1,2 +1,8 @@
 MAX_ROWS_TO_DOWNLOAD = 5000
+MAX_ROWS_TO_EXPORT = 1_000_000
 ROWS_BATCH_SIZE = 500
+MAX_BATCH_IDS = 500
+# Rate limit tokens taken by file downloads, and by list pages per started
+# THROTTLE_PAGE_SIZE rows (e.g. ?size=1000 costs 10)
+THROTTLE_DOWNLOAD_COST = 20
+THROTTLE_PAGE_SIZE = 100
@@ -0,0 +1,259 @@
+import asyncio
+import functools
+import json
+import logging
+import re
+import weakref
+
+import redis
+import redis.asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from redis.exceptions import RedisError
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+# Redis stream ids, "<milliseconds>-<sequence>"
+EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+# Messages a slow stream may have pending before it is closed, to resume from
+# its Last-Event-ID when the client reconnects
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+def get_event_stream_key(user_id) -> str:
+    """Capped Redis stream of the recent events of a user, for Last-Event-ID."""
+    return f"{settings.EVENTS_KEY_PREFIX}:{user_id}:backlog"
+
+
+def get_event_channel(user_id) -> str:
+    return f"{settings.EVENTS_KEY_PREFIX}:{user_id}"
+
+
+def parse_event_id(event_id) -> tuple:
+    milliseconds, sequence = str(event_id).split("-")
+    return int(milliseconds), int(sequence)
+
+
+@functools.cache
+def get_redis_client(url):
+    return redis.Redis.from_url(url)
+
+
+def publish_event(user_id, event_type: str, data) -> str | None:
+    """
+    Append the event to the backlog of the user and publish it to the streams
+    listening to them. Returns its id, or None when Redis is unavailable: a
+    lost event must not fail the write it reports.
+    """
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    client = get_redis_client(settings.EVENTS_REDIS_URL)
+    stream_key = get_event_stream_key(user_id)
+    try:
+        event_id = client.xadd(
+            stream_key,
+            {"type": event_type, "data": payload},
+            maxlen=settings.EVENTS_BACKLOG_SIZE,
+            approximate=True,
+        ).decode()
+        with client.pipeline(transaction=False) as pipe:
+            pipe.expire(stream_key, settings.EVENTS_BACKLOG_TTL)
+            pipe.publish(
+                get_event_channel(user_id), f"{event_id}\n{event_type}\n{payload}"
+            )
+            pipe.execute()
+    except RedisError:
+        logger.warning("Could not publish %s event", event_type, exc_info=True)
+        return None
+    return event_id
+
+
+def publish_event_on_commit(user_id, event_type: str, data):
+    """`publish_event` once the transaction commits, so rolled back writes aren't reported."""
+    transaction.on_commit(
+        functools.partial(publish_event, user_id, event_type, data), robust=True
+    )
+
+
+def format_event(event_id, event_type, data) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+class EventSubscription:
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventHub:
+    """
+    Redis pub/sub connection shared by every event stream of an event loop:
+    a channel is subscribed while at least one stream listens to it, so idle
+    streams cost a queue each instead of a Redis connection.
+    """
+
+    def __init__(self):
+        self.client = redis.asyncio.Redis.from_url(settings.EVENTS_REDIS_URL)
+        self.pubsub = self.client.pubsub()
+        self.subscriptions = {}
+        self.reader = None
+
+    async def subscribe(self, channel) -> EventSubscription:
+        subscription = EventSubscription(channel)
+        if channel not in self.subscriptions:
+            self.subscriptions[channel] = set()
+            await self.pubsub.subscribe(channel)
+        self.subscriptions[channel].add(subscription)
+        if self.reader is None or self.reader.done():
+            self.reader = asyncio.create_task(self.read())
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        listeners = self.subscriptions.get(subscription.channel, set())
+        listeners.discard(subscription)
+        if not listeners and subscription.channel in self.subscriptions:
+            del self.subscriptions[subscription.channel]
+            await self.pubsub.unsubscribe(subscription.channel)
+
+    async def read(self):
+        """Hand the published messages to the subscriptions of their channel."""
+        while self.subscriptions:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except RedisError:
+                logger.warning("Event subscription failed", exc_info=True)
+                for listeners in self.subscriptions.values():
+                    for subscription in listeners:
+                        subscription.overflowed = True
+                        subscription.put(None)
+                return
+            if message is None:
+                continue
+            channel = message["channel"].decode()
+            for subscription in self.subscriptions.get(channel, ()):
+                subscription.put(message["data"].decode())
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_event_hub() -> EventHub:
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        _hubs[loop] = EventHub()
+    return _hubs[loop]
+
+
+async def stream_events(user_id, last_event_id=None):
+    """
+    Server-sent events of a user: the events after `last_event_id` still in the
+    backlog, then the published ones as they come, with a comment line as
+    heartbeat when idle. A `reset` event tells the client that events were
+    missed and it has to reload. Ends when the stream can't keep up, for the
+    client to reconnect with its Last-Event-ID.
+    """
+    hub = get_event_hub()
+    subscription = await hub.subscribe(get_event_channel(user_id))
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_INTERVAL}\n\n"
+
+        last_id = None
+        if last_event_id is not None:
+            last_id = parse_event_id(last_event_id)
+            stream_key = get_event_stream_key(user_id)
+            oldest = await hub.client.xrange(stream_key, count=1)
+            if not oldest or parse_event_id(oldest[0][0].decode()) > last_id:
+                yield format_event(last_event_id, "reset", "{}")
+            backlog = await hub.client.xrange(stream_key, min=f"({last_event_id}")
+            for event_id, fields in backlog:
+                last_id = parse_event_id(event_id.decode())
+                yield format_event(
+                    event_id.decode(), fields[b"type"].decode(), fields[b"data"].decode()
+                )
+
+        while not subscription.overflowed:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), settings.EVENTS_HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if message is None:
+                break
+            event_id, event_type, data = message.split("\n", 2)
+            # Skip the events already sent from the backlog
+            if last_id is not None and parse_event_id(event_id) <= last_id:
+                continue
+            last_id = parse_event_id(event_id)
+            yield format_event(event_id, event_type, data)
+    finally:
+        await hub.unsubscribe(subscription)
+
+
+def authenticate(request):
+    """User of the request from the API authentication classes, or None."""
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result is not None:
+            return result[0]
+    return None
+
+
+async def event_stream(request):
+    """
+    Server-sent events of the authenticated user, to serve from the ASGI
+    application (core.asgi): an open stream waits on the shared subscription
+    without holding a thread or a database connection.
+
+    WSGI servers consume an async stream to the end before sending anything,
+    so each stream would hold a worker forever: requests served by the WSGI
+    application are answered 501.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are served by the ASGI application."},
+            status=501,
+        )
+    try:
+        user = await sync_to_async(authenticate)(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({"detail": str(e.detail)}, status=401)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    if last_event_id is not None and not EVENT_ID_PATTERN.match(last_event_id):
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        stream_events(user.pk, last_event_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1 +1,2 @@
+from core.factories.base_factory import *
 from core.factories.user_factory import *
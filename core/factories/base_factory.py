@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+import factory
+
+from core.constants import ROWS_BATCH_SIZE
+
+
+class BulkCreateFactory(factory.django.DjangoModelFactory):
+    """
+    Model factory whose `create_batch` inserts the rows with `bulk_create`.
+
+    The batch is built first, related rows built by SubFactories are bulk
+    created per model, then the batch itself goes in `ROWS_BATCH_SIZE` rows
+    per query. Like any `bulk_create`, `save()` and the pre/post save signals
+    are skipped, so use `create()` when a test relies on them.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        instances = cls.build_batch(size, **kwargs)
+        if not instances:
+            return instances
+        model = cls._meta.get_model_class()
+
+        related_fields = [
+            field
+            for field in model._meta.concrete_fields
+            if field.many_to_one and not field.remote_field.parent_link
+        ]
+        for field in related_fields:
+            unsaved = defaultdict(dict)
+            for instance in instances:
+                if not field.is_cached(instance):
+                    continue
+                related = getattr(instance, field.name)
+                if related is not None and related._state.adding:
+                    unsaved[type(related)][id(related)] = related
+            for related_model, related in unsaved.items():
+                related_model._default_manager.bulk_create(
+                    related.values(), batch_size=ROWS_BATCH_SIZE
+                )
+            # Copy the primary keys the related rows got into the `<field>_id` columns
+            for instance in instances:
+                if field.is_cached(instance):
+                    setattr(instance, field.name, getattr(instance, field.name))
+
+        for instance in instances:
+            # Fields set while building are not pending updates of BaseModel rows
+            if hasattr(instance, "_default_update_fields"):
+                instance._update_fields = instance._default_update_fields
+        model._default_manager.bulk_create(instances, batch_size=ROWS_BATCH_SIZE)
+        return instances
@@ -1,8 +1,10 @@
 import factory
 from django.contrib.auth.models import User
 
+from core.factories.base_factory import BulkCreateFactory
 
-class UserFactory(factory.django.DjangoModelFactory):
+
+class UserFactory(BulkCreateFactory):
     class Meta:
         model = User
 
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import router
+from django.utils import timezone
+
+from core.constants import ROWS_BATCH_SIZE
+
+# Callable returning the user making the changes, set per request by the views
+_history_actor = ContextVar("history_actor", default=None)
+_history_paused = ContextVar("history_paused", default=False)
+
+
+@contextmanager
+def recording_actor(get_actor):
+    """Attribute the changes recorded in the block to the user `get_actor()` returns."""
+    token = _history_actor.set(get_actor)
+    try:
+        yield
+    finally:
+        _history_actor.reset(token)
+
+
+@contextmanager
+def history_paused():
+    """Record nothing in the block, for writes whose changes are recorded by the caller."""
+    token = _history_paused.set(True)
+    try:
+        yield
+    finally:
+        _history_paused.reset(token)
+
+
+def is_history_paused() -> bool:
+    return _history_paused.get()
+
+
+def get_history_actor_id():
+    get_actor = _history_actor.get()
+    user = get_actor() if get_actor is not None else None
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def record_history(history_model, changes: dict, using=None):
+    """
+    Write history entries of objects, given as {pk: {field: [old, new]}}, with
+    one bulk insert. Call it in the transaction of the write it records, so that
+    the entries are committed or rolled back with the change.
+    """
+    if not changes or is_history_paused():
+        return
+    using = using or router.db_for_write(history_model)
+    actor_id = get_history_actor_id()
+    changed_at = timezone.now()
+    history_model.objects.using(using).bulk_create(
+        [
+            history_model(
+                object_id=pk,
+                changes=field_changes,
+                actor_id=actor_id,
+                changed_at=changed_at,
+            )
+            for pk, field_changes in changes.items()
+        ],
+        batch_size=ROWS_BATCH_SIZE,
+    )
@@ -0,0 +1,138 @@
+import functools
+import hashlib
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.http import HttpResponse
+from django.utils.datastructures import MultiValueDict
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+IDEMPOTENCY_KEY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+# Seconds a claim outlives REQUEST_TIMEOUT, after which its worker was killed
+IDEMPOTENCY_CLAIM_MARGIN = 10
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for another request."
+    default_code = "idempotency_key_mismatch"
+
+
+class IdempotentReplay(Exception):
+    """Raised to answer with the response stored for an Idempotency-Key."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def get_idempotency_cache_key(user_id, key: str) -> str:
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"idempotency:{user_id}:{digest}"
+
+
+def spool_request_body(request):
+    """
+    Copy the raw body of a request that no parser reads (e.g. a streamed
+    import) in chunks to a temporary file, kept in memory up to
+    FILE_UPLOAD_MAX_MEMORY_SIZE bytes. Returns it rewound, or None without body.
+    """
+    if request.stream is None:
+        return None
+    # Left open for the view to read
+    body = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+        max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+    )
+    for chunk in iter(
+        functools.partial(request.stream.read, FINGERPRINT_CHUNK_SIZE), b""
+    ):
+        body.write(chunk)
+    body.seek(0)
+    return body
+
+
+def get_request_fingerprint(request, body=None) -> str:
+    """
+    Hash of the method, full path and content of the request: the raw `body`
+    copied by spool_request_body, else the parsed data. Files, the body or the
+    uploaded ones, are read in chunks and rewound for the view.
+    """
+    digest = hashlib.sha256(f"{request.method} {request.get_full_path()}\n".encode())
+    files = []
+    if body is None:
+        data = request.data
+        if isinstance(data, MultiValueDict):
+            data = dict(data.lists())
+
+        def encode_file(value):
+            if not isinstance(value, UploadedFile):
+                raise TypeError(f"{type(value).__name__} is not JSON serializable")
+            files.append(value)
+            return value.name
+
+        digest.update(json.dumps(data, sort_keys=True, default=encode_file).encode())
+    else:
+        files.append(body)
+
+    for file in files:
+        for chunk in iter(functools.partial(file.read, FINGERPRINT_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        file.seek(0)
+    return digest.hexdigest()
+
+
+def claim_idempotency_key(cache_key: str, fingerprint: str) -> dict | None:
+    """
+    Claim the key for this request with an atomic add. Returns None when the
+    claim is ours, else the entry of the request holding the key: its stored
+    response or its pending claim, without waiting for it. The claim is held
+    for the whole request, up to REQUEST_TIMEOUT when its worker is killed,
+    and a claim released by a failed request is taken over.
+    """
+    pending = {"fingerprint": fingerprint, "status": None}
+    timeout = settings.REQUEST_TIMEOUT + IDEMPOTENCY_CLAIM_MARGIN
+    while not cache.add(cache_key, pending, timeout=timeout):
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def store_idempotent_response(
+    cache_key: str, fingerprint: str, status_code: int, headers: dict, body: bytes
+):
+    """Store the response of the claiming request for replays, in place of the claim."""
+    cache.set(
+        cache_key,
+        {
+            "fingerprint": fingerprint,
+            "status": status_code,
+            "headers": headers,
+            "body": body,
+        },
+        timeout=settings.IDEMPOTENCY_KEY_TTL,
+    )
+
+
+def release_idempotency_key(cache_key: str):
+    cache.delete(cache_key)
+
+
+def get_replayed_response(entry: dict) -> HttpResponse:
+    response = HttpResponse(
+        entry["body"], status=entry["status"], headers=entry["headers"]
+    )
+    response["Idempotent-Replayed"] = "true"
+    return response
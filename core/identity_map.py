@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+IDENTITY_MAP_CONTEXT_KEY = "user_identity_map"
+
+# Only what serializers, permissions and authentication need
+USER_SNAPSHOT_FIELDS = ("id", "username", "is_staff", "is_active")
+
+
+# Snapshots are cached by core.authentication. The helpers live here so that
+# core.signals can drop them without importing simplejwt when the app loads
+def get_user_snapshot_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user_snapshot(user_id):
+    cache.delete(get_user_snapshot_cache_key(user_id))
+
+
+class UserIdentityMap:
+    """
+    Request scoped cache of User objects keyed by id.
+
+    Missing ids are fetched in a single query, so resolving the owners of any
+    number of rows costs at most one query per request.
+    """
+
+    def __init__(self, users=()):
+        self._users = {}
+        for user in users:
+            self.add(user)
+
+    def __contains__(self, user_id):
+        return user_id in self._users
+
+    def add(self, user):
+        if user is not None and user.pk is not None:
+            self._users[user.pk] = user
+
+    def prime(self, user_ids):
+        """Fetch every id not already in the map with one query."""
+        missing = {user_id for user_id in user_ids if user_id is not None} - set(
+            self._users
+        )
+        if not missing:
+            return
+        for user in User.objects.filter(pk__in=missing).only(*USER_SNAPSHOT_FIELDS):
+            self._users[user.pk] = user
+        # Remember ids that do not exist so they are not queried again
+        for user_id in missing - set(self._users):
+            self._users[user_id] = None
+
+    def get(self, user_id):
+        if user_id not in self._users:
+            self.prime([user_id])
+        return self._users.get(user_id)
+
+
+def get_user_identity_map(request) -> UserIdentityMap:
+    """Get (or create) the identity map attached to a request, seeded with its user."""
+    identity_map = getattr(request, IDENTITY_MAP_CONTEXT_KEY, None)
+    if identity_map is None:
+        user = getattr(request, "user", None)
+        identity_map = UserIdentityMap(
+            [user] if user is not None and user.is_authenticated else []
+        )
+        setattr(request, IDENTITY_MAP_CONTEXT_KEY, identity_map)
+    return identity_map
@@ -0,0 +1 @@
+from core.importers.base_importer import *
@@ -0,0 +1,161 @@
+import codecs
+import csv
+import json
+import time
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from core.constants import ROWS_BATCH_SIZE
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+IMPORT_FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/jsonl"}
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+
+def detect_import_format(filename: str = "", content_type: str = "") -> str:
+    """Guess the import format from the file name or content type, defaulting to CSV."""
+    content_type = content_type.split(";", maxsplit=1)[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES or filename.lower().endswith(
+        NDJSON_EXTENSIONS
+    ):
+        return FORMAT_NDJSON
+    return FORMAT_CSV
+
+
+class BaseImporter:
+    """
+    Streams rows from a CSV or NDJSON source and bulk creates the valid ones.
+
+    - The source is any iterable of byte lines (uploaded file, request stream, open file),
+      it is consumed lazily so memory stays flat regardless of the file size
+    - Rows are validated with `serializer_class` field rules without creating instances
+    - Valid rows are written with one `bulk_create` per `batch_size` rows
+    - The last batch is written in one transaction with `finish`
+    """
+
+    model = None
+    serializer_class = None
+    batch_size = ROWS_BATCH_SIZE
+    max_reported_errors = 100
+
+    def __init__(self, context=None, progress_callback=None, **save_kwargs):
+        """
+        Args:
+            context: Serializer context used during validation.
+            progress_callback: Called with the number of bytes consumed after each batch.
+            **save_kwargs: Extra attributes set on every created instance (e.g. owner_id).
+
+        """
+        self.context = context or {}
+        self.progress_callback = progress_callback
+        self.save_kwargs = save_kwargs
+        self.bytes_read = 0
+
+    # ---------------------------------------------------------
+    #                        PARSING
+    # ---------------------------------------------------------
+
+    def count_bytes(self, lines):
+        for line in lines:
+            self.bytes_read += len(line)
+            yield line
+
+    def read_csv(self, lines):
+        reader = csv.DictReader(codecs.iterdecode(lines, "utf-8-sig"))
+        for row in reader:
+            yield reader.line_num, row
+
+    def read_ndjson(self, lines):
+        for line_num, line in enumerate(codecs.iterdecode(lines, "utf-8-sig"), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield (
+                    line_num,
+                    ValidationError({"non_field_errors": [f"Invalid JSON: {e}"]}),
+                )
+                continue
+            if not isinstance(row, dict):
+                row = ValidationError({"non_field_errors": ["Expected a JSON object."]})
+            yield line_num, row
+
+    def read_rows(self, lines, fmt):
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format {fmt}")
+        lines = self.count_bytes(lines)
+        if fmt == FORMAT_NDJSON:
+            return self.read_ndjson(lines)
+        return self.read_csv(lines)
+
+    # ---------------------------------------------------------
+    #                 VALIDATION + WRITING
+    # ---------------------------------------------------------
+
+    def build_instance(self, validated_data):
+        return self.model(**validated_data, **self.save_kwargs)
+
+    def write_batch(self, instances):
+        self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+
+    def finish(self, created: int):
+        """
+        Called in the transaction of the last batch, with the number of rows
+        created, to write what must be committed with them (e.g. an outbox event).
+        """
+
+    def run(self, lines, fmt=FORMAT_CSV):
+        """
+        Import every row of the source.
+
+        Returns a report with the created and failed counts, the first
+        `max_reported_errors` errors and the throughput in rows/sec.
+        """
+        started = time.perf_counter()
+        # A single serializer validates every row, so fields are only bound once
+        serializer = self.serializer_class(context=self.context)
+        created = 0
+        failed = 0
+        errors = []
+        batch = []
+
+        def flush(count):
+            nonlocal created
+            self.write_batch(batch[:count])
+            created += count
+            del batch[:count]
+            if self.progress_callback:
+                self.progress_callback(self.bytes_read)
+
+        for line, row in self.read_rows(lines, fmt):
+            try:
+                if isinstance(row, ValidationError):
+                    raise row
+                batch.append(self.build_instance(serializer.run_validation(row)))
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < self.max_reported_errors:
+                    errors.append({"line": line, "errors": e.detail})
+            # Rows are held back until there are more, so the last batch is never empty
+            if len(batch) > self.batch_size:
+                flush(self.batch_size)
+        with transaction.atomic():
+            if batch:
+                flush(len(batch))
+            self.finish(created)
+
+        duration = time.perf_counter() - started
+        rows = created + failed
+        return {
+            "rows": rows,
+            "created": created,
+            "failed": failed,
+            "errors": errors,
+            "duration": round(duration, 3),
+            "rows_per_second": round(rows / duration) if duration else rows,
+        }
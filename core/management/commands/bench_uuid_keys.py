@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models import uuid7
+
+KEY_GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare bulk insert throughput and primary key index size of uuid4 and "
+        "uuid7 keys, on scratch tables dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000,
+            help="Rows per INSERT, each committed like a request would.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'key':<8}{'rows':>12}{'rows/s':>12}{'index MB':>11}{'table MB':>11}"
+        )
+        for name, generate in KEY_GENERATORS.items():
+            table = f"bench_keys_{name}"
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                # Same shape as the BaseModel columns that are always filled in
+                cursor.execute(
+                    f"CREATE TABLE {table} (id uuid PRIMARY KEY, "
+                    "created_at timestamptz NOT NULL DEFAULT now(), "
+                    "deleted boolean NOT NULL DEFAULT false)"
+                )
+                try:
+                    elapsed = self.insert(cursor, table, generate, options)
+                    cursor.execute(
+                        "SELECT pg_relation_size(%s), pg_relation_size(%s)",
+                        [f"{table}_pkey", table],
+                    )
+                    index_size, table_size = cursor.fetchone()
+                finally:
+                    cursor.execute(f"DROP TABLE {table}")
+
+            self.stdout.write(
+                f"{name:<8}{options['rows']:>12,}{options['rows'] / elapsed:>12,.0f}"
+                f"{index_size / 2**20:>11.1f}{table_size / 2**20:>11.1f}"
+            )
+
+    def insert(self, cursor, table, generate, options):
+        """Insert the rows batch by batch, returns the seconds spent in the INSERTs."""
+        elapsed = 0.0
+        for offset in range(0, options["rows"], options["batch_size"]):
+            size = min(options["batch_size"], options["rows"] - offset)
+            keys = [generate() for _ in range(size)]
+            start = time.perf_counter()
+            cursor.execute(
+                f"INSERT INTO {table} (id) SELECT unnest(%s::uuid[])",
+                [keys],
+            )
+            elapsed += time.perf_counter() - start
+        return elapsed
@@ -0,0 +1,36 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import BaseHistoryModel
+from core.partitions import add_months, create_monthly_partitions, drop_monthly_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of the history tables ahead of time, and "
+        "drop the ones past retention. Run it at least once a month."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months", type=int, default=3, help="Months to create from this one on."
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Drop partitions older than this many months, kept by default.",
+        )
+
+    def handle(self, *args, **options):
+        this_month = timezone.now().date().replace(day=1)
+        for model in apps.get_models():
+            if not issubclass(model, BaseHistoryModel):
+                continue
+            for name in create_monthly_partitions(model, months=options["months"]):
+                self.stdout.write(f"Created {name}")
+            if options["retain_months"] is not None:
+                before = add_months(this_month, -options["retain_months"])
+                for name in drop_monthly_partitions(model, before):
+                    self.stdout.write(f"Dropped {name}")
@@ -0,0 +1,108 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a process imports before it can work, profiled in a fresh interpreter
+STARTUP_TARGETS = {
+    # manage.py commands, the job worker
+    "setup": "import django; django.setup()",
+    # a gunicorn worker ready to serve its first request
+    "wsgi": (
+        "from core.wsgi import application; from core.startup import preload; preload()"
+    ),
+}
+
+
+def parse_importtime(output: str):
+    """
+    Parse the `-X importtime` report into (module, self_us, cumulative_us, importer)
+    rows. Modules are listed after everything they import, one level deeper.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    rows = []
+    for index, (name, self_us, cumulative_us, depth) in enumerate(entries):
+        importer = next(
+            (entry[0] for entry in entries[index + 1 :] if entry[3] < depth), None
+        )
+        rows.append((name, self_us, cumulative_us, importer))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile the imports of a cold start with `python -X importtime`: wall "
+        "time, import time per package and the slowest modules to import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            choices=sorted(STARTUP_TARGETS),
+            default="wsgi",
+            help="setup: django.setup() only, wsgi: a preloaded gunicorn worker.",
+        )
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Cold starts timed for the wall time."
+        )
+
+    def run_target(self, code, *args):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, *args, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+        return result.stderr
+
+    def handle(self, *args, **options):
+        code = STARTUP_TARGETS[options["target"]]
+
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            self.run_target(code)
+            timings.append((time.perf_counter() - start) * 1000)
+        rows = parse_importtime(self.run_target(code, "-X", "importtime"))
+
+        packages = defaultdict(int)
+        for name, self_us, _cumulative_us, _importer in rows:
+            packages[name.partition(".")[0]] += self_us
+
+        self.stdout.write(
+            f"{options['target']}: {statistics.median(timings):.0f} ms wall time "
+            f"(median of {options['repeat']}), "
+            f"{sum(packages.values()) / 1000:.0f} ms importing {len(rows)} modules"
+        )
+
+        self.stdout.write(f"\n{'package':<40}{'ms':>9}")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[
+            : options["limit"]
+        ]:
+            self.stdout.write(f"{package:<40}{self_us / 1000:>9.1f}")
+
+        self.stdout.write(f"\n{'module':<50}{'self ms':>9}{'cum ms':>9}  imported by")
+        for name, self_us, cumulative_us, importer in sorted(
+            rows, key=lambda row: -row[1]
+        )[: options["limit"]]:
+            self.stdout.write(
+                f"{name:<50}{self_us / 1000:>9.1f}{cumulative_us / 1000:>9.1f}"
+                f"  {importer or '-'}"
+            )
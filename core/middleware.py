@@ -0,0 +1,134 @@
+import socket
+import struct
+import threading
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from core.compression import compress, compress_stream, select_encoding
+
+# Bytes of struct tcp_info read, up to tcpi_unacked and tcpi_sacked
+TCP_INFO_SIZE = 32
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding accepted by the client
+    (zstd, brotli or gzip, see COMPRESSION_ENCODINGS).
+
+    - Responses smaller than COMPRESSION_MIN_SIZE are sent as is
+    - Streaming responses (e.g. CSV downloads) are compressed chunk by chunk
+    - Responses that already have a Content-Encoding, such as precompressed
+      cache hits of BaseModelViewSet, are passed through untouched
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.compress_response(request, response)
+
+    def compress_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = select_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                # Leave async streams (e.g. server-sent events) unbuffered
+                return response
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            # The compressed size is only known once the stream is consumed
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag can't be kept for a different representation
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+def get_accept_queue_depth(sock) -> int | None:
+    """
+    Connections waiting on the listening TCP socket `sock` for a worker to
+    accept them, from its TCP_INFO. None where that is not available (other
+    than Linux, Unix sockets).
+    """
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, TCP_INFO_SIZE)
+    except (AttributeError, OSError):
+        return None
+    # tcpi_unacked, which holds the accept queue length of listening sockets
+    return struct.unpack_from("8B6I", info)[12]
+
+
+class LoadSheddingMiddleware:
+    """
+    Answer 503 with a Retry-After header while the server is behind:
+
+    - LOAD_SHEDDING_MAX_QUEUE_DEPTH connections are waiting in the accept queue
+      of the listening sockets, shared by all the workers of the host. The
+      gunicorn config registers them with `set_listen_sockets`
+    - LOAD_SHEDDING_MAX_CONCURRENCY requests are in progress in this process,
+      which only adds up with threaded or async workers
+
+    0 disables either check. Once the server can't keep up, queueing more work
+    only makes every response slower. Refusing the excess right away keeps the
+    latency of the admitted requests flat and tells clients when to come back.
+    """
+
+    listen_sockets = []
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def set_listen_sockets(cls, sockets):
+        cls.listen_sockets = list(sockets)
+
+    def get_queue_depth(self) -> int:
+        return sum(get_accept_queue_depth(sock) or 0 for sock in self.listen_sockets)
+
+    def __call__(self, request):
+        max_concurrency = settings.LOAD_SHEDDING_MAX_CONCURRENCY
+        max_queue_depth = settings.LOAD_SHEDDING_MAX_QUEUE_DEPTH
+        overloaded = max_queue_depth and self.get_queue_depth() >= max_queue_depth
+        if not overloaded:
+            with self.lock:
+                overloaded = max_concurrency and self.in_flight >= max_concurrency
+                if not overloaded:
+                    self.in_flight += 1
+        if overloaded:
+            response = JsonResponse(
+                {"detail": "The server is overloaded, retry later."}, status=503
+            )
+            response["Retry-After"] = str(settings.LOAD_SHEDDING_RETRY_AFTER)
+            return response
+
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
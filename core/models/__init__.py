@@ -1 +1,2 @@
 from core.models.base_model import *
+from core.models.history_model import *
@@ -1,10 +1,46 @@
+import os
+import time
 import uuid as uuid_util
+from contextlib import nullcontext
 
-from django.db import models
+from django.apps import apps
+from django.db import connections, models, transaction
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
 from core.constants import ROWS_BATCH_SIZE
+from core.history import history_paused, is_history_paused, record_history
+
+
+def uuid7() -> uuid_util.UUID:
+    """
+    Time ordered UUID (version 7 of RFC 9562): 48 bits of unix time in
+    milliseconds, 12 bits of sub-millisecond time then 62 random bits.
+
+    Keys generated one after another sort in creation order, so new rows are
+    appended to the right edge of the primary key index instead of splitting
+    pages at random places like uuid4 keys do.
+    """
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    sub_milliseconds = remainder * 4096 // 1_000_000
+    random_bits = int.from_bytes(os.urandom(8), "big") & (1 << 62) - 1
+    return uuid_util.UUID(
+        int=(milliseconds & (1 << 48) - 1) << 80
+        | 0x7 << 76
+        | sub_milliseconds << 64
+        | 0b10 << 62
+        | random_bits
+    )
+
+
+def get_changes(field_names, old_values, new_values) -> dict:
+    """{field: [old, new]} of the fields whose value differs."""
+    return {
+        name: [old, new]
+        for name, old, new in zip(field_names, old_values, new_values, strict=True)
+        if old != new
+    }
 
 
 class CustomQueryset(QuerySet):
@@ -20,6 +56,59 @@ class CustomQueryset(QuerySet):
         """Bulk recovery of soft deleted objects."""
         return self.update(deleted=False)
 
+    def get_history_fields(self, field_names) -> list:
+        """Watched fields among `field_names` whose changes are to be recorded."""
+        if self.model.get_history_model() is None or is_history_paused():
+            return []
+        return [
+            name for name in self.model.FIELDS_TO_WATCH_FOR_CHANGES if name in field_names
+        ]
+
+    def update(self, **kwargs):
+        """
+        Update the rows, recording the changes of watched fields in the history
+        of the model: their old values are read (and locked) first, new values
+        given as expressions are read back after the update.
+        """
+        history_fields = self.get_history_fields(kwargs)
+        if not history_fields:
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            old_rows = {
+                pk: values
+                for pk, *values in self.select_for_update().values_list(
+                    "pk", *history_fields
+                )
+            }
+            count = super().update(**kwargs)
+            if any(
+                hasattr(kwargs[name], "resolve_expression") for name in history_fields
+            ):
+                new_rows = {
+                    pk: values
+                    for pk, *values in self.model._base_manager.using(self.db)
+                    .filter(pk__in=old_rows)
+                    .values_list("pk", *history_fields)
+                }
+            else:
+                new_values = [
+                    self.model._meta.get_field(name).to_python(kwargs[name])
+                    for name in history_fields
+                ]
+                new_rows = dict.fromkeys(old_rows, new_values)
+
+            record_history(
+                self.model.get_history_model(),
+                {
+                    pk: changes
+                    for pk, old_values in old_rows.items()
+                    if (changes := get_changes(history_fields, old_values, new_rows[pk]))
+                },
+                using=self.db,
+            )
+        return count
+
     def bulk_update(self, *args, **kwargs):
         """
         This function is used to make sure that all elements have updated their time stamp.
@@ -32,11 +121,138 @@ class CustomQueryset(QuerySet):
             element.updated_at = timezone.now()
         if "updated_at" not in fields:
             fields.append("updated_at")
-        return super().bulk_update(objs=objs, fields=fields, batch_size=ROWS_BATCH_SIZE)
+        return self.bulk_update_with_history(objs, fields)
+
+    def bulk_update_with_history(self, objs, fields):
+        """
+        Update the objects in batches and record the changes of their watched
+        fields, taken from the instances instead of the update queries.
+        """
+        history_fields = self.get_history_fields(fields)
+        changes = {}
+        for obj in objs if history_fields else ():
+            if obj_changes := obj.get_changes(history_fields):
+                changes[obj.pk] = obj_changes
+        with transaction.atomic(using=self.db, savepoint=False):
+            with history_paused():
+                count = super().bulk_update(
+                    objs=objs, fields=fields, batch_size=ROWS_BATCH_SIZE
+                )
+            if changes:
+                record_history(self.model.get_history_model(), changes, using=self.db)
+        if history_fields:
+            for obj in objs:
+                obj.set_old_values()
+        return count
 
     def active(self):
         return self.filter(deleted=False)
 
+    def update_returning(self, **values):
+        """
+        Update the rows of the queryset and return them as instances, in a single
+        UPDATE ... RETURNING query. auto_now fields (updated_at) are set in the
+        same statement. Like `update()`, values may be expressions, which read the
+        row before the update, and save() and the model signals are skipped.
+        Old values of the watched fields for the history are returned by the same
+        statement, from the rows it locks.
+        :raises: ValueError if the filters of the queryset need a join
+        """
+        query = self.query.chain()
+        if sum(1 for count in query.alias_refcount.values() if count) > 1:
+            raise ValueError("update_returning() can't filter on related models")
+
+        connection = connections[self.db]
+        compiler = query.get_compiler(self.db)
+        quote_name = connection.ops.quote_name
+        meta = self.model._meta
+        now = timezone.now()
+        assignments, params = [], []
+        for field in meta.concrete_fields:
+            if field.name in values:
+                value = values[field.name]
+            elif getattr(field, "auto_now", False):
+                value = now
+            else:
+                continue
+            value_sql, value_params = self.compile_update_value(compiler, field, value)
+            assignments.append(f"{quote_name(field.column)} = {value_sql}")
+            params.extend(value_params)
+
+        # Identifiers are quoted and every value is a query parameter
+        table = quote_name(meta.db_table)
+        sql = f"UPDATE {table} SET {', '.join(assignments)}"  # noqa: S608
+        where, where_params = compiler.compile(query.where)
+        where = f" WHERE {where}" if where else ""
+        columns = [
+            f"{table}.{quote_name(field.column)}" for field in meta.concrete_fields
+        ]
+        history_fields = self.get_history_fields(values)
+        if history_fields:
+            pk_column = quote_name(meta.pk.column)
+            old_columns = [
+                quote_name(meta.get_field(name).column) for name in history_fields
+            ]
+            # The old values are read from the rows the statement locks
+            select = f"SELECT {', '.join([pk_column, *old_columns])} FROM {table}"  # noqa: S608
+            sql += (
+                f" FROM ({select}{where} FOR UPDATE) AS old"
+                f" WHERE {table}.{pk_column} = old.{pk_column}"
+            )
+            columns += [f"old.{column}" for column in old_columns]
+        else:
+            sql += where
+        # The history is written in the transaction of the update
+        atomic = transaction.atomic(using=self.db, savepoint=False)
+        with atomic if history_fields else nullcontext():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"{sql} RETURNING {', '.join(columns)}", [*params, *where_params]
+                )
+                rows = cursor.fetchall()
+            instances, changes = self.get_returned_instances(rows, history_fields)
+            if changes:
+                record_history(self.model.get_history_model(), changes, using=self.db)
+        return instances
+
+    def get_returned_instances(self, rows, history_fields) -> tuple[list, dict]:
+        """
+        Instances of the rows returned by update_returning, and the {pk: changes}
+        of their `history_fields`, whose old values follow the columns of the row.
+        """
+        connection = connections[self.db]
+        meta = self.model._meta
+        attnames = [field.attname for field in meta.concrete_fields]
+        converters = [
+            (index, field.from_db_value)
+            for index, field in enumerate(meta.concrete_fields)
+            if hasattr(field, "from_db_value")
+        ]
+        instances, changes = [], {}
+        for row in rows:
+            field_values = list(row[: len(attnames)])
+            for index, converter in converters:
+                field_values[index] = converter(field_values[index], None, connection)
+            instance = self.model.from_db(self.db, attnames, field_values)
+            instances.append(instance)
+            if history_fields:
+                new_values = [getattr(instance, name) for name in history_fields]
+                old_values = row[len(attnames) :]
+                if instance_changes := get_changes(
+                    history_fields, old_values, new_values
+                ):
+                    changes[instance.pk] = instance_changes
+        return instances, changes
+
+    @staticmethod
+    def compile_update_value(compiler, field, value) -> tuple:
+        """SQL and params of the value assigned to `field` by update_returning."""
+        if hasattr(value, "resolve_expression"):
+            return compiler.compile(
+                value.resolve_expression(compiler.query, allow_joins=False, for_save=True)
+            )
+        return "%s", [field.get_db_prep_save(value, compiler.connection)]
+
     def bulk_update_without_timestamp(self, *args, **kwargs):
         """
         This function is just used to update the data in batches,
@@ -45,7 +261,7 @@ class CustomQueryset(QuerySet):
         """
         objs = kwargs["objs"] if "objs" in kwargs else args[0]
         fields = kwargs["fields"] if "fields" in kwargs else args[1]
-        return super().bulk_update(objs=objs, fields=fields, batch_size=ROWS_BATCH_SIZE)
+        return self.bulk_update_with_history(objs, fields)
 
 
 class BaseModel(models.Model):
@@ -66,6 +282,9 @@ class BaseModel(models.Model):
 
     # Fields to check for updates on save
     FIELDS_TO_WATCH_FOR_CHANGES = []
+    # "app_label.ModelName" of a BaseHistoryModel recording the changes of the
+    # watched fields, on save() and on the bulk paths of CustomQueryset
+    HISTORY_MODEL = None
 
     class Meta:
         abstract = True
@@ -81,29 +300,66 @@ class BaseModel(models.Model):
         self._update_fields = self._default_update_fields
 
     def __setattr__(self, name: str, value, /) -> None:
+        # Deferred fields (and related objects) are not loaded to be tracked
         if hasattr(self, "_update_fields") and (
             not name.startswith("_")
             and name not in ["id", "pk"]
             and name in {f.name for f in self._meta.get_fields() if f.editable}
-            and hasattr(self, name)
         ):
             self._update_fields.append(name)
         return super().__setattr__(name, value)
 
     def save(self, *args, **kwargs):
-        # we don't need to pass _update_fields on instance creation and
-        # when we explicitly set update_fields when saving
-        if self._state.adding or "update_fields" in kwargs:
-            super().save(*args, **kwargs)
-        else:
-            super().save(update_fields=self._update_fields)
+        history_model = self.get_history_model()
+        changes = None
+        if history_model is not None and not self._state.adding:
+            changes = self.get_changes(kwargs.get("update_fields", self._update_fields))
+
+        # The history is written in the transaction of the save
+        atomic = transaction.atomic(using=self._state.db, savepoint=False)
+        with atomic if changes else nullcontext():
+            # we don't need to pass _update_fields on instance creation and
+            # when we explicitly set update_fields when saving
+            if self._state.adding or "update_fields" in kwargs:
+                super().save(*args, **kwargs)
+            else:
+                super().save(update_fields=self._update_fields)
+            if changes:
+                record_history(history_model, {self.pk: changes}, using=self._state.db)
         self.set_old_values()
         self._update_fields = self._default_update_fields
 
+    @classmethod
+    def get_history_model(cls):
+        return apps.get_model(cls.HISTORY_MODEL) if cls.HISTORY_MODEL else None
+
     def set_old_values(self):
-        # Reset old values of fields to watch for changes
+        # Reset old values of fields to watch for changes. Deferred fields are
+        # not loaded for it, their old value is left as DEFERRED
         for field in self.FIELDS_TO_WATCH_FOR_CHANGES:
-            setattr(self, f"old_{field}", getattr(self, field, None))
+            attname = self._meta.get_field(field).attname
+            setattr(self, f"old_{field}", self.__dict__.get(attname, models.DEFERRED))
+
+    def get_changes(self, field_names=None) -> dict:
+        """
+        {field: [old, new]} of the watched fields, among `field_names` if given,
+        that changed since the last save. Values are compared as the field
+        converts them, e.g. "2030-01-01" and date(2030, 1, 1) are the same due
+        date. The old value of a deferred field that was set is unknown (None).
+        """
+        changes = {}
+        for name in self.FIELDS_TO_WATCH_FOR_CHANGES:
+            if field_names is not None and name not in field_names:
+                continue
+            field = self._meta.get_field(name)
+            if field.attname not in self.__dict__:
+                continue
+            old = getattr(self, f"old_{name}")
+            old = None if old is models.DEFERRED else field.to_python(old)
+            new = field.to_python(getattr(self, field.attname))
+            if old != new:
+                changes[name] = [old, new]
+        return changes
 
     def get_old_value(self, field_name: str):
         """
@@ -123,11 +379,15 @@ class BaseModel(models.Model):
         :raises: RuntimeError if the field is not being watched for changes
         """
         try:
-            return getattr(self, f"old_{field_name}") != getattr(self, field_name)
+            old_value = getattr(self, f"old_{field_name}")
         except AttributeError as e:
             raise RuntimeError(
                 f"Field {field_name} is not being watched for changes"
             ) from e
+        if old_value is models.DEFERRED:
+            # Not loaded, so it only changed if it was set since
+            return self._meta.get_field(field_name).attname in self.__dict__
+        return old_value != getattr(self, field_name)
 
     def delete(self, *args, permanent: bool = False, **kwargs):
         """Soft delete the object unless permanent is True."""
@@ -150,3 +410,17 @@ class BaseModel(models.Model):
     @property
     def _default_update_fields(self):
         return self.BASE_UPDATE_FIELDS + (self.DEFAULT_UPDATE_FIELDS or [])
+
+
+class TimeOrderedBaseModel(BaseModel):
+    """
+    BaseModel whose new rows get time ordered uuid7 keys.
+
+    Opt in for tables with a high insert rate. Existing uuid4 keys stay valid,
+    both kinds of UUID share the column and its index.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+
+    class Meta(BaseModel.Meta):
+        abstract = True
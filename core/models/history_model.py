@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from core.models.base_model import uuid7
+
+
+class BaseHistoryModel(models.Model):
+    """
+    Abstract change log of a BaseModel, set as its HISTORY_MODEL: one row per
+    changed object and write, with the watched fields that changed as a
+    {field: [old, new]} JSON diff.
+
+    Tables are partitioned by month of `changed_at` (see core.partitions), the
+    primary key includes it as Postgres requires. Rows outlive the objects.
+    """
+
+    pk = models.CompositePrimaryKey("changed_at", "id")
+    id = models.UUIDField(default=uuid7, editable=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+    object_id = models.UUIDField()
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    changes = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        abstract = True
+        ordering = ["-changed_at"]
+        indexes = [
+            models.Index(
+                fields=["object_id", "-changed_at"], name="%(class)s_object_idx"
+            ),
+        ]
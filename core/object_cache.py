@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def get_object_cache_key(model, pk) -> str:
+    return f"object:{model._meta.label_lower}:{pk}"
+
+
+def get_cached_objects(model, pks) -> dict:
+    """Cached entries of `pks` fetched in one round trip, keyed by pk."""
+    keys = {get_object_cache_key(model, pk): pk for pk in pks}
+    return {keys[key]: entry for key, entry in cache.get_many(keys).items()}
+
+
+def set_cached_objects(model, entries: dict, timeout=None):
+    """Store the entries of a pk -> entry mapping in one round trip."""
+    cache.set_many(
+        {get_object_cache_key(model, pk): entry for pk, entry in entries.items()},
+        timeout=settings.CACHE_TIMEOUT if timeout is None else timeout,
+    )
+
+
+def invalidate_cached_objects(model, pks):
+    cache.delete_many([get_object_cache_key(model, pk) for pk in pks])
@@ -0,0 +1,130 @@
+import re
+from datetime import date
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations import CreateModel
+from django.db.migrations.operations.models import ModelOperation
+from django.utils import timezone
+
+PARTITION_NAME_PATTERN = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+class CreatePartitionedModel(CreateModel):
+    """
+    CreateModel for a table partitioned by range of `partition_key`, with a
+    default partition taking the rows no monthly partition covers yet. Monthly
+    partitions are managed with `create_monthly_partitions`.
+    """
+
+    def __init__(self, *args, partition_key, **kwargs):
+        self.partition_key = partition_key
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        kwargs["partition_key"] = self.partition_key
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            create_partitioned_table(schema_editor, model, self.partition_key)
+
+    def reduce(self, operation, app_label):
+        # Folding later operations in would turn this into a plain CreateModel
+        return ModelOperation.reduce(self, operation, app_label)
+
+
+def create_partitioned_table(schema_editor, model, partition_key):
+    """`schema_editor.create_model` for a table partitioned by range of a field."""
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+    column = model._meta.get_field(partition_key).column
+
+    sql, params = schema_editor.table_sql(model)
+    schema_editor.execute(
+        f"{sql} PARTITION BY RANGE ({quote_name(column)})", params or None
+    )
+    schema_editor.execute(
+        f"CREATE TABLE {quote_name(f'{table}_default')} "
+        f"PARTITION OF {quote_name(table)} DEFAULT"
+    )
+    schema_editor.deferred_sql.extend(schema_editor._model_indexes_sql(model))
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def get_partitions(table: str, using=DEFAULT_DB_ALIAS) -> list:
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [table],
+        )
+        return sorted(name for (name,) in cursor.fetchall())
+
+
+def create_monthly_partitions(
+    model, months=3, start=None, using=DEFAULT_DB_ALIAS
+) -> list:
+    """
+    Create the missing monthly partitions of the BaseHistoryModel `model` from
+    the month of `start` (today by default) on, and return their names. Rows of
+    these months already in the default partition are moved to them.
+    """
+    quote_name = connections[using].ops.quote_name
+    table = model._meta.db_table
+    column = quote_name(model._meta.get_field("changed_at").column)
+    default = quote_name(f"{table}_default")
+    existing = set(get_partitions(table, using))
+
+    created = []
+    month = (start or timezone.now().date()).replace(day=1)
+    for _ in range(months):
+        next_month = add_months(month, 1)
+        name = get_partition_name(table, month)
+        if name not in existing:
+            bounds = f"'{month.isoformat()}'", f"'{next_month.isoformat()}'"
+            in_month = f"{column} >= {bounds[0]} AND {column} < {bounds[1]}"
+            with transaction.atomic(using=using), connections[using].cursor() as cursor:
+                # Attaching checks the default partition holds none of its rows
+                cursor.execute(
+                    f"CREATE TABLE {quote_name(name)} (LIKE {quote_name(table)} "
+                    "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {default} WHERE {in_month} "  # noqa: S608
+                    f"RETURNING *) INSERT INTO {quote_name(name)} SELECT * FROM moved"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {quote_name(table)} ATTACH PARTITION "
+                    f"{quote_name(name)} FOR VALUES FROM ({bounds[0]}) TO ({bounds[1]})"
+                )
+            created.append(name)
+        month = next_month
+    return created
+
+
+def drop_monthly_partitions(model, before: date, using=DEFAULT_DB_ALIAS) -> list:
+    """Drop the monthly partitions of `model` older than the month of `before`."""
+    quote_name = connections[using].ops.quote_name
+    table = model._meta.db_table
+    before = before.replace(day=1)
+
+    dropped = []
+    for name in get_partitions(table, using):
+        match = PARTITION_NAME_PATTERN.search(name)
+        if match and date(int(match[1]), int(match[2]), 1) < before:
+            with connections[using].cursor() as cursor:
+                cursor.execute(f"DROP TABLE {quote_name(name)}")
+            dropped.append(name)
+    return dropped
@@ -6,4 +6,5 @@ class IsOwnerOrStaff(permissions.BasePermission):
         # Allow access only to the owner of the object or admin users
         if request.user and request.user.is_staff:
             return True
-        return obj.owner == request.user
+        # Compare ids so the related owner is never fetched
+        return obj.owner_id == request.user.pk
@@ -0,0 +1,41 @@
+"""
+Fails tests that exceed a query budget, whether set on the test with
+`@pytest.mark.query_budget(n)` or on the viewsets it calls, even when the
+code under test swallows the QueryBudgetExceeded error (e.g. in jobs).
+"""
+
+from contextlib import nullcontext
+
+import pytest
+
+from core.query_budget import query_budget, query_budget_exceeded
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries): fail the test above max_queries queries"
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    errors = []
+
+    def record(error, **_kwargs):
+        errors.append(error)
+
+    marker = item.get_closest_marker("query_budget")
+    budget = nullcontext()
+    if marker is not None:
+        budget = query_budget(*marker.args, name=item.nodeid, **marker.kwargs)
+
+    query_budget_exceeded.connect(record, weak=False)
+    try:
+        with budget:
+            result = yield
+    finally:
+        query_budget_exceeded.disconnect(record)
+
+    if errors:
+        pytest.fail("\n\n".join(str(error) for error in errors), pytrace=False)
+    return result
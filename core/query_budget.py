@@ -0,0 +1,129 @@
+import logging
+import time
+import traceback
+from contextlib import ContextDecorator
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_OFF = "off"
+QUERY_BUDGET_WARN = "warn"
+QUERY_BUDGET_RAISE = "raise"
+
+# Sent with the QueryBudgetExceeded error, even when it is only logged
+query_budget_exceeded = Signal()
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, name, max_queries, queries):
+        self.name = name
+        self.max_queries = max_queries
+        self.queries = queries
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(queries, 1))
+        super().__init__(
+            f"{name} ran {len(queries)} queries, its budget is {max_queries}:\n{listing}"
+        )
+
+
+def get_query_origin() -> str:
+    """`file:line in function` of the innermost project frame running the query."""
+    root = str(settings.BASE_DIR.parent)
+    for frame in reversed(traceback.extract_stack()):
+        if (
+            frame.filename.startswith(root)
+            and "site-packages" not in frame.filename
+            and frame.filename != __file__
+        ):
+            path = Path(frame.filename).relative_to(root)
+            return f"{path}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class QueryCounter:
+    """Execute wrapper recording the SQL of every query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class SlowQueryLogger:
+    """Execute wrapper logging the SQL, duration and origin of slow queries."""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                logger.warning(
+                    "Slow query (%.1f ms) from %s: %s",
+                    duration_ms,
+                    get_query_origin(),
+                    sql,
+                )
+
+
+class query_budget(ContextDecorator):  # noqa: N801
+    """
+    Context manager and decorator checking that a block runs at most
+    `max_queries` queries.
+
+    What happens over budget depends on QUERY_BUDGET_MODE: "raise" raises
+    QueryBudgetExceeded (test settings), "warn" logs it (dev settings) and
+    "off" doesn't even count the queries.
+
+        with query_budget(2, name="task list"):
+            ...
+
+        @query_budget(5)
+        def export(): ...
+    """
+
+    def __init__(self, max_queries, name=None, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.name = name
+        self.using = using
+        self._wrappers = []
+
+    def __call__(self, func):
+        if self.name is None:
+            self.name = func.__qualname__
+        return super().__call__(func)
+
+    def __enter__(self):
+        counter = QueryCounter()
+        wrapper = None
+        if settings.QUERY_BUDGET_MODE != QUERY_BUDGET_OFF:
+            wrapper = connections[self.using].execute_wrapper(counter)
+            wrapper.__enter__()
+        # Kept on a stack, so a decorated function may call itself
+        self._wrappers.append((counter, wrapper))
+        return counter
+
+    def __exit__(self, exc_type, exc_value, tb):
+        counter, wrapper = self._wrappers.pop()
+        if wrapper is None:
+            return
+        wrapper.__exit__(exc_type, exc_value, tb)
+        if len(counter.queries) <= self.max_queries:
+            return
+
+        error = QueryBudgetExceeded(
+            self.name or "block", self.max_queries, counter.queries
+        )
+        query_budget_exceeded.send(sender=self.__class__, error=error)
+        if settings.QUERY_BUDGET_MODE == QUERY_BUDGET_RAISE and exc_type is None:
+            raise error
+        logger.warning(str(error))
@@ -0,0 +1,62 @@
+from rest_framework.renderers import BaseRenderer
+
+# pyarrow takes longer to import than the rest of the API, so it (and
+# core.columnar, built on it) is only imported when a columnar format is rendered
+
+
+class BaseColumnarRenderer(BaseRenderer):
+    """
+    Renders a ColumnarExport built by the view. Any other data (errors,
+    single objects) is rendered as a table of its rows.
+    """
+
+    charset = None
+    render_style = "binary"
+
+    def write(self, data, sink):
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import pyarrow as pa  # noqa: PLC0415
+
+        from core.columnar import ColumnarExport  # noqa: PLC0415
+
+        if data is None:
+            return b""
+        if not isinstance(data, ColumnarExport):
+            rows = [data] if isinstance(data, dict) else list(data)
+            data = pa.Table.from_pylist([dict(row) for row in rows])
+        sink = pa.BufferOutputStream()
+        self.write(data, sink)
+        return sink.getvalue().to_pybytes()
+
+
+class ParquetRenderer(BaseColumnarRenderer):
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+    def write(self, data, sink):
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        from core.columnar import ColumnarExport  # noqa: PLC0415
+
+        if isinstance(data, ColumnarExport):
+            data.write_parquet(sink)
+        else:
+            pq.write_table(data, sink)
+
+
+class ArrowIPCRenderer(BaseColumnarRenderer):
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+
+    def write(self, data, sink):
+        import pyarrow as pa  # noqa: PLC0415
+
+        from core.columnar import ColumnarExport  # noqa: PLC0415
+
+        if isinstance(data, ColumnarExport):
+            data.write_arrow(sink)
+            return
+        with pa.ipc.new_stream(sink, data.schema) as writer:
+            writer.write_table(data)
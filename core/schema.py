@@ -0,0 +1,26 @@
+"""
+The drf_spectacular decorators and types that document the API schema of the
+views and serializers. Without API_DOCS_ENABLED nothing reads the schema: they
+are no-ops, and drf_spectacular is not imported at all.
+"""
+
+from django.conf import settings
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.types import OpenApiTypes
+    from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_field
+else:
+    from types import SimpleNamespace
+
+    OpenApiTypes = SimpleNamespace(INT="int", STR="str")
+
+    class OpenApiParameter:
+        def __init__(self, name, *args, **kwargs):
+            self.name = name
+
+    def extend_schema(*_args, **_kwargs):
+        return lambda target: target
+
+    extend_schema_field = extend_schema
+
+__all__ = ["OpenApiParameter", "OpenApiTypes", "extend_schema", "extend_schema_field"]
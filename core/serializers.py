@@ -0,0 +1,88 @@
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from django.db import models
+from rest_framework import serializers
+
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, UserIdentityMap
+from core.schema import OpenApiTypes, extend_schema_field
+
+SPARSE_FIELDSET_CONTEXT_KEY = "sparse_fieldset"
+
+
+class SparseFieldset(NamedTuple):
+    """Fields requested with `?fields=` (None means all) minus those in `?exclude=`."""
+
+    fields: frozenset | None
+    exclude: frozenset
+
+    def keeps(self, name: str) -> bool:
+        return (self.fields is None or name in self.fields) and name not in self.exclude
+
+
+def get_context_identity_map(context) -> UserIdentityMap:
+    """Identity map of the serializer context, created on first use when missing."""
+    identity_map = context.get(IDENTITY_MAP_CONTEXT_KEY)
+    if identity_map is None:
+        identity_map = context[IDENTITY_MAP_CONTEXT_KEY] = UserIdentityMap()
+    return identity_map
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class UsernameField(serializers.ReadOnlyField):
+    """
+    Readonly username of a related user, resolved from the `<field>_id` column
+    through the identity map, so the related user is never lazily fetched per row.
+    """
+
+    def __init__(self, id_attr=None, **kwargs):
+        self.id_attr = id_attr
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        if self.id_attr is None:
+            self.id_attr = f"{field_name}_id"
+
+    def get_attribute(self, instance):
+        if isinstance(instance, Mapping):
+            # Rows that were already serialized, e.g. cached list data rendered as CSV
+            return instance.get(self.field_name)
+        user = get_context_identity_map(self.context).get(getattr(instance, self.id_attr))
+        return user.username if user is not None else None
+
+    def to_representation(self, value):
+        return value
+
+
+class IdentityMapListSerializer(serializers.ListSerializer):
+    """Primes the identity map with every user referenced by the rows in one query."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        id_attrs = [
+            field.id_attr
+            for field in self.child.fields.values()
+            if isinstance(field, UsernameField)
+        ]
+        if id_attrs:
+            get_context_identity_map(self.context).prime(
+                getattr(row, id_attr)
+                for row in rows
+                if not isinstance(row, Mapping)
+                for id_attr in id_attrs
+            )
+        return super().to_representation(rows)
+
+
+class SparseFieldsetMixin:
+    """Drops the fields not requested by the sparse fieldset of the serializer context."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fieldset = self.context.get(SPARSE_FIELDSET_CONTEXT_KEY)
+        if sparse_fieldset is None:
+            return fields
+        return {
+            name: field for name, field in fields.items() if sparse_fieldset.keeps(name)
+        }
@@ -36,8 +36,13 @@ ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="").split(",")
 
 # Application definition
 
+# Processes that only serve the API can leave out the admin and the OpenAPI
+# schema/Swagger/Redoc views, which are then neither imported nor routed
+ADMIN_ENABLED = config("ADMIN_ENABLED", default=True, cast=bool)
+API_DOCS_ENABLED = config("API_DOCS_ENABLED", default=True, cast=bool)
+
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    *(["django.contrib.admin"] if ADMIN_ENABLED else []),
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -45,13 +50,22 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     # Third-party
     "rest_framework",
-    "drf_spectacular",
+    *(["drf_spectacular"] if API_DOCS_ENABLED else []),
     # Apps
+    "core",
+    "jobs",
     "tasks",
+    "webhooks",
 ]
 
+# Modules imported by core.startup.preload before gunicorn forks its workers
+# (preload_app), on top of the URLconf and the views it routes to
+PRELOAD_MODULES = ["core.columnar"]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.LoadSheddingMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -99,9 +113,33 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": f"redis://{config('REDIS_HOST')}:{config('REDIS_PORT')}/0",
+        # Bump when the serializer changes, so that processes of the previous
+        # release never read entries written in a format they can't decode
+        "VERSION": 2,
+        "OPTIONS": {
+            "serializer": config(
+                "CACHE_SERIALIZER", default="core.cache_serializers.MsgpackSerializer"
+            ),
+        },
     },
 }
 
+# Compression of the values encoded by core.cache_serializers.MsgpackSerializer:
+# "zstd", "zlib" or "" (none), applied from CACHE_VALUE_COMPRESS_MIN_SIZE bytes
+CACHE_VALUE_COMPRESSION = config("CACHE_VALUE_COMPRESSION", default="zstd")
+CACHE_VALUE_COMPRESS_MIN_SIZE = config(
+    "CACHE_VALUE_COMPRESS_MIN_SIZE", default=1024, cast=int
+)
+
+# Server-sent events of core.events: published through Redis pub/sub, with the
+# last EVENTS_BACKLOG_SIZE events of a user kept for clients resuming a stream
+EVENTS_REDIS_URL = config("EVENTS_REDIS_URL", default=CACHES["default"]["LOCATION"])
+EVENTS_KEY_PREFIX = "events"
+EVENTS_BACKLOG_SIZE = int(config("EVENTS_BACKLOG_SIZE", 1000))
+EVENTS_BACKLOG_TTL = int(config("EVENTS_BACKLOG_TTL", 24 * 60 * 60))  # in seconds
+EVENTS_HEARTBEAT_INTERVAL = float(config("EVENTS_HEARTBEAT_INTERVAL", 15))  # in seconds
+EVENTS_RETRY_INTERVAL = int(config("EVENTS_RETRY_INTERVAL", 3000))  # in ms
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -139,6 +177,10 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Uploaded files and background job results
+MEDIA_URL = "media/"
+MEDIA_ROOT = config("MEDIA_ROOT", default=str(BASE_DIR.parent / "media"))
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -146,13 +188,24 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("core.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    **(
+        {"DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema"}
+        if API_DOCS_ENABLED
+        else {}
+    ),
+    # Token buckets per user, endpoint and action, weighted by request cost
+    "DEFAULT_THROTTLE_CLASSES": ("core.throttling.TokenBucketThrottle",),
+    "DEFAULT_THROTTLE_RATES": {
+        "user": config("THROTTLE_USER_RATE", default="600/min"),
+        "anon": config("THROTTLE_ANON_RATE", default="60/min"),
+    },
 }
 
+# Redis of the token buckets of core.throttling, "" throttles per process
+THROTTLE_REDIS_URL = config("THROTTLE_REDIS_URL", default=CACHES["default"]["LOCATION"])
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Task Manager API",
     "DESCRIPTION": "A project to manage tasks with Django REST Framework and JWT authentication.",
@@ -165,3 +218,61 @@ SPECTACULAR_SETTINGS = {
 
 CACHE_TIMEOUT = int(config("CACHE_TIMEOUT", 120))  # in seconds
 RECENT_TASKS_COUNT = int(config("RECENT_TASKS_COUNT", 10))
+TASK_AGENDA_DEFAULT_LIMIT = int(config("TASK_AGENDA_DEFAULT_LIMIT", 10))
+TASK_AGENDA_MAX_LIMIT = int(config("TASK_AGENDA_MAX_LIMIT", 100))
+AUTH_USER_CACHE_TIMEOUT = int(config("AUTH_USER_CACHE_TIMEOUT", 300))  # in seconds
+# Recompute the hot task lists in a job after writes instead of only dropping them
+TASK_CACHE_REFRESH_ON_WRITE = config(
+    "TASK_CACHE_REFRESH_ON_WRITE", default=False, cast=bool
+)
+
+# Seconds a request may run before gunicorn kills its worker (gunicorn.conf.py)
+REQUEST_TIMEOUT = int(config("REQUEST_TIMEOUT", 120))
+
+# Responses of unsafe requests sent with an Idempotency-Key are replayed for
+# this long, and duplicates of a request in progress are told to retry after
+IDEMPOTENCY_KEY_TTL = int(config("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))  # in seconds
+IDEMPOTENCY_RETRY_AFTER = int(config("IDEMPOTENCY_RETRY_AFTER", 1))  # in seconds
+
+# Response compression, encodings in order of preference
+COMPRESSION_ENCODINGS = config(
+    "COMPRESSION_ENCODINGS", default="zstd,br,gzip", cast=lambda v: v.split(",")
+)
+COMPRESSION_MIN_SIZE = int(config("COMPRESSION_MIN_SIZE", 1024))  # in bytes
+
+# Connections waiting for a worker of the host, and requests in progress per
+# process (threaded or async workers only), above which new requests get a 503.
+# 0 disables either
+LOAD_SHEDDING_MAX_QUEUE_DEPTH = int(config("LOAD_SHEDDING_MAX_QUEUE_DEPTH", 64))
+LOAD_SHEDDING_MAX_CONCURRENCY = int(config("LOAD_SHEDDING_MAX_CONCURRENCY", 0))
+LOAD_SHEDDING_RETRY_AFTER = int(config("LOAD_SHEDDING_RETRY_AFTER", 5))  # in seconds
+
+# Query budgets of viewsets and query_budget blocks: "off", "warn" or "raise"
+QUERY_BUDGET_MODE = config("QUERY_BUDGET_MODE", default="off")
+# Log queries slower than this with their origin, 0 disables it
+SLOW_QUERY_THRESHOLD_MS = int(config("SLOW_QUERY_THRESHOLD_MS", 0))
+
+# Background jobs
+JOBS_WORKER_PROCESSES = int(config("JOBS_WORKER_PROCESSES", 2))
+JOBS_POLL_INTERVAL = float(config("JOBS_POLL_INTERVAL", 1.0))
+
+# Due date reminders, sent by the send_task_reminders command
+TASK_REMINDER_DAYS_BEFORE = int(config("TASK_REMINDER_DAYS_BEFORE", 1))
+TASK_REMINDER_TIME = config("TASK_REMINDER_TIME", default="09:00")  # in TIME_ZONE
+# Dotted path of the tasks.reminders.ReminderNotifier sending them
+TASK_REMINDER_NOTIFIER = config(
+    "TASK_REMINDER_NOTIFIER", default="tasks.reminders.EmailReminderNotifier"
+)
+TASK_REMINDER_BATCH_SIZE = int(config("TASK_REMINDER_BATCH_SIZE", 500))
+TASK_REMINDER_POLL_INTERVAL = float(config("TASK_REMINDER_POLL_INTERVAL", 60))
+TASK_REMINDER_RETRY_DELAY = int(config("TASK_REMINDER_RETRY_DELAY", 300))  # in seconds
+
+# Webhooks, delivered from the outbox by the dispatch_webhooks command
+WEBHOOKS_BATCH_SIZE = int(config("WEBHOOKS_BATCH_SIZE", 500))  # outbox events
+WEBHOOKS_CONCURRENCY = int(config("WEBHOOKS_CONCURRENCY", 20))  # requests in flight
+WEBHOOKS_TIMEOUT = float(config("WEBHOOKS_TIMEOUT", 10))  # in seconds
+WEBHOOKS_MAX_ATTEMPTS = int(config("WEBHOOKS_MAX_ATTEMPTS", 8))
+# Delay before the first retry, doubled on each attempt up to the max
+WEBHOOKS_RETRY_DELAY = float(config("WEBHOOKS_RETRY_DELAY", 30))  # in seconds
+WEBHOOKS_MAX_RETRY_DELAY = float(config("WEBHOOKS_MAX_RETRY_DELAY", 6 * 60 * 60))
+WEBHOOKS_POLL_INTERVAL = float(config("WEBHOOKS_POLL_INTERVAL", 1.0))
@@ -2,3 +2,6 @@ from .base import *
 
 DEBUG = True
 ALLOWED_HOSTS = ["*"]
+
+QUERY_BUDGET_MODE = config("QUERY_BUDGET_MODE", default="warn")
+SLOW_QUERY_THRESHOLD_MS = int(config("SLOW_QUERY_THRESHOLD_MS", 100))
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from .base import *
 
 DEBUG = False
@@ -20,6 +23,36 @@ class DisableMigrations:
 
 MIGRATION_MODULES = DisableMigrations()
 
+# Fail on query budget overruns, and report queries slow enough to slow the suite
+QUERY_BUDGET_MODE = "raise"
+SLOW_QUERY_THRESHOLD_MS = 200
+
+# Under pytest-xdist every worker (gw0, gw1, ...) runs in its own process.
+# pytest-django already suffixes the test database name with the worker id,
+# the other shared resources are split here.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")
+XDIST_WORKER_ID = int(XDIST_WORKER.removeprefix("gw") or 0)
+
+# Clone test databases from a template built by `manage.py build_test_db_template`,
+# which already holds the schema and the large dataset of the performance tests
+DATABASES["default"]["TEST"] = {
+    "TEMPLATE": config("TEST_DB_TEMPLATE", default="") or None,
+}
+
+# cache.clear() flushes a whole Redis database: one per worker, none shared with dev
+CACHES["default"]["LOCATION"] = (
+    f"redis://{config('REDIS_HOST')}:{config('REDIS_PORT')}/{XDIST_WORKER_ID % 15 + 1}"
+)
+EVENTS_REDIS_URL = CACHES["default"]["LOCATION"]
+THROTTLE_REDIS_URL = CACHES["default"]["LOCATION"]
+# Pub/sub channels are shared by every Redis database
+EVENTS_KEY_PREFIX = "-".join(filter(None, ["events", XDIST_WORKER]))
+
+# Keep files written by background jobs out of the project tree
+MEDIA_ROOT = Path(tempfile.gettempdir()) / "-".join(
+    filter(None, ["taskmanager-test-media", XDIST_WORKER])
+)
+
 # Optional: Configure pytest-factoryboy and faker
 INSTALLED_APPS += [
     "pytest_django",
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.identity_map import invalidate_user_snapshot
+from core.query_budget import SlowQueryLogger
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(instance, **_kwargs):
+    invalidate_user_snapshot(instance.pk)
+
+
+@receiver(connection_created)
+def install_slow_query_logger(connection, **_kwargs):
+    if not settings.SLOW_QUERY_THRESHOLD_MS or any(
+        isinstance(wrapper, SlowQueryLogger) for wrapper in connection.execute_wrappers
+    ):
+        return
+    connection.execute_wrappers.append(SlowQueryLogger(settings.SLOW_QUERY_THRESHOLD_MS))
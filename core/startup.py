@@ -0,0 +1,18 @@
+import importlib
+
+from django.conf import settings
+from django.db import connections
+
+
+def preload():
+    """
+    Import what the first request of a worker would otherwise import: the
+    URLconf, the views it routes to and `PRELOAD_MODULES`.
+
+    Called by gunicorn in the master process when preload_app is set, so
+    forked workers start with these modules already loaded and share them.
+    """
+    for module in [settings.ROOT_URLCONF, *settings.PRELOAD_MODULES]:
+        importlib.import_module(module)
+    # Database connections must not be inherited by the forked workers
+    connections.close_all()
@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.admin import EstimatedCountPaginator, iterate_in_batches
+from core.factories import UserFactory
+
+
+class TestIterateInBatches(TestCase):
+    def test_batches_follow_the_primary_key(self):
+        users = sorted(UserFactory.create_batch(5), key=lambda user: user.pk)
+
+        with self.assertNumQueries(3):
+            batches = list(
+                iterate_in_batches(User.objects.all(), "username", batch_size=2)
+            )
+
+        self.assertEqual(
+            batches,
+            [
+                [(user.pk, user.username) for user in users[:2]],
+                [(user.pk, user.username) for user in users[2:4]],
+                [(users[4].pk, users[4].username)],
+            ],
+        )
+
+
+class TestEstimatedCountPaginator(TestCase):
+    def test_small_counts_are_exact(self):
+        UserFactory.create_batch(3)
+
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+
+        self.assertEqual((paginator.count, paginator.is_estimated), (3, False))
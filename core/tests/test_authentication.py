@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.authentication import CachedJWTAuthentication, get_user_snapshot_cache_key
+from core.factories import UserFactory
+
+
+class TestCachedJWTAuthentication(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(is_staff=True)
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def test_cached_user_needs_no_query(self):
+        with self.assertNumQueries(1):
+            self.authentication.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.username, self.user.username)
+            self.assertTrue(user.is_staff)
+            self.assertTrue(user.is_authenticated)
+
+    def test_snapshot_user_loads_other_fields_lazily(self):
+        self.authentication.get_user(self.token)
+        user = self.authentication.get_user(self.token)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+
+    def test_user_save_invalidates_snapshot(self):
+        self.authentication.get_user(self.token)
+
+        self.user.username = "renamed"
+        self.user.save()
+        self.assertIsNone(cache.get(get_user_snapshot_cache_key(self.user.pk)))
+        self.assertEqual(self.authentication.get_user(self.token).username, "renamed")
+
+    def test_deactivated_user_is_rejected(self):
+        self.authentication.get_user(self.token)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
@@ -0,0 +1,56 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase
+
+from core.models import uuid7
+from tasks.factories import TaskFactory
+from tasks.models import Task
+
+
+class TestUuid7(SimpleTestCase):
+    def test_version_and_variant(self):
+        key = uuid7()
+
+        self.assertEqual(key.version, 7)
+        self.assertEqual(key.variant, uuid.RFC_4122)
+
+    def test_keys_sort_in_creation_order(self):
+        keys = [uuid7() for _ in range(1_000)]
+
+        self.assertEqual(sorted(keys), keys)
+        self.assertEqual(len(set(keys)), len(keys))
+
+
+class TestTimeOrderedBaseModel(TestCase):
+    def test_new_rows_get_uuid7_keys_next_to_uuid4_rows(self):
+        legacy = TaskFactory(id=uuid.uuid4())
+        task = TaskFactory(owner=legacy.owner)
+
+        self.assertEqual(task.id.version, 7)
+        self.assertEqual(
+            set(Task.objects.filter(owner=legacy.owner).values_list("id", flat=True)),
+            {legacy.id, task.id},
+        )
+
+
+class TestUpdateReturning(TestCase):
+    def test_returns_updated_instances(self):
+        task = TaskFactory(priority=3)
+
+        # The update, then the history insert
+        with self.assertNumQueries(2):
+            (updated,) = Task.objects.filter(pk=task.pk).update_returning(priority=1)
+
+        self.assertEqual(updated.pk, task.pk)
+        self.assertEqual(updated.priority, 1)
+        self.assertEqual(updated.owner_id, task.owner_id)
+        self.assertGreater(updated.updated_at, task.updated_at)
+        self.assertFalse(updated._state.adding)
+
+    def test_filters_across_relations_are_rejected(self):
+        task = TaskFactory()
+
+        with self.assertRaises(ValueError):
+            Task.objects.filter(owner__username=task.owner.username).update_returning(
+                priority=1
+            )
@@ -0,0 +1,78 @@
+import pickle
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.cache_serializers import MSGPACK_V1, ZLIB, ZSTD, MsgpackSerializer
+from core.compression import compress
+
+
+class TestMsgpackSerializer(SimpleTestCase):
+    def test_round_trip(self):
+        value = {
+            "id": uuid.uuid4(),
+            "created_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "due_date": date(2025, 1, 3),
+            "amount": Decimal("1.50"),
+            "items": [{"title": "Task", "priority": 3, "done": False}] * 3,
+            "body": b"\x00bytes",
+        }
+        serializer = MsgpackSerializer(compression="")
+
+        data = serializer.dumps(value)
+
+        self.assertEqual(data[:2], MSGPACK_V1 + b"-")
+        self.assertEqual(serializer.loads(data), value)
+
+    def test_compression_above_min_size(self):
+        value = {"items": [{"title": "Task", "priority": 3}] * 100}
+        for compression, marker in ((ZLIB, b"z"), (ZSTD, b"s")):
+            with self.subTest(compression=compression):
+                serializer = MsgpackSerializer(
+                    compression=compression, compress_min_size=100
+                )
+                data = serializer.dumps(value)
+
+                self.assertEqual(data[1:2], marker)
+                self.assertEqual(serializer.loads(data), value)
+                # Entries are decoded by their markers, not the current settings
+                self.assertEqual(MsgpackSerializer(compression="").loads(data), value)
+
+        small = MsgpackSerializer(compression=ZSTD, compress_min_size=100).dumps({"a": 1})
+        self.assertEqual(small[1:2], b"-")
+
+    def test_incompressible_values_are_stored_as_is(self):
+        body = compress(b'{"items": []}' * 200, ZSTD)
+        serializer = MsgpackSerializer(compression=ZSTD, compress_min_size=0)
+
+        data = serializer.dumps(({"Content-Encoding": ZSTD}, body))
+
+        self.assertEqual(data[1:2], b"-")
+        # Tuples come back as lists
+        self.assertEqual(serializer.loads(data), [{"Content-Encoding": ZSTD}, body])
+
+    def test_pickle_fallback_and_legacy_entries(self):
+        serializer = MsgpackSerializer()
+        value = {1, 2, 3}  # msgpack has no sets
+
+        self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+        self.assertEqual(serializer.loads(pickle.dumps({"a": [1]})), {"a": [1]})
+
+    def test_integers_are_not_encoded(self):
+        serializer = MsgpackSerializer()
+
+        self.assertEqual(serializer.dumps(42), 42)
+        self.assertEqual(serializer.loads(b"42"), 42)
+        self.assertIsInstance(serializer.dumps(obj=True), bytes)
+
+    def test_cache_backend(self):
+        cache.set("codec:counter", 1)
+        cache.incr("codec:counter")
+        cache.set("codec:page", {"items": [{"id": str(uuid.uuid4())}]})
+
+        self.assertEqual(cache.get("codec:counter"), 2)
+        self.assertEqual(len(cache.get("codec:page")["items"]), 1)
+        cache.delete_many(["codec:counter", "codec:page"])
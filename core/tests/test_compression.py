@@ -0,0 +1,69 @@
+import gzip
+
+import brotli
+import zstandard
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.compression import BROTLI, GZIP, ZSTD, compress_stream, select_encoding
+from core.middleware import CompressionMiddleware
+
+DECOMPRESS = {
+    GZIP: gzip.decompress,
+    BROTLI: brotli.decompress,
+    ZSTD: lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+class TestSelectEncoding(SimpleTestCase):
+    def test_server_preference_wins(self):
+        self.assertEqual(select_encoding("gzip, deflate, br, zstd"), ZSTD)
+        self.assertEqual(select_encoding("gzip, br"), BROTLI)
+        self.assertEqual(select_encoding("gzip"), GZIP)
+
+    def test_quality_values(self):
+        self.assertEqual(select_encoding("zstd;q=0, br;q=0.5, gzip"), BROTLI)
+        self.assertEqual(select_encoding("*;q=0.1, zstd;q=0"), BROTLI)
+        self.assertIsNone(select_encoding("identity"))
+        self.assertIsNone(select_encoding(""))
+
+    def test_stream_round_trip(self):
+        chunks = [b"id,title\n", *(f"{i},task {i}\n".encode() for i in range(500))]
+        for encoding, decompress in DECOMPRESS.items():
+            with self.subTest(encoding=encoding):
+                compressed = b"".join(compress_stream(iter(chunks), encoding))
+                self.assertEqual(decompress(compressed), b"".join(chunks))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class TestCompressionMiddleware(SimpleTestCase):
+    def process(self, response, accept_encoding="gzip, br, zstd"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda _request: response)(request)
+
+    def test_compresses_large_responses(self):
+        body = b'{"items": []}' * 100
+        response = self.process(HttpResponse(body))
+
+        self.assertEqual(response["Content-Encoding"], ZSTD)
+        self.assertEqual(DECOMPRESS[ZSTD](response.content), body)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_skips_small_and_encoded_responses(self):
+        self.assertFalse(
+            self.process(HttpResponse(b"tiny")).has_header("Content-Encoding")
+        )
+
+        response = HttpResponse(b"x" * 1000)
+        response["Content-Encoding"] = GZIP
+        self.assertEqual(self.process(response).content, b"x" * 1000)
+
+    def test_streaming_response(self):
+        chunks = [b"a,b\n" * 100] * 10
+        response = self.process(StreamingHttpResponse(iter(chunks)), "gzip")
+
+        self.assertEqual(response["Content-Encoding"], GZIP)
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks)
+        )
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.events import (
+    get_event_hub,
+    get_event_stream_key,
+    get_redis_client,
+    publish_event,
+    stream_events,
+)
+from core.factories import UserFactory
+from tasks.views import TaskViewSet
+
+
+def clear_backlog(user_id):
+    get_redis_client(settings.EVENTS_REDIS_URL).delete(get_event_stream_key(user_id))
+
+
+class TestStreamEvents(SimpleTestCase):
+    user_id = "0198e6a4-0000-7000-8000-000000000001"
+
+    def setUp(self):
+        clear_backlog(self.user_id)
+
+    async def read_events(self, count, last_event_id=None, publish=None):
+        """The first `count` messages of a stream, calling `publish` once subscribed."""
+        events = stream_events(self.user_id, last_event_id)
+        hub = get_event_hub()
+        try:
+            messages = [await anext(events)]
+            if publish is not None:
+                publish()
+            messages += [await anext(events) for _ in range(count - 1)]
+        finally:
+            await events.aclose()
+            self.assertEqual(hub.subscriptions, {})
+            await hub.close()
+        return messages
+
+    async def test_backlog_after_last_event_id_is_replayed(self):
+        first = publish_event(self.user_id, "task.created", {"id": 1})
+        second = publish_event(self.user_id, "task.updated", {"id": 1, "priority": 2})
+
+        messages = await self.read_events(2, last_event_id=first)
+
+        self.assertEqual(
+            messages,
+            [
+                f"retry: {settings.EVENTS_RETRY_INTERVAL}\n\n",
+                f'id: {second}\nevent: task.updated\ndata: {{"id": 1, "priority": 2}}\n\n',
+            ],
+        )
+
+    async def test_missing_backlog_resets_the_client(self):
+        messages = await self.read_events(2, last_event_id="1-0")
+
+        self.assertEqual(messages[1], "id: 1-0\nevent: reset\ndata: {}\n\n")
+
+    async def test_published_events_reach_the_live_stream(self):
+        published = []
+
+        messages = await self.read_events(
+            2,
+            publish=lambda: published.append(
+                publish_event(self.user_id, "task.deleted", {"id": 1})
+            ),
+        )
+
+        self.assertEqual(
+            messages[1],
+            f'id: {published[0]}\nevent: task.deleted\ndata: {{"id": 1}}\n\n',
+        )
+
+    @override_settings(EVENTS_HEARTBEAT_INTERVAL=0.01)
+    async def test_idle_stream_sends_heartbeats(self):
+        messages = await self.read_events(2)
+
+        self.assertEqual(messages[1], ": heartbeat\n\n")
+
+
+class TestEventStreamView(TestCase):
+    async def test_anonymous_requests_are_rejected(self):
+        response = await self.async_client.get("/api/tasks/events/")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_wsgi_requests_are_refused(self):
+        self.client.force_login(UserFactory())
+
+        response = self.client.get("/api/tasks/events/")
+
+        self.assertEqual(response.status_code, 501)
+
+
+class TestChangeEvents(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        clear_backlog(self.user.pk)
+
+    def test_created_task_is_published_on_commit(self):
+        request = APIRequestFactory().post(
+            "/tasks/", {"title": "Write docs", "due_date": "2030-01-01"}, format="json"
+        )
+        force_authenticate(request, user=self.user)
+        client = get_redis_client(settings.EVENTS_REDIS_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = TaskViewSet.as_view({"post": "create"})(request)
+            self.assertEqual(client.xlen(get_event_stream_key(self.user.pk)), 0)
+
+        ((_, fields),) = client.xrange(get_event_stream_key(self.user.pk))
+        self.assertEqual(fields[b"type"], b"task.created")
+        self.assertIn(str(response.data["id"]).encode(), fields[b"data"])
@@ -0,0 +1,34 @@
+from django.test import TestCase
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.models import Task
+
+
+class TestBulkCreateFactory(TestCase):
+    def test_create_batch_bulk_creates_rows_and_related_rows(self):
+        # One INSERT for the owners built by the SubFactory, one for the tasks
+        with self.assertNumQueries(2):
+            tasks = TaskFactory.create_batch(4)
+
+        self.assertEqual(
+            set(
+                Task.objects.filter(pk__in=[task.pk for task in tasks]).values_list(
+                    "pk", "owner_id"
+                )
+            ),
+            {(task.pk, task.owner.pk) for task in tasks},
+        )
+        self.assertTrue(all(task.created_at is not None for task in tasks))
+
+    def test_created_rows_behave_as_saved(self):
+        user = UserFactory()
+        task = TaskFactory.create_batch(1, owner=user)[0]
+
+        self.assertFalse(task._state.adding)
+        self.assertEqual(task._update_fields, task._default_update_fields)
+
+        task.title = "Renamed"
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.title, "Renamed")
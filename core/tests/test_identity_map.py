@@ -0,0 +1,40 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+
+from core.factories import UserFactory
+from core.identity_map import UserIdentityMap, get_user_identity_map
+
+
+class TestUserIdentityMap(TestCase):
+    def test_prime_fetches_missing_users_once(self):
+        users = UserFactory.create_batch(3)
+        identity_map = UserIdentityMap([users[0]])
+
+        with self.assertNumQueries(1):
+            identity_map.prime([user.id for user in users] + [None])
+
+        with self.assertNumQueries(0):
+            usernames = [identity_map.get(user.id).username for user in users]
+        self.assertEqual(usernames, [user.username for user in users])
+
+    def test_unknown_ids_are_not_queried_twice(self):
+        identity_map = UserIdentityMap()
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(identity_map.get(-1))
+            self.assertIsNone(identity_map.get(-1))
+
+    def test_request_map_is_seeded_with_user(self):
+        request = RequestFactory().get("/")
+        request.user = UserFactory()
+
+        identity_map = get_user_identity_map(request)
+        self.assertIs(get_user_identity_map(request), identity_map)
+        with self.assertNumQueries(0):
+            self.assertEqual(identity_map.get(request.user.id), request.user)
+
+    def test_request_map_ignores_anonymous_user(self):
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        self.assertNotIn(None, get_user_identity_map(request))
@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from core.partitions import (
+    add_months,
+    create_monthly_partitions,
+    create_partitioned_table,
+    drop_monthly_partitions,
+    get_partitions,
+)
+from tasks.factories import TaskFactory
+from tasks.models import TaskHistory
+
+
+class TestAddMonths(SimpleTestCase):
+    def test_across_years(self):
+        self.assertEqual(add_months(date(2026, 11, 1), 2), date(2027, 1, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+
+
+class TestMonthlyPartitions(TestCase):
+    def setUp(self):
+        # Tests run without migrations, so the table is not partitioned yet
+        with connection.schema_editor() as editor:
+            editor.delete_model(TaskHistory)
+            create_partitioned_table(editor, TaskHistory, "changed_at")
+
+    def test_rows_of_the_default_partition_move_to_their_month(self):
+        task = TaskFactory()
+        changed_at = datetime(2020, 2, 10, tzinfo=timezone.utc)
+        TaskHistory.objects.create(
+            object_id=task.pk, changes={"priority": [3, 1]}, changed_at=changed_at
+        )
+
+        created = create_monthly_partitions(
+            TaskHistory, months=2, start=date(2020, 2, 20)
+        )
+
+        self.assertEqual(created, ["task_history_p202002", "task_history_p202003"])
+        self.assertEqual(
+            create_monthly_partitions(TaskHistory, start=date(2020, 2, 1)),
+            ["task_history_p202004"],
+        )
+        self.assertEqual(
+            TaskHistory.objects.get(object_id=task.pk).changed_at, changed_at
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM task_history_p202002")
+            self.assertEqual(cursor.fetchone(), (1,))
+
+        dropped = drop_monthly_partitions(TaskHistory, before=date(2020, 4, 1))
+
+        self.assertEqual(dropped, ["task_history_p202002", "task_history_p202003"])
+        self.assertNotIn("task_history_p202002", get_partitions("task_history"))
+        self.assertIn("task_history_default", get_partitions("task_history"))
+        self.assertFalse(TaskHistory.objects.filter(object_id=task.pk).exists())
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from core.query_budget import (
+    QueryBudgetExceeded,
+    SlowQueryLogger,
+    query_budget,
+    query_budget_exceeded,
+)
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class TightTaskViewSet(TaskViewSet):
+    max_queries_per_request = {"list": 1}
+
+
+# The budget errors are expected here, keep them from the pytest plugin
+@patch.object(query_budget_exceeded, "send")
+class TestQueryBudget(TestCase):
+    def test_within_budget(self, send):
+        with query_budget(1) as counter:
+            User.objects.count()
+
+        self.assertEqual(len(counter.queries), 1)
+        send.assert_not_called()
+
+    def test_over_budget_raises(self, send):
+        with self.assertRaises(QueryBudgetExceeded) as cm, query_budget(1, name="users"):
+            User.objects.count()
+            User.objects.exists()
+
+        self.assertIn("users ran 2 queries, its budget is 1", str(cm.exception))
+        self.assertIn('FROM "auth_user"', str(cm.exception))
+        send.assert_called_once()
+
+    def test_decorator(self, send):
+        @query_budget(0)
+        def count_users():
+            return User.objects.count()
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "count_users ran 1 queries"):
+            count_users()
+
+    @override_settings(QUERY_BUDGET_MODE="warn")
+    def test_warn_mode(self, send):
+        with self.assertLogs("core.query_budget", "WARNING"), query_budget(0):
+            User.objects.count()
+        send.assert_called_once()
+
+    @override_settings(QUERY_BUDGET_MODE="off")
+    def test_off_mode(self, send):
+        with query_budget(0) as counter:
+            User.objects.count()
+        self.assertEqual(counter.queries, [])
+
+    def test_viewset_budget(self, send):
+        user = UserFactory()
+        TaskFactory(owner=user)
+        request = APIRequestFactory().get("/tasks/")
+        force_authenticate(request, user=user)
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "TightTaskViewSet.list"):
+            TightTaskViewSet.as_view({"get": "list"})(request)
+
+
+class TestSlowQueryLogger(TestCase):
+    def test_logs_sql_duration_and_origin(self):
+        with (
+            self.assertLogs("core.query_budget", "WARNING") as logs,
+            connection.execute_wrapper(SlowQueryLogger(threshold_ms=0)),
+        ):
+            User.objects.count()
+
+        self.assertIn("Slow query", logs.output[0])
+        self.assertIn("core/tests/test_query_budget.py", logs.output[0])
+        self.assertIn("test_logs_sql_duration_and_origin", logs.output[0])
+        self.assertIn('FROM "auth_user"', logs.output[0])
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(1)
+def test_query_budget_marker():
+    User.objects.count()
@@ -0,0 +1,69 @@
+import importlib
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+
+from core import urls
+from core.management.commands.profile_startup import parse_importtime
+
+IMPORTTIME_REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     pyarrow.lib
+import time:        20 |        120 |   pyarrow
+import time:        50 |        170 | core.columnar
+"""
+
+
+class TestParseImporttime(SimpleTestCase):
+    def test_rows_and_importers(self):
+        self.assertEqual(
+            parse_importtime(IMPORTTIME_REPORT),
+            [
+                ("pyarrow.lib", 100, 100, "pyarrow"),
+                ("pyarrow", 20, 120, "core.columnar"),
+                ("core.columnar", 50, 170, None),
+            ],
+        )
+
+
+class TestOptionalUrls(SimpleTestCase):
+    def reload_urls(self):
+        clear_url_caches()
+        importlib.reload(urls)
+
+    def tearDown(self):
+        self.reload_urls()
+
+    def test_enabled_by_default(self):
+        self.assertEqual(reverse("schema"), "/api/schema/")
+        self.assertEqual(reverse("admin:index"), "/admin/")
+
+    @override_settings(API_DOCS_ENABLED=False, ADMIN_ENABLED=False)
+    def test_disabled_views_are_not_routed(self):
+        self.reload_urls()
+
+        for name in ("schema", "swagger-ui", "redoc", "admin:index"):
+            with self.subTest(name=name), self.assertRaises(NoReverseMatch):
+                reverse(name)
+        self.assertEqual(reverse("task-list"), "/api/tasks/")
+
+
+class TestApiDocsDisabled(SimpleTestCase):
+    def test_drf_spectacular_is_not_imported(self):
+        # A fresh interpreter, as settings are read when the apps load
+        code = (
+            "import sys, django; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            "print(any(name.startswith('drf_spectacular') for name in sys.modules))"
+        )
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            env={**os.environ, "API_DOCS_ENABLED": "False"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
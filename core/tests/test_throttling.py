@@ -0,0 +1,174 @@
+import runpy
+import socket
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from core.middleware import LoadSheddingMiddleware, get_accept_queue_depth
+from core.throttling import INTERNAL_REQUEST, LocalTokenBuckets, TokenBucketThrottle
+from tasks.views import TaskViewSet
+
+THROTTLE_RATES = {"DEFAULT_THROTTLE_RATES": {"user": "5/min", "anon": "2/min"}}
+
+
+class CostlyView:
+    def __init__(self, cost):
+        self.cost = cost
+
+    def get_throttle_cost(self, request):
+        return self.cost
+
+
+class OtherCostlyView(CostlyView):
+    pass
+
+
+@override_settings(REST_FRAMEWORK=THROTTLE_RATES)
+class TestTokenBucketThrottle(TestCase):
+    def setUp(self):
+        cache.clear()
+        TokenBucketThrottle.local_buckets = LocalTokenBuckets()
+        self.request = Request(APIRequestFactory().get("/tasks/"))
+        self.request.user = UserFactory()
+
+    def allow(self, view, request=None):
+        throttle = TokenBucketThrottle()
+        return throttle.allow_request(request or self.request, view), throttle
+
+    def test_bucket_capacity_and_wait(self):
+        view = CostlyView(1)
+        for _ in range(5):
+            self.assertTrue(self.allow(view)[0])
+
+        allowed, throttle = self.allow(view)
+        self.assertFalse(allowed)
+        # 5 tokens per minute: one every 12 seconds
+        self.assertAlmostEqual(throttle.wait(), 12, delta=0.5)
+
+    def test_costs_and_buckets_per_endpoint(self):
+        self.assertTrue(self.allow(CostlyView(4))[0])
+        self.assertFalse(self.allow(CostlyView(4))[0])
+        # Other views and actions have their own bucket
+        self.assertTrue(self.allow(OtherCostlyView(4))[0])
+        other_action = CostlyView(4)
+        other_action.action = "export_csv"
+        self.assertTrue(self.allow(other_action)[0])
+        self.assertFalse(self.allow(other_action)[0])
+
+    def test_buckets_live_in_redis(self):
+        self.assertTrue(self.allow(CostlyView(4))[0])
+        # Another server, without the in-process buckets, sees the same bucket
+        TokenBucketThrottle.local_buckets = LocalTokenBuckets()
+        self.assertFalse(self.allow(CostlyView(4))[0])
+
+    def test_internal_requests_are_not_throttled(self):
+        request = Request(APIRequestFactory().get("/tasks/", **{INTERNAL_REQUEST: True}))
+        request.user = self.request.user
+
+        self.assertTrue(all(self.allow(CostlyView(5), request)[0] for _ in range(3)))
+        # Nor do they take tokens from the bucket of the user
+        self.assertTrue(self.allow(CostlyView(5))[0])
+
+    def test_anonymous_rate(self):
+        request = Request(APIRequestFactory().get("/tasks/"))
+        self.assertEqual(
+            [self.allow(CostlyView(1), request)[0] for _ in range(3)],
+            [True, True, False],
+        )
+
+    def test_in_process_fallback(self):
+        with patch.object(
+            TokenBucketThrottle, "take_from_redis", side_effect=RedisConnectionError
+        ) as take_from_redis:
+            self.assertEqual(
+                [self.allow(CostlyView(2))[0] for _ in range(3)], [True, True, False]
+            )
+        # Redis is not retried for every request while it is down
+        self.assertEqual(take_from_redis.call_count, 1)
+        TokenBucketThrottle.redis_retry_at = 0.0
+
+
+class TestTaskThrottleCosts(TestCase):
+    def cost(self, url):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=UserFactory())
+        view = TaskViewSet(action_map={"get": "list"})
+        view.action = "list"
+        request = view.initialize_request(request)
+        view.request = request
+        view.format_kwarg = None
+        request.accepted_renderer, _ = view.perform_content_negotiation(request)
+        return view.get_throttle_cost(request)
+
+    def test_costs(self):
+        self.assertEqual(self.cost("/tasks/"), 1)
+        self.assertEqual(self.cost("/tasks/?size=1000"), 10)
+        self.assertEqual(self.cost("/tasks/?format=csv"), 20)
+
+
+@override_settings(
+    LOAD_SHEDDING_MAX_CONCURRENCY=1,
+    LOAD_SHEDDING_MAX_QUEUE_DEPTH=2,
+    LOAD_SHEDDING_RETRY_AFTER=3,
+)
+class TestLoadSheddingMiddleware(SimpleTestCase):
+    def listen(self, pending):
+        """A listening socket with `pending` connections no worker accepted yet."""
+        listener = socket.create_server(("127.0.0.1", 0), backlog=16)
+        self.addCleanup(listener.close)
+        for _ in range(pending):
+            client = socket.create_connection(listener.getsockname())
+            self.addCleanup(client.close)
+        self.addCleanup(LoadSheddingMiddleware.set_listen_sockets, [])
+        LoadSheddingMiddleware.set_listen_sockets([listener])
+        return listener
+
+    def test_sheds_above_max_concurrency(self):
+        responses = []
+
+        def get_response(request):
+            # A second request arriving while this one is in progress
+            responses.append(middleware(request))
+            return HttpResponse("ok")
+
+        middleware = LoadSheddingMiddleware(get_response)
+        response = middleware(RequestFactory().get("/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(responses[0].status_code, 503)
+        self.assertEqual(responses[0]["Retry-After"], "3")
+        self.assertEqual(middleware.in_flight, 0)
+
+    @unittest.skipUnless(sys.platform == "linux", "TCP_INFO of listening sockets")
+    def test_sheds_above_max_queue_depth(self):
+        middleware = LoadSheddingMiddleware(lambda _request: HttpResponse("ok"))
+
+        listener = self.listen(pending=1)
+        self.assertEqual(get_accept_queue_depth(listener), 1)
+        self.assertEqual(middleware(RequestFactory().get("/")).status_code, 200)
+
+        self.listen(pending=2)
+        response = middleware(RequestFactory().get("/"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(middleware.in_flight, 0)
+
+    def test_gunicorn_workers_register_their_listen_sockets(self):
+        config = runpy.run_path("gunicorn.conf.py")
+        listener = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(listener.close)
+        self.addCleanup(LoadSheddingMiddleware.set_listen_sockets, [])
+
+        config["post_worker_init"](
+            SimpleNamespace(sockets=[SimpleNamespace(sock=listener)])
+        )
+
+        self.assertEqual(LoadSheddingMiddleware.listen_sockets, [listener])
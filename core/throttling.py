@@ -0,0 +1,159 @@
+import functools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.events import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket for the time elapsed since its last update, then take `cost`
+# tokens if there are enough. Runs atomically in Redis, on the clock of Redis so
+# every app server agrees on the time. Returns {allowed, tokens left}.
+RATE_LIMIT_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+# Seconds Redis is bypassed after an error, before it is tried again
+REDIS_RETRY_INTERVAL = 5.0
+
+# request.META key of requests made by the server itself, e.g. to warm caches.
+# Not an HTTP_ header, so clients can't set it
+INTERNAL_REQUEST = "core.internal_request"
+
+
+@functools.cache
+def get_rate_limit_script(url):
+    return get_redis_client(url).register_script(RATE_LIMIT_SCRIPT)
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, used while Redis is unavailable."""
+
+    max_buckets = 10_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, key, capacity, rate, cost):
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._buckets and len(self._buckets) >= self.max_buckets:
+                # Bound memory: forgotten buckets just start full again
+                self._buckets.clear()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Rate limit per user (or client IP when anonymous), view and action.
+
+    Each bucket holds up to the number of requests of the `user` (or `anon`)
+    rate of DEFAULT_THROTTLE_RATES and refills continuously. A request takes
+    the tokens returned by the `get_throttle_cost` method of the view, 1 when
+    it has none, so expensive requests drain the bucket faster.
+
+    Buckets live in the Redis of THROTTLE_REDIS_URL and are updated by a Lua
+    script, so concurrent requests on any number of servers can't overdraw them. While Redis is
+    unavailable, requests are throttled with in-process buckets instead.
+    Internal requests (see INTERNAL_REQUEST) are not throttled.
+    """
+
+    local_buckets = LocalTokenBuckets()
+    redis_retry_at = 0.0
+
+    def __init__(self):
+        # The rate depends on the request, see allow_request
+        pass
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        endpoint = view.__class__.__name__.lower()
+        action = getattr(view, "action", None)
+        if action:
+            endpoint = f"{endpoint}.{action}"
+        return f"throttle:{self.scope}:{endpoint}:{ident}"
+
+    def allow_request(self, request, view):
+        if request.META.get(INTERNAL_REQUEST):
+            return True
+        authenticated = bool(request.user and request.user.is_authenticated)
+        self.scope = "user" if authenticated else "anon"
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.refill_rate = self.num_requests / self.duration
+        get_cost = getattr(view, "get_throttle_cost", None)
+        cost = get_cost(request) if get_cost is not None else 1
+        # A request costing more than the bucket holds could never pass
+        self.cost = min(cost, self.num_requests)
+
+        allowed, self.tokens = self.take(self.get_cache_key(request, view))
+        return allowed
+
+    def take(self, key):
+        if settings.THROTTLE_REDIS_URL and time.monotonic() >= self.redis_retry_at:
+            try:
+                return self.take_from_redis(key)
+            except RedisError:
+                logger.warning(
+                    "Redis is unavailable, throttling with in-process buckets "
+                    "for the next %ss",
+                    REDIS_RETRY_INTERVAL,
+                    exc_info=True,
+                )
+                TokenBucketThrottle.redis_retry_at = (
+                    time.monotonic() + REDIS_RETRY_INTERVAL
+                )
+        return self.local_buckets.take(
+            key, self.num_requests, self.refill_rate, self.cost
+        )
+
+    def take_from_redis(self, key):
+        script = get_rate_limit_script(settings.THROTTLE_REDIS_URL)
+        allowed, tokens = script(
+            keys=[key], args=[self.num_requests, self.refill_rate, self.cost]
+        )
+        return bool(allowed), float(tokens)
+
+    def wait(self):
+        """Seconds until the bucket holds enough tokens for the request."""
+        return max(0.0, (self.cost - self.tokens) / self.refill_rate)
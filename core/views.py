@@ -1,21 +1,126 @@
 import logging
+import math
+from collections.abc import Mapping
+from contextlib import nullcontext
+from functools import cached_property
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_csv.renderers import CSVRenderer
 
-from core.constants import MAX_ROWS_TO_DOWNLOAD
+from core.compression import IDENTITY, compress, select_encoding
+from core.constants import (
+    MAX_BATCH_IDS,
+    MAX_ROWS_TO_DOWNLOAD,
+    MAX_ROWS_TO_EXPORT,
+    THROTTLE_DOWNLOAD_COST,
+    THROTTLE_PAGE_SIZE,
+)
+from core.events import publish_event_on_commit
+from core.history import recording_actor
+from core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    IdempotencyKeyInUse,
+    IdempotencyKeyMismatch,
+    IdempotentReplay,
+    claim_idempotency_key,
+    get_idempotency_cache_key,
+    get_replayed_response,
+    get_request_fingerprint,
+    release_idempotency_key,
+    spool_request_body,
+    store_idempotent_response,
+)
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, get_user_identity_map
+from core.object_cache import (
+    get_cached_objects,
+    invalidate_cached_objects,
+    set_cached_objects,
+)
 from core.pagination import CustomPageNumberPagination
 from core.permissions import IsOwnerOrStaff
+from core.query_budget import query_budget
+from core.renderers import ArrowIPCRenderer, ParquetRenderer
+from core.schema import OpenApiParameter, OpenApiTypes, extend_schema
+from core.serializers import SPARSE_FIELDSET_CONTEXT_KEY, SparseFieldset
 
 logger = logging.getLogger(__name__)
 
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        description="Comma separated fields to return, all fields when omitted.",
+    ),
+    OpenApiParameter(
+        "exclude",
+        OpenApiTypes.STR,
+        description="Comma separated fields to leave out of the response.",
+    ),
+]
+
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Headers a cached response is not replayed with, set per request instead
+UNCACHED_RESPONSE_HEADERS = {
+    "content-length",
+    "set-cookie",
+    "date",
+    # Timestamped download filename, see finalize_response
+    "content-disposition",
+}
+
+
+def get_cacheable_headers(response) -> dict:
+    return {
+        name: value
+        for name, value in response.items()
+        if name.lower() not in UNCACHED_RESPONSE_HEADERS
+    }
+
+
+def parse_field_list(request, param: str) -> frozenset | None:
+    """Read a comma separated (or repeated) list of field names from the query string."""
+    values = request.query_params.getlist(param)
+    if not values:
+        return None
+    return frozenset(
+        name.strip() for value in values for name in value.split(",") if name.strip()
+    )
+
+
+def bump_user_cache_version(viewset_class, user_id):
+    """
+    Move the cached data and responses of a user for `viewset_class` to a new
+    version, for writes made outside of a request, e.g. in jobs or the admin.
+    """
+    if not viewset_class.cache_enabled:
+        return
+    version_key = f"{viewset_class.get_cache_namespace(user_id)}:version"
+    cache.add(version_key, 0, timeout=None)
+    cache.incr(version_key)
+
+
+def parse_id_list(values) -> list:
+    """Ids of comma separated (or repeated) values, without blanks and duplicates."""
+    ids = (id_.strip() for value in values for id_ in str(value).split(","))
+    return list(dict.fromkeys(id_ for id_ in ids if id_))
+
 
 class BaseMixin:
     permission_classes = [IsAuthenticated, IsOwnerOrStaff]
@@ -26,8 +131,18 @@ class BaseModelViewSet(viewsets.ModelViewSet):
     """
     Base ViewSet supporting:
     - Full CRUD
-    - Optional caching for GET requests
+    - Optional caching for GET requests, with rendered bodies stored precompressed
+    - Opt-in response cache served right after authentication
+    - Rate limit costs weighted by action, download format and page size
+    - Query budgets per action (max_queries_per_request)
     - CSV download support
+    - Parquet / Arrow IPC exports for analytics
+    - Sparse fieldsets (?fields= / ?exclude=) pushed down to the SQL projection
+    - Per-object cache for retrieve and batch retrieve by id list, written through on update
+    - Single query PATCH of whitelisted fields (UPDATE ... RETURNING)
+    - Idempotency-Key header on unsafe requests, responses replayed from Redis
+    - Paginated change history of objects whose model has a HISTORY_MODEL
+    - Created / updated / deleted events published to the user's event stream
     - Custom pagination & filtering
     - Default filter when no filters applied
     - Queryset preprocessing hook
@@ -36,25 +151,88 @@ class BaseModelViewSet(viewsets.ModelViewSet):
     cache_enabled = True
     cache_timeout = getattr(settings, "CACHE_TIMEOUT", 300)
     cache_key_prefix = None  # override per-viewset if desired
+    rendered_cache_entry = None  # (key, encoding) to store the rendered response under
+
+    # Serve cached list/retrieve responses before permissions and the handler
+    # run. Requires cache_enabled. Entries are only stored for 200 responses to
+    # the same user and URL, so the permissions already passed.
+    response_cache_enabled = False
+    response_cache_actions = ("list", "retrieve")
+    cached_response = None
+
+    # Cache serialized objects one entry per pk for retrieve and batch. Entries are
+    # only served to the user whose id is in `object_cache_scope`, and writes
+    # must drop them, e.g. with a post_save receiver (see tasks.signals)
+    object_cache_enabled = False
+    object_cache_scope = "owner_id"
+
+    # PATCH requests changing only these fields skip loading the row, see
+    # fast_partial_update. get_queryset must only return rows the user may
+    # change, as object permissions are not checked, and the fields must not
+    # depend on save() or model signals
+    fast_update_fields = frozenset()
+
+    # Unsafe requests sent with an Idempotency-Key header are run once per user
+    # and key, retries get the stored response, see check_idempotency_key
+    idempotency_enabled = True
+    idempotency_claim = None  # (cache key, request fingerprint) held by this request
+    request_body = None  # raw body read for the fingerprint, see get_request_stream
+
+    # Writes are published to the event stream of the user (core.events) as
+    # "<event_type_prefix>.created", ".updated" and ".deleted", None disables it
+    event_type_prefix = None
+
+    # Serializer of the HISTORY_MODEL rows listed by list_history
+    history_serializer_class = None
+
+    # Rate limit tokens taken per action (1 when missing), see get_throttle_cost
+    throttle_costs = {}
+
+    # Queries a request may run, checked according to QUERY_BUDGET_MODE. Either
+    # one number for every action or {action: number}, missing actions are free
+    max_queries_per_request = None
+
+    renderer_classes = [JSONRenderer, CSVRenderer, ParquetRenderer, ArrowIPCRenderer]
 
-    renderer_classes = [JSONRenderer, CSVRenderer]
+    # Output column -> queryset lookup for columnar exports, defaults to model fields
+    columnar_fields = None
+    download_formats = ("csv", "parquet", "arrow")
 
     # ---------------------------------------------------------
     #                     CACHE HELPERS
     # ---------------------------------------------------------
 
+    @classmethod
+    def get_cache_namespace(cls, user_id):
+        prefix = f"{cls.cache_key_prefix}:" if cls.cache_key_prefix else ""
+        return f"{prefix}{cls.__name__.lower()}:{user_id}"
+
+    def get_cache_version(self, user_id):
+        """Generation of the user's entries, bumped by `invalidate_cache`."""
+        versions = self.__dict__.setdefault("_cache_versions", {})
+        if user_id not in versions:
+            versions[user_id] = cache.get(
+                f"{self.get_cache_namespace(user_id)}:version", 0
+            )
+        return versions[user_id]
+
     def get_cache_key(self, request):
         """Builds a stable cache key independent of renderer format."""
         user_id = getattr(request.user, "id", "anonymous")
 
         params = request.query_params.copy()
         params.pop("format", None)  # format should NOT affect cache
+        # the same field set should hit the same entry whatever the order
+        for param in ("fields", "exclude"):
+            field_names = parse_field_list(request, param)
+            if field_names is not None:
+                params[param] = ",".join(sorted(field_names))
 
         query_part = urlencode(sorted(params.items()))
         path = f"{request.path}?{query_part}" if query_part else request.path
 
-        prefix = f"{self.cache_key_prefix}:" if self.cache_key_prefix else ""
-        return f"{prefix}{self.__class__.__name__.lower()}:{user_id}:{path}"
+        namespace = self.get_cache_namespace(user_id)
+        return f"{namespace}:v{self.get_cache_version(user_id)}:{path}"
 
     def get_from_cache(self, request):
         if not self.cache_enabled:
@@ -67,23 +245,220 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         cache.set(self.get_cache_key(request), data, timeout=self.cache_timeout)
 
     def invalidate_cache(self, request):
-        """Invalidate all cached keys for this user & viewset."""
-        if not self.cache_enabled:
-            return
+        """
+        Invalidate all cached data and responses for this user & viewset by
+        moving to a new cache version: keys of older versions are never read
+        again and expire on their own, so no key scan is needed.
+        """
+        self.invalidate_user_cache(getattr(request.user, "id", "anonymous"))
+
+    def invalidate_user_cache(self, user_id):
+        """`invalidate_cache` for writes made outside of a request, e.g. in jobs."""
+        bump_user_cache_version(self.__class__, user_id)
+        self.__dict__.get("_cache_versions", {}).pop(user_id, None)
 
-        user_id = getattr(request.user, "id", "anonymous")
-        prefix = f"{self.__class__.__name__.lower()}:{user_id}:"
+    # ---------------------------------------------------------
+    #              PRECOMPRESSED RESPONSE CACHE
+    # ---------------------------------------------------------
 
-        try:
-            keys = cache.keys(f"*{prefix}*")
-            if keys:
-                cache.delete_many(keys)
-        except NotImplementedError:
-            logger.warning(
-                "Cache backend does not support pattern key deletion. "
-                "Consider switching to Redis for full cache invalidation support."
+    def initial(self, request, *args, **kwargs):
+        """
+        With `response_cache_enabled`, look the response up as soon as the
+        user is authenticated. A hit is still throttled, but skips permissions,
+        filtering, pagination and rendering; the handler just returns
+        `cached_response`.
+        """
+        if (
+            self.cache_enabled
+            and self.response_cache_enabled
+            and self.action in self.response_cache_actions
+        ):
+            self.format_kwarg = self.get_format_suffix(**kwargs)
+            negotiated = self.perform_content_negotiation(request)
+            request.accepted_renderer, request.accepted_media_type = negotiated
+            self.perform_authentication(request)
+            self.cached_response = self.get_rendered_from_cache(request)
+            if self.cached_response is not None:
+                self.check_throttles(request)
+                return
+        super().initial(request, *args, **kwargs)
+        self.check_idempotency_key(request)
+
+    def get_rendered_cache_key(self, request, encoding):
+        """Rendered bodies differ per renderer format and content encoding."""
+        return (
+            f"{self.get_cache_key(request)}:{request.accepted_renderer.format}:{encoding}"
+        )
+
+    def get_rendered_from_cache(self, request):
+        """
+        Serve the body stored by a previous identical request as is: a hit is a
+        straight byte copy, without serializing, rendering or compressing again.
+        On a miss, the rendered response is stored by `finalize_response`.
+        """
+        if self.cached_response is not None:
+            return self.cached_response
+        if (
+            not self.cache_enabled
+            or request.method != "GET"
+            or request.accepted_renderer.format in COLUMNAR_FORMATS
+        ):
+            return None
+
+        encoding = select_encoding(request.META.get("HTTP_ACCEPT_ENCODING")) or IDENTITY
+        cache_key = self.get_rendered_cache_key(request, encoding)
+        cached = cache.get(cache_key)
+        if cached is None:
+            self.rendered_cache_entry = (cache_key, encoding)
+            return None
+
+        headers, body = cached
+        return HttpResponse(body, headers=headers)
+
+    def set_rendered_to_cache(self, response):
+        """Render and compress the response once, and store its headers and bytes."""
+        cache_key, encoding = self.rendered_cache_entry
+        response.render()
+        body = response.content
+        if encoding != IDENTITY and len(body) >= settings.COMPRESSION_MIN_SIZE:
+            body = compress(body, encoding)
+            response.content = body
+            response["Content-Encoding"] = encoding
+        else:
+            encoding = IDENTITY
+        patch_vary_headers(response, ("Accept-Encoding",))
+        cache.set(
+            cache_key, (get_cacheable_headers(response), body), timeout=self.cache_timeout
+        )
+
+    # ---------------------------------------------------------
+    #                   IDEMPOTENCY KEYS
+    # ---------------------------------------------------------
+
+    def check_idempotency_key(self, request):
+        """
+        Claim the Idempotency-Key of an unsafe request once it passed
+        authentication, permissions and throttling. When another request holds
+        the key, its stored response is replayed without touching the database,
+        while one still in progress gets a 409 to retry after
+        IDEMPOTENCY_RETRY_AFTER seconds. A key reused for a different request
+        gets a 422.
+        """
+        key = request.META.get(IDEMPOTENCY_KEY_HEADER)
+        if (
+            key is None
+            or not self.idempotency_enabled
+            or request.method in SAFE_METHODS
+            or not request.user.is_authenticated
+        ):
+            return
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise ValidationError(
+                {
+                    "Idempotency-Key": [
+                        f"Must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters long."
+                    ]
+                }
             )
 
+        cache_key = get_idempotency_cache_key(request.user.pk, key)
+        if request.negotiator.select_parser(request, request.parsers) is None:
+            self.request_body = spool_request_body(request)
+        fingerprint = get_request_fingerprint(request, self.request_body)
+        entry = claim_idempotency_key(cache_key, fingerprint)
+        if entry is None:
+            self.idempotency_claim = (cache_key, fingerprint)
+        elif entry["fingerprint"] != fingerprint:
+            raise IdempotencyKeyMismatch
+        elif entry["status"] is None:
+            raise IdempotencyKeyInUse
+        else:
+            raise IdempotentReplay(get_replayed_response(entry))
+
+    def get_request_stream(self, request):
+        """
+        Raw body of a request no parser reads, for the handler to stream: the
+        copy read by check_idempotency_key when it fingerprinted it.
+        """
+        return self.request_body if self.request_body is not None else request.stream
+
+    def store_idempotent_response(self, response):
+        """
+        Replace the claim with the response. Server errors release the key
+        instead, so that the request can be retried.
+        """
+        cache_key, fingerprint = self.idempotency_claim
+        self.idempotency_claim = None
+        if response.status_code >= 500 or response.streaming:
+            release_idempotency_key(cache_key)
+            return
+        if isinstance(response, Response):
+            response.render()
+        store_idempotent_response(
+            cache_key,
+            fingerprint,
+            response.status_code,
+            get_cacheable_headers(response),
+            response.content,
+        )
+
+    def handle_exception(self, exc):
+        if isinstance(exc, IdempotentReplay):
+            self.cached_response = exc.response
+            return exc.response
+        if isinstance(exc, IdempotencyKeyInUse):
+            response = super().handle_exception(exc)
+            response["Retry-After"] = str(settings.IDEMPOTENCY_RETRY_AFTER)
+            return response
+        return super().handle_exception(exc)
+
+    def raise_uncaught_exception(self, exc):
+        if self.idempotency_claim is not None:
+            release_idempotency_key(self.idempotency_claim[0])
+            self.idempotency_claim = None
+        super().raise_uncaught_exception(exc)
+
+    # ---------------------------------------------------------
+    #                    QUERY BUDGET
+    # ---------------------------------------------------------
+
+    def get_max_queries(self, action):
+        budget = self.max_queries_per_request
+        return budget.get(action) if isinstance(budget, Mapping) else budget
+
+    def dispatch(self, request, *args, **kwargs):
+        action = getattr(self, "action_map", {}).get(request.method.lower())
+        max_queries = self.get_max_queries(action)
+        budget = (
+            nullcontext()
+            if max_queries is None
+            else query_budget(max_queries, name=f"{self.__class__.__name__}.{action}")
+        )
+        # Changes recorded in the history are attributed to the request user
+        with budget, recording_actor(self.get_history_actor):
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_history_actor(self):
+        return getattr(self.request, "user", None)
+
+    # ---------------------------------------------------------
+    #                    RATE LIMITING
+    # ---------------------------------------------------------
+
+    def get_throttle_cost(self, request):
+        """
+        Tokens the request takes from the rate limit bucket of the user:
+        downloads cost at least THROTTLE_DOWNLOAD_COST, and list pages one
+        token per started THROTTLE_PAGE_SIZE rows.
+        """
+        cost = self.throttle_costs.get(self.action, 1)
+        if request.accepted_renderer.format in self.download_formats:
+            return max(cost, THROTTLE_DOWNLOAD_COST)
+        if self.action == "list" and self.paginator is not None:
+            page_size = self.paginator.get_page_size(request) or 0
+            cost = max(cost, math.ceil(page_size / THROTTLE_PAGE_SIZE))
+        return cost
+
     # ---------------------------------------------------------
     #                 SERIALIZER HANDLING
     # ---------------------------------------------------------
@@ -98,6 +473,13 @@ class BaseModelViewSet(viewsets.ModelViewSet):
 
         return self.serializer_class
 
+    def get_serializer_context(self):
+        """Share the request identity map so owners resolve once per request."""
+        context = super().get_serializer_context()
+        context[IDENTITY_MAP_CONTEXT_KEY] = get_user_identity_map(self.request)
+        context[SPARSE_FIELDSET_CONTEXT_KEY] = self.sparse_fieldset
+        return context
+
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
         kwargs.setdefault("context", self.get_serializer_context())
@@ -112,6 +494,54 @@ class BaseModelViewSet(viewsets.ModelViewSet):
             obj, many=many, context=self.get_serializer_context()
         ).data
 
+    # ---------------------------------------------------------
+    #                  SPARSE FIELDSETS
+    # ---------------------------------------------------------
+
+    @cached_property
+    def sparse_fieldset(self) -> SparseFieldset | None:
+        """
+        Fields requested by `?fields=` / `?exclude=` on read requests
+        :raises: ValidationError if an unknown field is requested
+        """
+        if self.request is None or self.request.method not in ("GET", "HEAD"):
+            return None
+
+        fields = parse_field_list(self.request, "fields")
+        exclude = parse_field_list(self.request, "exclude") or frozenset()
+        if fields is None and not exclude:
+            return None
+
+        available = set(self.serializer_class().fields)
+        if hasattr(self, "csv_serializer_class"):
+            available |= set(self.csv_serializer_class().fields)
+        unknown = ((fields or frozenset()) | exclude) - available
+        if unknown:
+            raise ValidationError(
+                {"fields": [f"Unknown field(s): {', '.join(sorted(unknown))}"]}
+            )
+        return SparseFieldset(fields, exclude)
+
+    def apply_sparse_fieldset(self, queryset):
+        """Only select the columns behind the requested serializer fields."""
+        sparse_fieldset = self.sparse_fieldset
+        if sparse_fieldset is None:
+            return queryset
+
+        columns = set()
+        for name, field in self.serializer_class().fields.items():
+            if not sparse_fieldset.keeps(name):
+                continue
+            try:
+                model_field = queryset.model._meta.get_field(field.source.split(".")[0])
+            except FieldDoesNotExist:
+                # computed fields may read any column
+                return queryset
+            if not model_field.concrete:
+                return queryset
+            columns.add(model_field.name)
+        return queryset.only(*columns)
+
     # ---------------------------------------------------------
     #           FILTERING + QUERYSET PREPROCESSING
     # ---------------------------------------------------------
@@ -138,44 +568,82 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         if default_filter and not any(param in filter_fields for param in filter_params):
             queryset = queryset.filter(**default_filter)
 
-        return self.preprocess_queryset(queryset)
+        return self.apply_sparse_fieldset(self.preprocess_queryset(queryset))
 
     # ---------------------------------------------------------
     #                        LIST
     # ---------------------------------------------------------
 
+    def get_columnar_fields(self):
+        columns = self.columnar_fields
+        if columns is not None and self.sparse_fieldset is not None:
+            columns = {
+                name: lookup
+                for name, lookup in columns.items()
+                if self.sparse_fieldset.keeps(name)
+            }
+        return columns
+
+    @extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS)
     def list(self, request, *args, **kwargs):
-        # ----- CACHE CHECK -----
-        cached = self.get_from_cache(request)
-        if cached is not None:
-            data = cached
-        else:
+        # ----- COLUMNAR MODE -----
+        # Read straight from the database cursor, the cache holds serialized rows
+        if request.accepted_renderer.format in COLUMNAR_FORMATS:
+            # pyarrow is imported on the first columnar export, not at startup
+            from core.columnar import ColumnarExport  # noqa: PLC0415
+
             queryset = self.filter_queryset(self.get_queryset())
-            data = self.serialize_data(queryset, many=True)
-            self.set_to_cache(request, data)
+            return Response(
+                ColumnarExport(
+                    queryset,
+                    columns=self.get_columnar_fields(),
+                    max_rows=MAX_ROWS_TO_EXPORT,
+                )
+            )
+
+        rendered = self.get_rendered_from_cache(request)
+        if rendered is not None:
+            return rendered
 
         # ----- CSV MODE -----
         if request.accepted_renderer.format == "csv":
-            rows = data[:MAX_ROWS_TO_DOWNLOAD]
+            queryset = self.filter_queryset(self.get_queryset())
             csv_data = self.serialize_data(
-                rows,
+                queryset[:MAX_ROWS_TO_DOWNLOAD],
                 many=True,
                 serializer_class=self.get_serializer_class(),
             )
             return Response(csv_data)
 
+        # ----- CACHE CHECK -----
+        cached = self.get_from_cache(request)
+        if cached is not None:
+            return Response(cached)
+
         # ----- JSON MODE WITH PAGINATION -----
-        page = self.paginate_queryset(data)
+        # Only the requested page is read, serialized and cached
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
         if page is not None:
-            return self.get_paginated_response(page)
-
+            data = self.get_paginated_response(self.serialize_data(page, many=True)).data
+        else:
+            data = self.serialize_data(queryset, many=True)
+        self.set_to_cache(request, data)
         return Response(data)
 
     # ---------------------------------------------------------
     #                     RETRIEVE
     # ---------------------------------------------------------
 
+    @extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS)
     def retrieve(self, request, *args, **kwargs):
+        rendered = self.get_rendered_from_cache(request)
+        if rendered is not None:
+            return rendered
+
+        if self.object_cache_enabled and self.lookup_field == "pk":
+            return Response(self.filter_sparse_fields(self.get_object_data()))
+
         cached = self.get_from_cache(request)
         if cached is not None:
             return Response(cached)
@@ -185,39 +653,285 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         self.set_to_cache(request, data)
         return Response(data)
 
+    # ---------------------------------------------------------
+    #                  PER-OBJECT CACHE
+    # ---------------------------------------------------------
+
+    def get_cached_object_data(self, pks) -> dict:
+        """Cached serialized objects of `pks` visible to the user, keyed by pk."""
+        if not self.object_cache_enabled:
+            return {}
+        model = self.get_queryset().model
+        user_id = self.request.user.pk
+        return {
+            pk: data
+            for pk, (scope, data) in get_cached_objects(model, pks).items()
+            if scope == user_id
+        }
+
+    def serialize_objects(self, instances) -> dict:
+        """Full representation of each instance keyed by pk, written to the object cache."""
+        # Cache full objects, sparse fieldsets are applied per request
+        context = {**self.get_serializer_context(), SPARSE_FIELDSET_CONTEXT_KEY: None}
+        rows = self.serializer_class(instances, many=True, context=context).data
+        data = {
+            instance.pk: dict(row) for instance, row in zip(instances, rows, strict=True)
+        }
+        if self.object_cache_enabled and instances:
+            set_cached_objects(
+                instances[0]._meta.model,
+                {
+                    instance.pk: (
+                        getattr(instance, self.object_cache_scope),
+                        data[instance.pk],
+                    )
+                    for instance in instances
+                },
+                timeout=self.cache_timeout,
+            )
+        return data
+
+    def get_lookup_pk(self, queryset):
+        """
+        Primary key of the detail route
+        :raises: Http404 if the lookup is not a valid primary key
+        """
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            return queryset.model._meta.pk.to_python(lookup)
+        except DjangoValidationError as e:
+            raise Http404 from e
+
+    def get_object_data(self):
+        """
+        Serialized object of the detail route, from its per-object cache entry.
+        The object is only fetched, and its permissions checked, on a miss.
+        """
+        queryset = self.get_queryset()
+        pk = self.get_lookup_pk(queryset)
+
+        cached = self.get_cached_object_data([pk])
+        if pk in cached:
+            return cached[pk]
+
+        # Unlike get_object, the full row is loaded whatever the sparse fieldset
+        instance = get_object_or_404(self.preprocess_queryset(queryset), pk=pk)
+        self.check_object_permissions(self.request, instance)
+        return self.serialize_objects([instance])[pk]
+
+    def filter_sparse_fields(self, data):
+        """Apply the sparse fieldset to an already serialized object."""
+        if self.sparse_fieldset is None:
+            return data
+        return {
+            name: value
+            for name, value in data.items()
+            if self.sparse_fieldset.keeps(name)
+        }
+
+    # ---------------------------------------------------------
+    #                   BATCH RETRIEVE
+    # ---------------------------------------------------------
+
+    def get_batch_ids(self, request):
+        """
+        Primary keys requested with `?ids=` or a `{"ids": [...]}` body, in order
+        :raises: ValidationError if no id, too many or malformed ids are given
+        """
+        if request.method == "POST":
+            values = (
+                request.data.get("ids", []) if isinstance(request.data, Mapping) else []
+            )
+            if isinstance(values, (str, int)):
+                values = [values]
+        else:
+            values = request.query_params.getlist("ids")
+
+        ids = parse_id_list(values)
+        if not ids:
+            raise ValidationError({"ids": ["At least one id is required."]})
+        if len(ids) > MAX_BATCH_IDS:
+            raise ValidationError({"ids": [f"At most {MAX_BATCH_IDS} ids are allowed."]})
+
+        pk_field = self.get_queryset().model._meta.pk
+        try:
+            return list(dict.fromkeys(pk_field.to_python(id_) for id_ in ids))
+        except DjangoValidationError as e:
+            raise ValidationError({"ids": e.messages}) from e
+
+    def get_objects_by_ids(self, pks) -> dict:
+        """
+        Serialized objects of `pks` visible to the user, keyed by pk.
+
+        Hits are read from the per-object cache with one `get_many`, misses
+        are fetched with a single `pk IN (...)` query on the scoped queryset
+        and cached with one `set_many`.
+        """
+        found = self.get_cached_object_data(pks)
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            queryset = self.preprocess_queryset(
+                self.get_queryset().filter(pk__in=missing)
+            )
+            found.update(self.serialize_objects(list(queryset)))
+        return found
+
+    def batch_retrieve(self, request):
+        """Objects of the requested ids in request order, and the ids not found."""
+        pks = self.get_batch_ids(request)
+        objects = self.get_objects_by_ids(pks)
+        return Response(
+            {
+                "items": [
+                    self.filter_sparse_fields(objects[pk]) for pk in pks if pk in objects
+                ],
+                "missing": [pk for pk in pks if pk not in objects],
+            }
+        )
+
+    # ---------------------------------------------------------
+    #                   CHANGE HISTORY
+    # ---------------------------------------------------------
+
+    def list_history(self, request):
+        """
+        Page of the history of the detail route object, newest first. The object
+        is only checked to be in the queryset of the user, it is not loaded.
+        """
+        queryset = self.get_queryset()
+        pk = self.get_lookup_pk(queryset)
+        if not queryset.filter(pk=pk).exists():
+            raise Http404
+        history = (
+            queryset.model.get_history_model()
+            .objects.filter(object_id=pk)
+            .order_by("-changed_at")
+        )
+        page = self.paginate_queryset(history)
+        serializer = self.history_serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return self.get_paginated_response(serializer.data)
+
+    # ---------------------------------------------------------
+    #                 FAST PARTIAL UPDATE
+    # ---------------------------------------------------------
+
+    def is_fast_update(self, request) -> bool:
+        """PATCH of the detail route changing only `fast_update_fields`."""
+        data = request.data
+        return (
+            bool(self.fast_update_fields)
+            and self.lookup_field == "pk"
+            and isinstance(data, Mapping)
+            and bool(data)
+            and set(data) <= self.fast_update_fields
+        )
+
+    def partial_update(self, request, *args, **kwargs):
+        if self.is_fast_update(request):
+            return self.fast_partial_update(request)
+        return super().partial_update(request, *args, **kwargs)
+
+    def fast_partial_update(self, request):
+        """
+        Validate the supplied fields only, then apply them with one UPDATE ...
+        RETURNING on the queryset of the user: the row is never loaded first
+        and the updated object is written through to the object cache.
+        """
+        queryset = self.get_queryset()
+        pk = self.get_lookup_pk(queryset)
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic(savepoint=False):
+            updated = queryset.filter(pk=pk).update_returning(**serializer.validated_data)
+            if updated:
+                data = self.serialize_objects(updated)[pk]
+                self.publish_change_event("updated", updated[0], data)
+        # Raised out of the block, which can't roll back to a savepoint
+        if not updated:
+            raise Http404
+        self.invalidate_cache(request)
+        return Response(data)
+
     # ---------------------------------------------------------
     #             CREATE / UPDATE / DELETE
     # ---------------------------------------------------------
 
+    # The write and publish_change_event share a transaction, without savepoint
+    # queries when the request already runs in one
+
     def perform_create(self, serializer):
-        instance = serializer.save()
+        with transaction.atomic(savepoint=False):
+            instance = serializer.save()
+            self.publish_change_event("created", instance)
         self.invalidate_cache(self.request)
         return instance
 
     def perform_update(self, serializer):
-        instance = serializer.save()
+        with transaction.atomic(savepoint=False):
+            instance = serializer.save()
+            # Write-through: the updated object is served from cache right away,
+            # while only the list level entries of the user are invalidated
+            data = None
+            if self.object_cache_enabled:
+                data = self.serialize_objects([instance])[instance.pk]
+            self.publish_change_event("updated", instance, data)
         self.invalidate_cache(self.request)
         return instance
 
     def perform_destroy(self, instance):
-        instance.delete()
+        with transaction.atomic(savepoint=False):
+            instance.delete()
+            self.publish_change_event("deleted", instance, {"id": instance.pk})
+        if self.object_cache_enabled:
+            invalidate_cached_objects(instance._meta.model, [instance.pk])
         self.invalidate_cache(self.request)
 
+    def publish_change_event(self, change, instance, data=None):
+        """
+        Publish the change to the event stream of the user once the transaction
+        commits, with the full representation of the object unless given.
+        Override to also report it elsewhere in the transaction of the write,
+        e.g. in the webhook outbox. Returns the published data.
+        """
+        if self.event_type_prefix is None:
+            return None
+        if data is None:
+            data = self.serialize_objects([instance])[instance.pk]
+        publish_event_on_commit(
+            self.request.user.pk, f"{self.event_type_prefix}.{change}", data
+        )
+        return data
+
     # ---------------------------------------------------------
-    #                     CSV FILENAME
+    #                   DOWNLOAD FILENAME
     # ---------------------------------------------------------
 
-    def get_filename(self):
+    def get_filename(self, extension="csv"):
         prefix = getattr(self, "file_name_prefix", self.__class__.__name__.lower())
         timestamp = timezone.now().strftime("%Y-%m-%d_%H_%M_%S")
-        return f"{prefix}_{timestamp}.csv"
+        return f"{prefix}_{timestamp}.{extension}"
 
     def finalize_response(self, request, response, *args, **kwargs):
         response = super().finalize_response(request, response, *args, **kwargs)
-
-        if request.accepted_renderer.format == "csv":
+        download_format = request.accepted_renderer.format
+        if download_format in self.download_formats:
             response["Content-Disposition"] = (
-                f"attachment; filename='{self.get_filename()}'"
+                f"attachment; filename='{self.get_filename(download_format)}'"
             )
+        if response is self.cached_response:
+            return response
+
+        if self.idempotency_claim is not None:
+            self.store_idempotent_response(response)
+
+        if (
+            self.rendered_cache_entry is not None
+            and isinstance(response, Response)
+            and response.status_code == 200
+        ):
+            self.set_rendered_to_cache(response)
 
         return response
@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration, read from the working directory when gunicorn starts.
+
+With preload_app (the default) the application, the URLconf and the views are
+imported once in the master process (see core.startup.preload) and the forked
+workers share them, so booting a new worker skips all imports.
+"""
+
+import multiprocessing
+
+import decouple
+
+# Every module level name is read as a gunicorn setting, and `config` is one of
+# them, hence `decouple.config` instead of importing the function
+
+bind = decouple.config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = decouple.config(
+    "GUNICORN_WORKERS", default=multiprocessing.cpu_count() * 2 + 1, cast=int
+)
+threads = decouple.config("GUNICORN_THREADS", default=1, cast=int)
+# uvicorn_worker.UvicornWorker to serve core.asgi:application (server-sent events)
+worker_class = decouple.config("GUNICORN_WORKER_CLASS", default="sync")
+preload_app = decouple.config("GUNICORN_PRELOAD_APP", default=True, cast=bool)
+# A sync worker is killed once its request runs longer, Idempotency-Key claims
+# are held as long (see core.idempotency)
+timeout = decouple.config("REQUEST_TIMEOUT", default=120, cast=int)
+
+
+def when_ready(server):
+    # Runs in the master once the application is loaded, before workers are forked
+    if server.cfg.preload_app:
+        from core.startup import preload  # noqa: PLC0415
+
+        preload()
+
+
+def post_worker_init(worker):
+    # Load shedding reads how many connections wait on the sockets of the host
+    from core.middleware import LoadSheddingMiddleware  # noqa: PLC0415
+
+    LoadSheddingMiddleware.set_listen_sockets(
+        listener.sock for listener in worker.sockets
+    )
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models.job import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "owner", "status", "progress", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    ordering = ("-created_at",)
+    readonly_fields = ("id", "created_at", "updated_at", "started_at", "finished_at")
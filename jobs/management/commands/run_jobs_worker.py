@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_worker_pool
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (CSV exports, bulk imports, ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.JOBS_WORKER_PROCESSES,
+            help="Number of worker processes to run in parallel.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Exit each worker after processing this many jobs.",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            help="Only process jobs of this kind. Can be repeated.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Starting {options['processes']} job worker(s), "
+            f"polling every {options['poll_interval']}s"
+        )
+        processed = run_worker_pool(
+            processes=options["processes"],
+            poll_interval=options["poll_interval"],
+            burst=options["burst"],
+            max_jobs=options["max_jobs"],
+            kinds=options["kinds"],
+        )
+        if processed is not None:
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)"))
@@ -0,0 +1 @@
+from jobs.models.job import *
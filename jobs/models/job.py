@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+from core.models import BaseModel
+
+
+class Job(BaseModel):
+    """A unit of background work picked up by the `run_jobs_worker` command."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    params = models.JSONField(default=dict, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # percentage 0-100
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    input_file = models.FileField(upload_to="jobs/input/", blank=True)
+    result_file = models.FileField(upload_to="jobs/results/", blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "job"
+        verbose_name_plural = "jobs"
+        db_table = "job"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"], name="job_status_created_at_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {self.STATUS_SUCCEEDED, self.STATUS_FAILED}
+
+    def set_progress(self, done: int, total: int):
+        """Persist the progress percentage, skipping the write when it did not move."""
+        progress = 100 if not total else min(100, int(done * 100 / total))
+        if progress != self.progress:
+            self.progress = progress
+            self.save()
+
+    def mark_running(self):
+        self.status = self.STATUS_RUNNING
+        self.started_at = timezone.now()
+        self.save()
+
+    def mark_succeeded(self, result=None):
+        self.status = self.STATUS_SUCCEEDED
+        self.progress = 100
+        self.result = result or {}
+        self.finished_at = timezone.now()
+        self.save()
+
+    def mark_failed(self, error: str):
+        self.status = self.STATUS_FAILED
+        self.error = error
+        self.finished_at = timezone.now()
+        self.save()
@@ -0,0 +1,32 @@
+from django.db import transaction
+
+from jobs.models import Job
+from jobs.registry import get_job_handler
+
+
+def enqueue_job(kind: str, owner, params=None, input_file=None) -> Job:
+    """Create a queued job. Fails early if nobody can handle the job kind."""
+    get_job_handler(kind)
+    job = Job(owner=owner, kind=kind, params=params or {})
+    if input_file is not None:
+        job.input_file.save(input_file.name, input_file, save=False)
+    job.save()
+    return job
+
+
+def claim_next_job(kinds=None) -> Job | None:
+    """
+    Atomically move the oldest queued job to running.
+
+    Rows locked by other workers are skipped, so any number of worker
+    processes can poll the same table without handing out a job twice.
+    """
+    with transaction.atomic():
+        queryset = Job.objects.active().filter(status=Job.STATUS_QUEUED)
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        job = queryset.select_for_update(skip_locked=True).order_by("created_at").first()
+        if job is None:
+            return None
+        job.mark_running()
+    return job
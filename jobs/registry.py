@@ -0,0 +1,33 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def register_job(kind: str):
+    """
+    A decorator that registers a function as the handler of a job kind.
+
+    The handler is called with the `Job` instance and returns a JSON
+    serializable result stored on the job.
+    """
+
+    def decorator(func):
+        if kind in _handlers and _handlers[kind] is not func:
+            logger.warning(f"Job handler for {kind} is being overridden")
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def get_job_handler(kind: str):
+    """
+    Get the handler registered for a job kind
+    :raises: LookupError if no handler is registered for the kind
+    """
+    try:
+        return _handlers[kind]
+    except KeyError as e:
+        raise LookupError(f"No job handler registered for {kind}") from e
@@ -0,0 +1 @@
+from jobs.serializers.job_serializer import *
@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Readonly serializer used to poll the state of a background job."""
+
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "progress",
+            "result",
+            "error",
+            "download_url",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj) -> str | None:
+        if not obj.result_file:
+            return None
+        return reverse(
+            "job-download", kwargs={"pk": obj.pk}, request=self.context.get("request")
+        )
@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from core.factories import UserFactory
+from jobs.models import Job
+from jobs.queue import claim_next_job, enqueue_job
+from jobs.registry import register_job
+from jobs.worker import run_next_job, run_worker
+
+
+@register_job("tests.echo")
+def echo_job(job):
+    return {"echo": job.params.get("value")}
+
+
+@register_job("tests.fail")
+def fail_job(_job):
+    raise ValueError("boom")
+
+
+class TestJobWorker(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def test_enqueue_unknown_kind(self):
+        with self.assertRaises(LookupError):
+            enqueue_job("tests.unknown", owner=self.user)
+
+    def test_claim_oldest_job_first(self):
+        first = enqueue_job("tests.echo", owner=self.user)
+        enqueue_job("tests.echo", owner=self.user)
+
+        job = claim_next_job()
+        self.assertEqual(job.id, first.id)
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertIsNotNone(job.started_at)
+
+    def test_claim_filters_kinds(self):
+        enqueue_job("tests.echo", owner=self.user)
+        self.assertIsNone(claim_next_job(kinds=["tests.fail"]))
+
+    def test_run_job_success(self):
+        enqueue_job("tests.echo", owner=self.user, params={"value": 42})
+
+        job = run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.result, {"echo": 42})
+        self.assertIsNone(run_next_job())
+
+    def test_run_job_failure(self):
+        enqueue_job("tests.fail", owner=self.user)
+
+        job = run_next_job()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.error, "boom")
+
+    def test_run_worker_burst(self):
+        enqueue_job("tests.echo", owner=self.user)
+        enqueue_job("tests.fail", owner=self.user)
+
+        self.assertEqual(run_worker(burst=True), 2)
+        self.assertFalse(Job.objects.filter(status=Job.STATUS_QUEUED).exists())
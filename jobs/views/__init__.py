@@ -0,0 +1 @@
+from jobs.views.job_views import *
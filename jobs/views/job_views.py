@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from django.http import FileResponse, Http404
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+
+from core.views import BaseMixin, BaseModelViewSet
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+
+class JobViewSet(BaseMixin, BaseModelViewSet):
+    """
+    Readonly ViewSet to poll background jobs and download their result files.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    renderer_classes = [JSONRenderer]
+    serializer_class = JobSerializer
+    cache_enabled = False  # progress changes while the job runs
+
+    def get_queryset(self):
+        return Job.objects.active().filter(owner=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Stream the result file of a finished job."""
+        job = self.get_object()
+        if not job.result_file:
+            raise Http404("This job has no result file.")
+        return FileResponse(
+            job.result_file.open("rb"),
+            as_attachment=True,
+            filename=Path(job.result_file.name).name,
+        )
@@ -0,0 +1,90 @@
+import logging
+import multiprocessing
+import signal
+import time
+
+from django.db import close_old_connections, connections
+
+from jobs.queue import claim_next_job
+from jobs.registry import get_job_handler
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(job):
+    """Run the handler of a claimed job and record its outcome."""
+    try:
+        handler = get_job_handler(job.kind)
+        result = handler(job)
+    except Exception as e:
+        logger.exception(f"Job {job.id} ({job.kind}) failed")
+        job.mark_failed(str(e))
+    else:
+        job.mark_succeeded(result)
+    return job
+
+
+def run_next_job(kinds=None):
+    """Claim and run a single job. Returns the job or None when the queue is empty."""
+    job = claim_next_job(kinds)
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def run_worker(poll_interval=1.0, burst=False, max_jobs=None, kinds=None):
+    """
+    Process jobs until stopped.
+
+    Args:
+        poll_interval: Seconds to sleep when the queue is empty.
+        burst: Exit as soon as the queue is empty instead of polling.
+        max_jobs: Exit after processing this many jobs (useful to recycle workers).
+        kinds: Only process jobs of these kinds.
+
+    """
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        job = run_next_job(kinds)
+        if job is not None:
+            processed += 1
+            continue
+        if burst:
+            break
+        # Drop broken or expired connections while idle, like a request cycle would
+        close_old_connections()
+        time.sleep(poll_interval)
+    return processed
+
+
+def _worker_process(target, options):
+    # Leave shutdown to the parent, which terminates children on SIGINT
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    target(**options)
+
+
+def run_worker_pool(processes=1, target=run_worker, **options):
+    """
+    Run `processes` workers in parallel, or in the current process when 1.
+    `target` is the loop of a worker, called with the options.
+    """
+    if processes <= 1:
+        return target(**options)
+
+    # Children must open their own database connections
+    connections.close_all()
+    workers = [
+        multiprocessing.Process(
+            target=_worker_process, args=(target, options), daemon=True
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+    return None
@@ -0,0 +1,47 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+
+from tasks.models import Task
+
+# Owner of the large dataset used by performance tests. Inactive, so that it
+# stays out of the most active users picked for cache warming
+LARGE_DATASET_USERNAME = "large-dataset"
+LARGE_DATASET_ROWS = 20_000
+
+
+def seed_benchmark_tasks(rows: int, batch_size: int = 5_000, owner=None) -> User:
+    """Bulk create `rows` varied tasks for `owner` (a new user by default)."""
+    if owner is None:
+        owner = User.objects.create(username=f"bench-{time.time_ns()}")
+    statuses = [choice[0] for choice in Task.STATUS_CHOICES]
+    Task.objects.bulk_create(
+        (
+            Task(
+                owner=owner,
+                title=f"Benchmark task {i}",
+                description="Lorem ipsum dolor sit amet, consectetur adipiscing elit "
+                * (i % 4),
+                priority=i % 5 + 1,
+                status=statuses[i % len(statuses)],
+                due_date=date.today() + timedelta(days=i % 60),
+            )
+            for i in range(rows)
+        ),
+        batch_size=batch_size,
+    )
+    return owner
+
+
+def get_large_dataset_owner(rows: int = LARGE_DATASET_ROWS) -> User:
+    """
+    Owner of the large dataset. Databases cloned from the build_test_db_template
+    template already hold it, otherwise its tasks are seeded on first use.
+    """
+    owner, created = User.objects.get_or_create(
+        username=LARGE_DATASET_USERNAME, defaults={"is_active": False}
+    )
+    if created:
+        seed_benchmark_tasks(rows, owner=owner)
+    return owner
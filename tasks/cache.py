@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Count
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.throttling import INTERNAL_REQUEST
+from core.views import bump_user_cache_version
+from tasks.views import TaskViewSet
+
+# Route name -> TaskViewSet action of the lists every dashboard loads first
+HOT_TASK_LISTS = {
+    "task-list": "list",
+    "task-recent": "recent",
+    "task-agenda": "agenda",
+}
+
+
+def get_most_active_users(limit, days=7):
+    """Active users with the most tasks changed in the last `days`, most active first."""
+    since = timezone.now() - timedelta(days=days)
+    return list(
+        User.objects.filter(is_active=True, tasks__updated_at__gte=since)
+        .annotate(activity=Count("tasks"))
+        .order_by("-activity", "pk")[:limit]
+    )
+
+
+def warm_user_task_cache(user) -> int:
+    """
+    Request the hot task lists of a user through TaskViewSet, so the serialized
+    data and the compressed response are cached exactly as a client request
+    would leave them. Returns the number of lists warmed.
+    """
+    headers = {
+        "HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}",
+        # Responses are stored per encoding, warm the one preferred by the server
+        "HTTP_ACCEPT_ENCODING": ",".join(settings.COMPRESSION_ENCODINGS[:1]),
+        # Warming after every write would drain the rate limit of the user
+        INTERNAL_REQUEST: True,
+    }
+    warmed = 0
+    for route, action in HOT_TASK_LISTS.items():
+        request = RequestFactory().get(reverse(route), **headers)
+        response = TaskViewSet.as_view({"get": action})(request)
+        warmed += response.status_code == 200
+    return warmed
+
+
+def warm_task_cache(users, workers=1) -> int:
+    """Warm the hot lists of every user, up to `workers` users at a time."""
+    if workers <= 1:
+        return sum(warm_user_task_cache(user) for user in users)
+
+    def warm(user):
+        try:
+            return warm_user_task_cache(user)
+        finally:
+            # Every thread opens its own database connection
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(warm, users))
+
+
+def invalidate_user_task_cache(user):
+    """Drop (or recompute) the cached task lists of a user after writes outside the API."""
+    bump_user_cache_version(TaskViewSet, user.pk)
+    if settings.TASK_CACHE_REFRESH_ON_WRITE:
+        warm_user_task_cache(user)
@@ -2,10 +2,11 @@ import factory
 import factory.fuzzy
 from faker import Faker
 
+from core.factories.base_factory import BulkCreateFactory
 from tasks.models import Task
 
 
-class TaskFactory(factory.django.DjangoModelFactory):
+class TaskFactory(BulkCreateFactory):
     class Meta:
         model = Task
 
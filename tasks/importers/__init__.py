@@ -0,0 +1 @@
+from tasks.importers.task_importer import *
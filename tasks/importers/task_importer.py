@@ -0,0 +1,30 @@
+from core.events import publish_event_on_commit
+from core.importers import BaseImporter
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from webhooks.outbox import add_outbox_event
+
+TASKS_IMPORTED_EVENT = "task.imported"
+
+
+class TaskImporter(BaseImporter):
+    """
+    Imports tasks from CSV (same columns as TaskCSVSerializer) or NDJSON.
+    Readonly columns such as id, owner or created_at are ignored. Imports are
+    reported to the event stream and the webhooks of the owner, with the last
+    batch of tasks.
+    """
+
+    model = Task
+    serializer_class = TaskSerializer
+
+    def __init__(self, owner, **kwargs):
+        super().__init__(owner_id=owner.pk, **kwargs)
+
+    def finish(self, created):
+        if not created:
+            return
+        data = {"created": created}
+        owner_id = self.save_kwargs["owner_id"]
+        add_outbox_event(owner_id, TASKS_IMPORTED_EVENT, data)
+        publish_event_on_commit(owner_id, TASKS_IMPORTED_EVENT, data)
@@ -0,0 +1 @@
+from tasks.jobs.task_jobs import *
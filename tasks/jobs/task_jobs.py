@@ -0,0 +1,129 @@
+import csv
+import io
+import tempfile
+
+from django.core.cache import cache
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import ROWS_BATCH_SIZE
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, UserIdentityMap
+from jobs.queue import enqueue_job
+from jobs.registry import register_job
+from tasks.models import Task
+
+EXPORT_TASKS_CSV = "tasks.export_csv"
+IMPORT_TASKS_CSV = "tasks.import_csv"
+REFRESH_TASK_CACHE = "tasks.refresh_cache"
+
+# Event published once per import instead of one task.created per row
+
+# While a refresh is queued, more writes of the same user don't enqueue another
+REFRESH_PENDING_TIMEOUT = 60  # in seconds
+
+EXPORT_ORDERING_FIELDS = {"created_at", "due_date", "priority"}
+
+
+# This module is imported by the jobs app when Django starts (see JobsConfig), so
+# filters, serializers and importers, which pull in DRF and django-filter, are
+# only imported by the handlers that use them
+
+
+def get_export_queryset(job):
+    """Rebuild the list queryset from the filters captured when the job was enqueued."""
+    from tasks.filters import TaskFilterSet  # noqa: PLC0415
+
+    params = job.params.get("filters", {})
+    queryset = Task.objects.filter(owner_id=job.owner_id)
+    queryset = TaskFilterSet(data=params, queryset=queryset).qs
+
+    ordering = params.get("ordering", "-created_at")
+    if ordering.lstrip("-") not in EXPORT_ORDERING_FIELDS:
+        ordering = "-created_at"
+    return queryset.order_by(ordering)
+
+
+@register_job(EXPORT_TASKS_CSV)
+def export_tasks_csv(job):
+    """Write every matching task to a CSV file. Unlike the CSV renderer it is not capped."""
+    from tasks.serializers import TaskCSVSerializer  # noqa: PLC0415
+
+    queryset = get_export_queryset(job)
+    total = queryset.count()
+    fields = TaskCSVSerializer.Meta.fields
+    # Every row belongs to the job owner, so owners never need a query
+    context = {IDENTITY_MAP_CONTEXT_KEY: UserIdentityMap([job.owner])}
+
+    with tempfile.TemporaryFile(mode="w+b") as tmp:
+        text = io.TextIOWrapper(tmp, encoding="utf-8", newline="")
+        writer = csv.DictWriter(text, fieldnames=fields)
+        writer.writeheader()
+
+        batch = []
+        written = 0
+        for task in queryset.iterator(chunk_size=ROWS_BATCH_SIZE):
+            batch.append(task)
+            if len(batch) == ROWS_BATCH_SIZE:
+                writer.writerows(
+                    TaskCSVSerializer(batch, many=True, context=context).data
+                )
+                written += len(batch)
+                batch = []
+                job.set_progress(written, total)
+        writer.writerows(TaskCSVSerializer(batch, many=True, context=context).data)
+        written += len(batch)
+
+        text.flush()
+        text.detach()
+        tmp.seek(0)
+        timestamp = timezone.now().strftime("%Y-%m-%d_%H_%M_%S")
+        job.result_file.save(f"tasks_{timestamp}.csv", File(tmp), save=False)
+
+    return {"rows": written}
+
+
+@register_job(IMPORT_TASKS_CSV)
+def import_tasks_csv(job):
+    """Stream the uploaded CSV or NDJSON file through the TaskImporter."""
+    from core.importers import detect_import_format  # noqa: PLC0415
+    from tasks.importers import TaskImporter  # noqa: PLC0415
+
+    total = job.input_file.size
+    importer = TaskImporter(
+        owner=job.owner,
+        progress_callback=lambda bytes_read: job.set_progress(bytes_read, total),
+    )
+    fmt = job.params.get("format") or detect_import_format(job.input_file.name)
+    with job.input_file.open("rb") as lines:
+        report = importer.run(lines, fmt)
+    if report["created"]:
+        # tasks.cache renders through tasks.views, which imports this module
+        from tasks.cache import invalidate_user_task_cache  # noqa: PLC0415
+
+        invalidate_user_task_cache(job.owner)
+    return report
+
+
+def get_refresh_pending_key(user_id) -> str:
+    return f"tasks:refresh_pending:{user_id}"
+
+
+def schedule_task_cache_refresh(user):
+    """Recompute the hot task lists of the user in a worker once the write is committed."""
+
+    def enqueue():
+        if cache.add(
+            get_refresh_pending_key(user.pk), 1, timeout=REFRESH_PENDING_TIMEOUT
+        ):
+            enqueue_job(REFRESH_TASK_CACHE, owner=user)
+
+    transaction.on_commit(enqueue)
+
+
+@register_job(REFRESH_TASK_CACHE)
+def refresh_task_cache(job):
+    from tasks.cache import warm_user_task_cache  # noqa: PLC0415
+
+    cache.delete(get_refresh_pending_key(job.owner_id))
+    return {"warmed": warm_user_task_cache(job.owner)}
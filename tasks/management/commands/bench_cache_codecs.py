@@ -0,0 +1,104 @@
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisSerializer
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from redis.exceptions import RedisError
+from rest_framework.renderers import JSONRenderer
+
+from core.cache_serializers import ZLIB, ZSTD, MsgpackSerializer
+from core.compression import compress
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, UserIdentityMap
+from core.pagination import CustomPageNumberPagination
+from tasks.benchmarks import seed_benchmark_tasks
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+BENCH_KEY = "bench:cache_codecs"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare size, Redis memory and encode/decode time of cached task pages "
+        "with pickle and msgpack, uncompressed, zlib and zstd. "
+        "Rows are seeded in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def get_payloads(self):
+        with transaction.atomic():
+            owner = seed_benchmark_tasks(CustomPageNumberPagination.max_page_size)
+            queryset = Task.objects.filter(owner=owner).order_by("-created_at")
+            context = {IDENTITY_MAP_CONTEXT_KEY: UserIdentityMap([owner])}
+
+            def page(size):
+                items = TaskSerializer(queryset[:size], many=True, context=context).data
+                paging = {
+                    "page": 1,
+                    "size": size,
+                    "total_pages": 1,
+                    "total_elements": size,
+                }
+                return {"paging": paging, "items": items}
+
+            payloads = {
+                "object entry": TaskSerializer(queryset[0], context=context).data,
+                "page (10 items)": page(10),
+                "page (100 items)": page(100),
+                "page (1000 items)": page(1000),
+                "rendered page (zstd)": (
+                    {"Content-Type": "application/json", "Content-Encoding": ZSTD},
+                    compress(JSONRenderer().render(page(100)), ZSTD),
+                ),
+            }
+            transaction.set_rollback(True)
+        return payloads
+
+    def get_memory_usage(self, value):
+        """Bytes Redis uses to hold the value, or None when it can't tell."""
+        client = getattr(cache, "_cache", None)
+        if client is None:
+            return None
+        try:
+            redis = client.get_client(BENCH_KEY, write=True)
+            redis.set(BENCH_KEY, value, ex=60)
+            try:
+                return redis.memory_usage(BENCH_KEY)
+            finally:
+                redis.delete(BENCH_KEY)
+        except RedisError:
+            return None
+
+    def handle(self, *args, **options):
+        codecs = {
+            "pickle": RedisSerializer(),
+            "msgpack": MsgpackSerializer(compression=""),
+            "msgpack+zlib": MsgpackSerializer(compression=ZLIB, compress_min_size=0),
+            "msgpack+zstd": MsgpackSerializer(compression=ZSTD, compress_min_size=0),
+        }
+        repeat = options["repeat"]
+
+        self.stdout.write(
+            f"{'payload':<22}{'codec':<14}{'bytes':>10}{'redis':>10}"
+            f"{'dumps us':>10}{'loads us':>10}"
+        )
+        for name, payload in self.get_payloads().items():
+            for codec_name, codec in codecs.items():
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    value = codec.dumps(payload)
+                dumps_us = (time.perf_counter() - started) / repeat * 1e6
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    codec.loads(value)
+                loads_us = (time.perf_counter() - started) / repeat * 1e6
+
+                memory = self.get_memory_usage(value)
+                self.stdout.write(
+                    f"{name:<22}{codec_name:<14}{len(value):>10,}"
+                    f"{'n/a' if memory is None else f'{memory:,}':>10}"
+                    f"{dumps_us:>10.1f}{loads_us:>10.1f}"
+                )
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework_csv.renderers import CSVRenderer
+
+from core.compression import BROTLI, GZIP, ZSTD, compress
+from core.constants import MAX_ROWS_TO_DOWNLOAD
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, UserIdentityMap
+from core.pagination import CustomPageNumberPagination
+from tasks.benchmarks import seed_benchmark_tasks
+from tasks.models import Task
+from tasks.serializers import TaskCSVSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare CPU cost and bytes saved of gzip, brotli and zstd on task payloads. "
+        "Rows are seeded in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            owner = seed_benchmark_tasks(MAX_ROWS_TO_DOWNLOAD)
+            queryset = Task.objects.filter(owner=owner).order_by("-created_at")
+            context = {IDENTITY_MAP_CONTEXT_KEY: UserIdentityMap([owner])}
+            page_size = CustomPageNumberPagination.max_page_size
+            payloads = {
+                f"json page ({page_size} items)": JSONRenderer().render(
+                    {
+                        "items": TaskSerializer(
+                            queryset[:page_size], many=True, context=context
+                        ).data
+                    }
+                ),
+                f"csv ({MAX_ROWS_TO_DOWNLOAD} rows)": CSVRenderer().render(
+                    TaskCSVSerializer(queryset, many=True, context=context).data
+                ),
+            }
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'payload':<26}{'encoding':<10}{'bytes':>12}{'saved':>9}{'ms':>9}{'MB/s':>9}"
+        )
+        for name, payload in payloads.items():
+            self.stdout.write(f"{name:<26}{'identity':<10}{len(payload):>12,}")
+            for encoding in (GZIP, BROTLI, ZSTD):
+                started = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    compressed = compress(payload, encoding)
+                seconds = (time.perf_counter() - started) / options["repeat"]
+                self.stdout.write(
+                    f"{'':<26}{encoding:<10}{len(compressed):>12,}"
+                    f"{1 - len(compressed) / len(payload):>9.1%}"
+                    f"{seconds * 1000:>9.2f}{len(payload) / seconds / 1e6:>9.0f}"
+                )
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_csv.renderers import CSVRenderer
+
+from core.columnar import ColumnarExport
+from core.identity_map import IDENTITY_MAP_CONTEXT_KEY, UserIdentityMap
+from core.renderers import ArrowIPCRenderer, ParquetRenderer
+from tasks.benchmarks import seed_benchmark_tasks
+from tasks.models import Task
+from tasks.serializers import TaskCSVSerializer
+from tasks.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare size and render time of CSV, Parquet and Arrow IPC task exports. "
+        "Rows are seeded in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            owner = seed_benchmark_tasks(options["rows"])
+            queryset = Task.objects.filter(owner=owner).order_by("-created_at")
+            results = [
+                ("csv", *self.measure(lambda: self.render_csv(queryset, owner))),
+                (
+                    "parquet",
+                    *self.measure(
+                        lambda: self.render_columnar(ParquetRenderer, queryset)
+                    ),
+                ),
+                (
+                    "arrow",
+                    *self.measure(
+                        lambda: self.render_columnar(ArrowIPCRenderer, queryset)
+                    ),
+                ),
+            ]
+            transaction.set_rollback(True)
+
+        csv_size = results[0][1]
+        self.stdout.write(f"{'format':<10}{'bytes':>14}{'vs csv':>10}{'seconds':>10}")
+        for name, size, seconds in results:
+            self.stdout.write(
+                f"{name:<10}{size:>14,}{size / csv_size:>10.2%}{seconds:>10.3f}"
+            )
+
+    def measure(self, render):
+        started = time.perf_counter()
+        content = render()
+        return len(content), time.perf_counter() - started
+
+    def render_csv(self, queryset, owner):
+        # Same path as the CSV renderer of the list endpoint, without the row cap
+        context = {IDENTITY_MAP_CONTEXT_KEY: UserIdentityMap([owner])}
+        data = TaskCSVSerializer(queryset, many=True, context=context).data
+        return CSVRenderer().render(data)
+
+    def render_columnar(self, renderer_class, queryset):
+        export = ColumnarExport(queryset, columns=TaskViewSet.columnar_fields)
+        return renderer_class().render(export)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.base.creation import TEST_DATABASE_PREFIX
+
+from tasks.benchmarks import LARGE_DATASET_ROWS, get_large_dataset_owner
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a template database with the test schema and the large dataset "
+        "seeded. Run it with the test settings, then set TEST_DB_TEMPLATE so test "
+        "databases are cloned from it instead of being created and seeded every run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=LARGE_DATASET_ROWS)
+        parser.add_argument(
+            "--name",
+            help="Template database name (default: <test database name>_template)",
+        )
+
+    def handle(self, *args, **options):
+        test_settings = connection.settings_dict["TEST"]
+        test_name = test_settings["NAME"] or (
+            TEST_DATABASE_PREFIX + connection.settings_dict["NAME"]
+        )
+        template = options["name"] or f"{test_name}_template"
+        # Create the template itself as the "test database", from scratch
+        test_settings.update(NAME=template, TEMPLATE=None)
+        connection.creation.create_test_db(
+            verbosity=options["verbosity"], autoclobber=True, serialize=False
+        )
+        get_large_dataset_owner(options["rows"])
+        # No connection may be open on a template while it is cloned
+        connection.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {options['rows']} tasks in {template}. "
+                f"Set TEST_DB_TEMPLATE={template} to use it."
+            )
+        )
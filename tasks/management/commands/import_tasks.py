@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import IMPORT_FORMATS, detect_import_format
+from tasks.importers import TaskImporter
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or NDJSON file of tasks into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the CSV or NDJSON file to import.")
+        parser.add_argument(
+            "--owner", required=True, help="Username of the owner of the tasks."
+        )
+        parser.add_argument(
+            "--format",
+            dest="input_format",
+            choices=IMPORT_FORMATS,
+            help="File format, detected from the extension when omitted.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist as e:
+            raise CommandError(f"User {options['owner']} does not exist") from e
+
+        fmt = options["input_format"] or detect_import_format(options["path"])
+        try:
+            with Path(options["path"]).open("rb") as lines:
+                report = TaskImporter(owner=owner).run(lines, fmt)
+        except OSError as e:
+            raise CommandError(str(e)) from e
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} task(s), {report['failed']} failed, "
+                f"in {report['duration']}s ({report['rows_per_second']} rows/sec)"
+            )
+        )
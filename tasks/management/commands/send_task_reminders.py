@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_worker_pool
+from tasks.reminders import run_reminder_scheduler
+
+
+class Command(BaseCommand):
+    help = "Send the due date reminders of tasks as they become due."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of scheduler processes to run in parallel.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASK_REMINDER_BATCH_SIZE,
+            help="Reminders taken per transaction.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TASK_REMINDER_POLL_INTERVAL,
+            help="Seconds to wait before looking for due reminders again.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no reminder is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Starting {options['processes']} reminder scheduler(s), "
+            f"polling every {options['poll_interval']}s"
+        )
+        processed = run_worker_pool(
+            processes=options["processes"],
+            target=run_reminder_scheduler,
+            poll_interval=options["poll_interval"],
+            burst=options["burst"],
+            batch_size=options["batch_size"],
+        )
+        if processed is not None:
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} reminder(s)"))
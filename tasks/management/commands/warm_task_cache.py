@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.cache import get_most_active_users, warm_task_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute the cached recent and first page task lists of the most "
+        "active users, e.g. after a deploy or a cache flush."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=100, help="Number of users to warm."
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="Activity window used to rank users by changed tasks.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Users warmed in parallel."
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        users = get_most_active_users(options["users"], days=options["days"])
+        warmed = warm_task_cache(users, workers=options["workers"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {warmed} task list(s) of {len(users)} user(s) "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:14
+
+import core.models.base_model
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='id',
+            field=models.UUIDField(default=core.models.base_model.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
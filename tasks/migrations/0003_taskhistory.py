@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:26
+
+import core.models.base_model
+import core.partitions
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_partitions(apps, schema_editor):
+    core.partitions.create_monthly_partitions(
+        apps.get_model('tasks', 'TaskHistory'), using=schema_editor.connection.alias
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_alter_task_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        core.partitions.CreatePartitionedModel(
+            name='TaskHistory',
+            fields=[
+                ('pk', models.CompositePrimaryKey('changed_at', 'id', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('id', models.UUIDField(default=core.models.base_model.uuid7, editable=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('object_id', models.UUIDField()),
+                ('changes', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('actor', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'task history',
+                'verbose_name_plural': 'task history',
+                'db_table': 'task_history',
+                'ordering': ['-changed_at'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['object_id', '-changed_at'], name='taskhistory_object_idx')],
+            },
+            partition_key='changed_at',
+        ),
+        migrations.RunPython(create_partitions, migrations.RunPython.noop),
+    ]
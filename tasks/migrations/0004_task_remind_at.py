@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:43
+
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models import F, Func, Value
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+def schedule_reminders(apps, schema_editor):
+    # Open tasks that are not overdue, the others get no reminder. The schedule
+    # of tasks.models.task is inlined, so that this migration keeps doing what
+    # it did when the model changes
+    Task = apps.get_model('tasks', 'Task')
+    reminder_time = time.fromisoformat(settings.TASK_REMINDER_TIME)
+    remind_at = Func(
+        F('due_date') + Value(timedelta(
+            days=-settings.TASK_REMINDER_DAYS_BEFORE,
+            hours=reminder_time.hour,
+            minutes=reminder_time.minute,
+        )),
+        Value(settings.TIME_ZONE),
+        template='(%(expressions)s)',
+        arg_joiner=' AT TIME ZONE ',
+        output_field=models.DateTimeField(),
+    )
+    tasks = (
+        Task.objects.using(schema_editor.connection.alias)
+        .filter(due_date__gte=timezone.localdate(), remind_at__isnull=True)
+        .exclude(status='completed')
+        .order_by('pk')
+    )
+    # One committed UPDATE per batch, rather than one locking the whole table
+    last_pk = None
+    while True:
+        batch = tasks if last_pk is None else tasks.filter(pk__gt=last_pk)
+        pks = list(batch.values_list('pk', flat=True)[:BATCH_SIZE])
+        if not pks:
+            return
+        Task.objects.using(schema_editor.connection.alias).filter(pk__in=pks).update(
+            remind_at=remind_at
+        )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    # The task table keeps taking writes while it is backfilled and indexed
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0003_taskhistory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='remind_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(schedule_reminders, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('remind_at__isnull', False)), fields=['remind_at'], name='task_remind_at_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:46
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The task table keeps taking writes while the index is built
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0004_task_remind_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted', False), models.Q(('status', 'completed'), _negated=True)), fields=['owner', 'due_date', 'priority'], include=('id', 'title', 'status'), name='task_agenda_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:54
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The task table keeps taking writes while the index is built
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0005_task_agenda_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_at_idx'),
+        ),
+    ]
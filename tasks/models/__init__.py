@@ -1 +1,2 @@
 from tasks.models.task import *
+from tasks.models.task_history import *
@@ -1,14 +1,114 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Case, F, Func, Value, When
+from django.utils import timezone
+
+from core.models import CustomQueryset, TimeOrderedBaseModel
+
+STATUS_COMPLETED = "completed"
+
+# Tasks still to do, as filtered by the agenda and its partial index
+OPEN_TASKS = models.Q(deleted=False) & ~models.Q(status=STATUS_COMPLETED)
+
+
+def get_reminder_offset() -> timedelta:
+    """Time of the reminder of a task from the start of its due date."""
+    reminder_time = time.fromisoformat(settings.TASK_REMINDER_TIME)
+    return timedelta(
+        days=-settings.TASK_REMINDER_DAYS_BEFORE,
+        hours=reminder_time.hour,
+        minutes=reminder_time.minute,
+    )
+
+
+def get_remind_at(due_date) -> datetime:
+    due_date = models.DateField().to_python(due_date)
+    return timezone.make_aware(
+        datetime.combine(due_date, time()) + get_reminder_offset(),
+        timezone.get_default_timezone(),
+    )
+
+
+def get_remind_at_expression(due_date) -> Func:
+    """`get_remind_at` in SQL, for a due date given as an expression."""
+    return Func(
+        due_date + Value(get_reminder_offset()),
+        Value(settings.TIME_ZONE),
+        template="(%(expressions)s)",
+        arg_joiner=" AT TIME ZONE ",
+        output_field=models.DateTimeField(),
+    )
+
 
-from core.models import BaseModel
+class TaskQuerySet(CustomQueryset):
+    """Keeps `Task.remind_at` scheduled on the bulk paths, like save() does."""
 
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.reschedule_reminder()
+        return super().bulk_create(objs, *args, **kwargs)
 
-class Task(BaseModel):
+    def bulk_update_with_history(self, objs, fields):
+        if {"status", "due_date"} & set(fields):
+            objs = list(objs)
+            for obj in objs:
+                if obj.should_reschedule_reminder():
+                    obj.reschedule_reminder()
+            fields = [*fields, "remind_at"]
+        return super().bulk_update_with_history(objs, fields)
+
+    def update(self, **kwargs):
+        return super().update(**self.with_reminder_schedule(kwargs))
+
+    def update_returning(self, **values):
+        return super().update_returning(**self.with_reminder_schedule(values))
+
+    @staticmethod
+    def with_reminder_schedule(values) -> dict:
+        """
+        Add the `remind_at` the rows get from the update `values`, as the SQL
+        of an UPDATE reads the row before the update: a new due date schedules
+        the reminder of the tasks that are not completed, completing a task
+        drops it, and reopening one schedules it again.
+        """
+        if "remind_at" in values or not {"status", "due_date"} & values.keys():
+            return values
+        if values.get("status") == STATUS_COMPLETED:
+            return {**values, "remind_at": None}
+
+        if "due_date" in values:
+            due_date = values["due_date"]
+            if hasattr(due_date, "resolve_expression"):
+                remind_at = get_remind_at_expression(due_date)
+            else:
+                remind_at = Value(get_remind_at(due_date))
+            if "status" not in values:
+                remind_at = Case(
+                    When(status=STATUS_COMPLETED, then=None),
+                    default=remind_at,
+                    output_field=models.DateTimeField(),
+                )
+        else:
+            remind_at = Case(
+                When(
+                    status=STATUS_COMPLETED,
+                    then=get_remind_at_expression(F("due_date")),
+                ),
+                default=F("remind_at"),
+                output_field=models.DateTimeField(),
+            )
+        return {**values, "remind_at": remind_at}
+
+
+class Task(TimeOrderedBaseModel):
     STATUS_CHOICES = [
         ("pending", "Pending"),
         ("in_progress", "In Progress"),
-        ("completed", "Completed"),
+        (STATUS_COMPLETED, "Completed"),
     ]
 
     title = models.CharField(max_length=200)
@@ -17,11 +117,66 @@ class Task(BaseModel):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     priority = models.PositiveSmallIntegerField(default=3)  # 1=High, 5=Low
     due_date = models.DateField()
+    # When the due date reminder is sent, None once sent or for completed tasks.
+    # Kept up to date by save() and TaskQuerySet, see tasks.reminders
+    remind_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    FIELDS_TO_WATCH_FOR_CHANGES = ["status", "priority", "due_date"]
+    HISTORY_MODEL = "tasks.TaskHistory"
 
     class Meta:
         verbose_name = "task"
         verbose_name_plural = "tasks"
         db_table = "task"
+        indexes = [
+            # Order of the admin changelist, paged by keyset
+            models.Index(fields=["created_at", "id"], name="task_created_at_idx"),
+            # Covers the agenda query, which reads the next open tasks of a user
+            # from the index in order, without visiting the table
+            models.Index(
+                fields=["owner", "due_date", "priority"],
+                include=["id", "title", "status"],
+                name="task_agenda_idx",
+                condition=OPEN_TASKS,
+            ),
+            # Only the scheduled reminders, scanned by due time
+            models.Index(
+                fields=["remind_at"],
+                name="task_remind_at_idx",
+                condition=models.Q(remind_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if (
+            update_fields is None or {"status", "due_date"} & set(update_fields)
+        ) and self.should_reschedule_reminder():
+            self.reschedule_reminder()
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "remind_at"]
+            elif not self._state.adding:
+                # Not editable, so __setattr__ did not track it
+                self._update_fields.append("remind_at")
+        super().save(*args, **kwargs)
+
+    def should_reschedule_reminder(self) -> bool:
+        """The task is new, or its due date or completion changed since the last save."""
+        if self._state.adding or self.has_changed("due_date"):
+            return True
+        if not self.has_changed("status"):
+            return False
+        old_status = self.get_old_value("status")
+        if old_status is models.DEFERRED:
+            return True
+        return STATUS_COMPLETED in {old_status, self.status}
+
+    def reschedule_reminder(self):
+        self.remind_at = (
+            None if self.status == STATUS_COMPLETED else get_remind_at(self.due_date)
+        )
@@ -0,0 +1,10 @@
+from core.models import BaseHistoryModel
+
+
+class TaskHistory(BaseHistoryModel):
+    """Changes of the status, priority and due date of tasks."""
+
+    class Meta(BaseHistoryModel.Meta):
+        verbose_name = "task history"
+        verbose_name_plural = "task history"
+        db_table = "task_history"
@@ -0,0 +1,120 @@
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tasks.models import STATUS_COMPLETED, Task
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderNotifier:
+    """
+    Sends the due date reminders of tasks. Set TASK_REMINDER_NOTIFIER to the
+    dotted path of a subclass to send them another way.
+    """
+
+    def send(self, tasks):
+        """Notify the owners of `tasks`, raise to have them retried later."""
+        raise NotImplementedError
+
+
+class EmailReminderNotifier(ReminderNotifier):
+    """One email per owner, listing their tasks. Owners without email are skipped."""
+
+    def send(self, tasks):
+        tasks_by_owner = defaultdict(list)
+        for task in tasks:
+            if task.owner.email:
+                tasks_by_owner[task.owner].append(task)
+        messages = [
+            (
+                f"{len(owner_tasks)} task(s) due soon",
+                "\n".join(
+                    f"- {task.title} (due {task.due_date})" for task in owner_tasks
+                ),
+                None,
+                [owner.email],
+            )
+            for owner, owner_tasks in tasks_by_owner.items()
+        ]
+        send_mass_mail(messages, fail_silently=False)
+
+
+def get_reminder_notifier() -> ReminderNotifier:
+    return import_string(settings.TASK_REMINDER_NOTIFIER)()
+
+
+def claim_due_reminders(batch_size=None) -> list:
+    """
+    Take the reminders that are due, oldest first, and unschedule them. The
+    scan only reads the partial index of the scheduled reminders, and rows
+    locked by other schedulers are skipped, so any number of them can run.
+    """
+    batch_size = batch_size or settings.TASK_REMINDER_BATCH_SIZE
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("owner")
+            .filter(remind_at__lte=timezone.now())
+            .order_by("remind_at")[:batch_size]
+        )
+        if tasks:
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).update(remind_at=None)
+    return tasks
+
+
+def send_due_reminders(notifier=None, batch_size=None) -> int:
+    """
+    Send a batch of due reminders, and return the number of reminders taken.
+    Reminders of tasks that were deleted, completed or are already overdue
+    are dropped. When the notifier fails, the batch is retried after
+    TASK_REMINDER_RETRY_DELAY.
+    """
+    tasks = claim_due_reminders(batch_size)
+    today = timezone.localdate()
+    due = [
+        task
+        for task in tasks
+        if not task.deleted and task.status != STATUS_COMPLETED and task.due_date >= today
+    ]
+    if not due:
+        return len(tasks)
+
+    notifier = notifier or get_reminder_notifier()
+    try:
+        notifier.send(due)
+    except Exception:
+        logger.exception(f"Sending {len(due)} task reminder(s) failed")
+        # Unless the task was rescheduled meanwhile
+        Task.objects.filter(pk__in=[task.pk for task in due], remind_at=None).update(
+            remind_at=timezone.now()
+            + timedelta(seconds=settings.TASK_REMINDER_RETRY_DELAY)
+        )
+    return len(tasks)
+
+
+def run_reminder_scheduler(poll_interval=60.0, burst=False, batch_size=None) -> int:
+    """
+    Send the due reminders until stopped, sleeping `poll_interval` seconds once
+    none are due. With `burst`, exit instead. Returns the reminders taken.
+    """
+    notifier = get_reminder_notifier()
+    processed = 0
+    while True:
+        count = send_due_reminders(notifier, batch_size)
+        processed += count
+        if count:
+            continue
+        if burst:
+            break
+        # Drop broken or expired connections while idle, like jobs.worker does
+        close_old_connections()
+        time.sleep(poll_interval)
+    return processed
@@ -1 +1,2 @@
+from tasks.serializers.task_history_serializer import *
 from tasks.serializers.task_serializer import *
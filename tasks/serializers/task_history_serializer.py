@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from core.serializers import IdentityMapListSerializer, UsernameField
+from tasks.models import TaskHistory
+
+
+class TaskHistorySerializer(serializers.ModelSerializer):
+    actor = UsernameField()
+
+    class Meta:
+        model = TaskHistory
+        list_serializer_class = IdentityMapListSerializer
+        fields = ["changed_at", "actor", "changes"]
+        read_only_fields = fields
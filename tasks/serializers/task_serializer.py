@@ -2,16 +2,22 @@ from datetime import date
 
 from rest_framework import serializers
 
+from core.serializers import (
+    IdentityMapListSerializer,
+    SparseFieldsetMixin,
+    UsernameField,
+)
 from tasks.models import Task
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    owner = serializers.ReadOnlyField(source="owner.username")
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    owner = UsernameField()
 
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ["remind_at"]
         read_only_fields = ["id", "owner", "created_at", "updated_at"]
+        list_serializer_class = IdentityMapListSerializer
 
     def validate_priority(self, value):
         if not 1 <= value <= 5:
@@ -26,15 +32,16 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
-class TaskCSVSerializer(serializers.ModelSerializer):
+class TaskCSVSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Readonly serializer for exporting Task data in CSV format. including owner username
     """
 
-    owner = serializers.ReadOnlyField(source="owner.username")
+    owner = UsernameField()
 
     class Meta:
         model = Task
+        list_serializer_class = IdentityMapListSerializer
         fields = [
             "id",
             "title",
@@ -47,3 +54,12 @@ class TaskCSVSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = fields
+
+
+class TaskAgendaSerializer(serializers.ModelSerializer):
+    """Readonly serializer of the agenda, limited to the columns of its index."""
+
+    class Meta:
+        model = Task
+        fields = ["id", "title", "status", "priority", "due_date"]
+        read_only_fields = fields
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.object_cache import invalidate_cached_objects
+from tasks.models import Task
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_cached_task(instance, **_kwargs):
+    invalidate_cached_objects(Task, [instance.pk])
@@ -0,0 +1,182 @@
+import functools
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.admin import EstimatedCountPaginator, iterate_in_batches
+from core.factories import UserFactory
+from tasks.admin import TaskAdmin
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskHistory
+from tasks.views import TaskViewSet
+from webhooks.models import OutboxEvent
+
+CHANGELIST_URL = reverse("admin:tasks_task_changelist")
+
+
+class TestTaskAdmin(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pass")
+        cls.user = UserFactory()
+        cls.tasks = TaskFactory.create_batch(5, owner=cls.user, status="pending")
+        # Ties on created_at are ordered by id
+        Task.objects.filter(pk__in=[task.pk for task in cls.tasks[1:3]]).update(
+            created_at=cls.tasks[1].created_at
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def get_changelist(self, url=CHANGELIST_URL):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query["sql"] for query in queries.captured_queries]
+
+    @mock.patch.object(TaskAdmin, "list_per_page", 2)
+    def test_changelist_is_paged_by_cursor(self):
+        seen = []
+        url = CHANGELIST_URL
+        while url:
+            response, queries = self.get_changelist(url)
+            cl = response.context["cl"]
+            self.assertTrue(cl.is_keyset_paginated)
+            self.assertFalse(any("OFFSET" in sql for sql in queries))
+            seen += [task.pk for task in cl.result_list]
+            url = cl.next_page_url and CHANGELIST_URL + cl.next_page_url
+
+        self.assertEqual(
+            seen,
+            list(
+                Task.objects.order_by("-created_at", "-id").values_list("pk", flat=True)
+            ),
+        )
+        self.assertContains(response, "First")
+
+    @mock.patch.object(TaskAdmin, "list_per_page", 2)
+    def test_sorting_by_a_column_falls_back_to_numbered_pages(self):
+        response, _ = self.get_changelist(f"{CHANGELIST_URL}?o=1&p=2")
+
+        cl = response.context["cl"]
+        self.assertFalse(cl.is_keyset_paginated)
+        self.assertEqual(len(cl.result_list), 2)
+
+    @mock.patch.object(TaskAdmin, "list_per_page", 2)
+    def test_invalid_cursor_is_an_incorrect_lookup(self):
+        for cursor in ("nope", "[1]", '["2030-01-01T00:00:00+00:00", "not-a-uuid"]'):
+            response, _ = self.get_changelist(f"{CHANGELIST_URL}?cursor={cursor}")
+            self.assertRedirects(response, f"{CHANGELIST_URL}?e=1")
+
+    @mock.patch.object(EstimatedCountPaginator, "exact_count_limit", 2)
+    def test_large_counts_are_estimated_and_filters_read_no_values(self):
+        response, queries = self.get_changelist()
+
+        self.assertTrue(response.context["cl"].paginator.is_estimated)
+        self.assertContains(response, "~")
+        for sql in queries:
+            self.assertNotIn("DISTINCT", sql)
+            if "COUNT(" in sql:
+                self.assertIn("LIMIT 3", sql)
+
+    def retrieve(self, task):
+        request = APIRequestFactory().get(f"/tasks/{task.pk}/")
+        force_authenticate(request, user=self.user)
+        return TaskViewSet.as_view({"get": "retrieve"})(request, pk=str(task.pk)).data
+
+    @mock.patch("tasks.admin.publish_event_on_commit")
+    def test_actions_update_the_selection_in_batches(self, publish_event_on_commit):
+        version = TaskViewSet().get_cache_version(self.user.pk)
+        selected = [str(task.pk) for task in self.tasks[:3]]
+        # Served from the object cache from now on
+        self.assertEqual(self.retrieve(self.tasks[0])["status"], "pending")
+
+        with (
+            mock.patch(
+                "tasks.admin.iterate_in_batches",
+                functools.partial(iterate_in_batches, batch_size=2),
+            ),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                CHANGELIST_URL,
+                {"action": "mark_completed", "_selected_action": selected},
+            )
+
+        self.assertRedirects(response, CHANGELIST_URL)
+        self.assertEqual(
+            set(Task.objects.filter(status="completed").values_list("pk", flat=True)),
+            {task.pk for task in self.tasks[:3]},
+        )
+        self.assertEqual(
+            list(TaskHistory.objects.values_list("actor", flat=True)), [self.admin.pk] * 3
+        )
+        self.assertFalse(
+            Task.objects.filter(pk__in=selected, remind_at__isnull=False).exists()
+        )
+        self.assertEqual(TaskViewSet().get_cache_version(self.user.pk), version + 1)
+        self.assertEqual(self.retrieve(self.tasks[0])["status"], "completed")
+
+        events = OutboxEvent.objects.order_by("id")
+        self.assertEqual(
+            {(event.event_type, event.object_id) for event in events},
+            {("task.updated", task.pk) for task in self.tasks[:3]},
+        )
+        self.assertEqual({event.data["status"] for event in events}, {"completed"})
+        self.assertEqual(
+            sorted(call.args[:2] for call in publish_event_on_commit.call_args_list),
+            [(self.user.pk, "task.updated")] * 3,
+        )
+
+    @mock.patch("tasks.admin.publish_event_on_commit")
+    def test_actions_skip_tasks_that_already_have_the_values(
+        self, publish_event_on_commit
+    ):
+        Task.objects.filter(pk=self.tasks[0].pk).update(status="completed")
+        selected = [str(task.pk) for task in self.tasks[:2]]
+
+        response = self.client.post(
+            CHANGELIST_URL,
+            {"action": "mark_completed", "_selected_action": selected},
+            follow=True,
+        )
+
+        self.assertContains(response, "1 task(s) updated.")
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("object_id", flat=True)),
+            [self.tasks[1].pk],
+        )
+        publish_event_on_commit.assert_called_once()
+        self.assertEqual(
+            list(
+                TaskHistory.objects.filter(actor=self.admin).values_list(
+                    "object_id", flat=True
+                )
+            ),
+            [self.tasks[1].pk],
+        )
+
+    def test_delete_action_is_soft(self):
+        self.client.post(
+            CHANGELIST_URL,
+            {"action": "soft_delete", "_selected_action": [str(self.tasks[0].pk)]},
+        )
+
+        self.assertTrue(Task.objects.get(pk=self.tasks[0].pk).deleted)
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("event_type", "data")),
+            [("task.deleted", {"id": str(self.tasks[0].pk)})],
+        )
+        self.assertNotIn(
+            "delete_selected",
+            self.client.get(CHANGELIST_URL)
+            .context["action_form"]
+            .fields["action"]
+            .choices,
+        )
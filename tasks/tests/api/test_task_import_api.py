@@ -0,0 +1,47 @@
+import json
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITestCase
+
+from core.factories import UserFactory
+from tasks.models import Task
+
+
+class TaskBulkImportAPITests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+        self.due = (date.today() + timedelta(days=3)).isoformat()
+
+    def test_bulk_import_raw_csv_body(self):
+        content = f"title,priority,due_date\nA,1,{self.due}\nB,0,{self.due}\n"
+        r = self.client.generic(
+            "POST", "/api/tasks/bulk-import/", content, content_type="text/csv"
+        )
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["created"], 1)
+        self.assertEqual(r.data["failed"], 1)
+        self.assertIn("rows_per_second", r.data)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    def test_bulk_import_multipart_ndjson(self):
+        content = json.dumps({"title": "A", "priority": 2, "due_date": self.due})
+        upload = SimpleUploadedFile("tasks.ndjson", content.encode())
+
+        r = self.client.post(
+            "/api/tasks/bulk-import/", {"file": upload}, format="multipart"
+        )
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["created"], 1)
+
+    def test_bulk_import_invalid_format(self):
+        r = self.client.generic(
+            "POST",
+            "/api/tasks/bulk-import/?input_format=xml",
+            "<tasks/>",
+            content_type="text/xml",
+        )
+        self.assertEqual(r.status_code, 400)
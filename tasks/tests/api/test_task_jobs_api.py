@@ -0,0 +1,73 @@
+import csv
+import io
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITestCase
+
+from core.factories import UserFactory
+from jobs.models import Job
+from jobs.worker import run_next_job
+from tasks.factories import TaskFactory
+from tasks.models import Task
+
+
+class TaskJobsAPITests(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(self.user)
+
+    def test_export_csv_job(self):
+        TaskFactory.create_batch(3, owner=self.user, priority=1)
+        TaskFactory(owner=self.user, priority=5)
+        TaskFactory()  # another user's task
+
+        r = self.client.post("/api/tasks/export/?max_priority=2")
+        self.assertEqual(r.status_code, 202)
+        self.assertEqual(r.data["status"], Job.STATUS_QUEUED)
+
+        run_next_job()
+
+        r = self.client.get(f"/api/jobs/{r.data['id']}/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["status"], Job.STATUS_SUCCEEDED)
+        self.assertEqual(r.data["result"], {"rows": 3})
+
+        r = self.client.get(r.data["download_url"])
+        self.assertEqual(r.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(b"".join(r.streaming_content).decode())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["owner"] for row in rows}, {self.user.username})
+
+    def test_import_csv_job(self):
+        due = (date.today() + timedelta(days=3)).isoformat()
+        content = (
+            "title,description,priority,due_date,status\n"
+            f"First,,1,{due},pending\n"
+            f"Second,desc,9,{due},pending\n"
+            f"Third,,2,{due},completed\n"
+        )
+        upload = SimpleUploadedFile("tasks.csv", content.encode(), "text/csv")
+
+        r = self.client.post("/api/tasks/import/", {"file": upload}, format="multipart")
+        self.assertEqual(r.status_code, 202)
+
+        run_next_job()
+
+        r = self.client.get(f"/api/jobs/{r.data['id']}/")
+        self.assertEqual(r.data["status"], Job.STATUS_SUCCEEDED)
+        self.assertEqual(r.data["result"]["created"], 2)
+        self.assertEqual(r.data["result"]["failed"], 1)
+        self.assertEqual(r.data["result"]["errors"][0]["line"], 3)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 2)
+
+    def test_import_requires_file(self):
+        r = self.client.post("/api/tasks/import/", {}, format="multipart")
+        self.assertEqual(r.status_code, 400)
+
+    def test_jobs_are_owner_scoped(self):
+        r = self.client.post("/api/tasks/export/")
+        self.client.force_authenticate(UserFactory())
+
+        r = self.client.get(f"/api/jobs/{r.data['id']}/")
+        self.assertEqual(r.status_code, 404)
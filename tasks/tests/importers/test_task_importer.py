@@ -0,0 +1,99 @@
+import io
+import json
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+
+from core.factories import UserFactory
+from core.importers import FORMAT_NDJSON, detect_import_format
+from tasks.importers import TaskImporter
+from tasks.models import Task
+from webhooks.models import OutboxEvent
+
+
+class TestTaskImporter(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.due = (date.today() + timedelta(days=3)).isoformat()
+
+    def test_import_csv(self):
+        content = (
+            "id,title,description,priority,due_date,status,owner\n"
+            f"ignored,First,,1,{self.due},pending,someone\n"
+            f'ignored,"Multi\nline",desc,2,{self.due},completed,someone\n'
+        )
+        report = TaskImporter(owner=self.user).run(io.BytesIO(content.encode()))
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["failed"], 0)
+        self.assertEqual(
+            set(Task.objects.filter(owner=self.user).values_list("title", "owner_id")),
+            {("First", self.user.id), ("Multi\nline", self.user.id)},
+        )
+
+    def test_import_ndjson_reports_errors(self):
+        rows = [
+            {"title": "Valid", "priority": 2, "due_date": self.due},
+            {"title": "Bad priority", "priority": 7, "due_date": self.due},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\n\nnot json\n[1]\n"
+        report = TaskImporter(owner=self.user).run(
+            io.BytesIO(content.encode()), FORMAT_NDJSON
+        )
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["failed"], 3)
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 4, 5])
+        self.assertIn("priority", report["errors"][0]["errors"])
+
+    def test_import_writes_in_batches(self):
+        content = "title,priority,due_date\n" + "".join(
+            f"Task {i},3,{self.due}\n" for i in range(5)
+        )
+        importer = TaskImporter(owner=self.user)
+        importer.batch_size = 2
+        progress = []
+        importer.progress_callback = progress.append
+
+        # One INSERT per batch and no per-row queries, the last batch with the
+        # outbox event in a savepoint of the test transaction
+        with self.assertNumQueries(6):
+            report = importer.run(io.BytesIO(content.encode()))
+
+        self.assertEqual(report["created"], 5)
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1], len(content))
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("event_type", "data")),
+            [("task.imported", {"created": 5})],
+        )
+
+    def test_import_event_is_written_with_the_last_batch(self):
+        content = "title,priority,due_date\n" + "".join(
+            f"Task {i},3,{self.due}\n" for i in range(3)
+        )
+        importer = TaskImporter(owner=self.user)
+        importer.batch_size = 2
+
+        with (
+            mock.patch(
+                "tasks.importers.task_importer.add_outbox_event",
+                side_effect=DatabaseError,
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            importer.run(io.BytesIO(content.encode()))
+
+        self.assertEqual(
+            set(Task.objects.values_list("title", flat=True)), {"Task 0", "Task 1"}
+        )
+
+    def test_detect_import_format(self):
+        self.assertEqual(detect_import_format("tasks.jsonl"), FORMAT_NDJSON)
+        self.assertEqual(
+            detect_import_format(content_type="application/x-ndjson; charset=utf-8"),
+            FORMAT_NDJSON,
+        )
+        self.assertEqual(detect_import_format("tasks.csv", "text/csv"), "csv")
@@ -0,0 +1,138 @@
+from datetime import date
+from unittest import mock
+
+from django.db import DatabaseError, transaction
+from django.db.models import F, QuerySet
+from django.test import TestCase
+
+from core.factories import UserFactory
+from core.history import recording_actor
+from tasks.factories import TaskFactory
+from tasks.models import Task, TaskHistory
+
+
+class TestTaskHistory(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        self.task = TaskFactory(
+            owner=self.user, status="pending", priority=3, due_date=date(2030, 1, 1)
+        )
+
+    def history(self, task=None):
+        return list(
+            TaskHistory.objects.filter(object_id=(task or self.task).pk).values_list(
+                "changes", flat=True
+            )
+        )
+
+    def test_save_records_changed_watched_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.status = "completed"
+            self.task.due_date = "2030-01-01"  # same date, as a string
+            self.task.title = "Not watched"
+            self.task.save()
+
+        self.assertEqual(self.history(), [{"status": ["pending", "completed"]}])
+
+    def test_creation_and_unchanged_saves_record_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.title = "Renamed"
+            self.task.save()
+
+        self.assertEqual(self.history(), [])
+
+    def test_changes_are_attributed_to_the_actor(self):
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            recording_actor(lambda: self.user),
+        ):
+            self.task.priority = 1
+            self.task.save()
+
+        entry = TaskHistory.objects.get(object_id=self.task.pk)
+        self.assertEqual(entry.actor_id, self.user.pk)
+        self.assertEqual(entry.changes, {"priority": [3, 1]})
+
+    def test_history_is_written_with_the_change(self):
+        with self.assertNumQueries(2):
+            self.task.priority = 5
+            self.task.save()
+        self.assertEqual(self.history(), [{"priority": [3, 5]}])
+
+        # A failed history insert fails the write it records
+        with (
+            mock.patch.object(QuerySet, "bulk_create", side_effect=DatabaseError),
+            self.assertRaises(DatabaseError),
+            transaction.atomic(),
+        ):
+            self.task.priority = 1
+            self.task.save()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.priority, 5)
+
+    def test_bulk_paths_write_one_insert(self):
+        tasks = [self.task, TaskFactory(owner=self.user, priority=3)]
+        for task in tasks:
+            task.priority = 5
+
+        with self.assertNumQueries(2):
+            Task.objects.bulk_update(tasks, ["priority"])
+
+        self.assertEqual(
+            TaskHistory.objects.filter(changes={"priority": [3, 5]}).count(), 2
+        )
+
+    def test_rolled_back_savepoint_drops_its_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.priority = 1
+            self.task.save()
+            with transaction.atomic():
+                self.task.status = "completed"
+                self.task.save()
+                transaction.set_rollback(True)
+
+        self.assertEqual(self.history(), [{"priority": [3, 1]}])
+
+    def test_bulk_update_records_changes_from_the_instances(self):
+        other = TaskFactory(owner=self.user, status="pending")
+        self.task.status = "in_progress"
+        other.title = "Not watched"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.bulk_update([self.task, other], ["status", "title"])
+
+        self.assertEqual(self.history(), [{"status": ["pending", "in_progress"]}])
+        self.assertEqual(self.history(other), [])
+        self.assertFalse(self.task.has_changed("status"))
+
+    def test_queryset_update_records_old_and_new_values(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(pk=self.task.pk).update(status="completed")
+            Task.objects.filter(pk=self.task.pk).update(priority=F("priority") + 1)
+
+        self.assertCountEqual(
+            self.history(),
+            [{"status": ["pending", "completed"]}, {"priority": [3, 4]}],
+        )
+
+    def test_update_returning_reads_old_values_in_the_same_query(self):
+        # The update, then the history insert
+        with self.assertNumQueries(2) as queries:
+            Task.objects.filter(pk=self.task.pk).update_returning(
+                status="completed", priority=3
+            )
+
+        self.assertIn("FOR UPDATE", queries.captured_queries[0]["sql"])
+        self.assertEqual(self.history(), [{"status": ["pending", "completed"]}])
+
+    def test_deferred_fields_are_not_loaded_to_watch_them(self):
+        with self.assertNumQueries(1):
+            (task,) = Task.objects.filter(pk=self.task.pk).only("id", "title")
+            self.assertFalse(task.has_changed("status"))
+
+        task.status = "completed"
+        self.assertTrue(task.has_changed("status"))
+        self.assertEqual(task.get_changes(), {"status": [None, "completed"]})
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone
+
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.models import Task
+
+DUE_DATE = date(2030, 1, 10)
+REMIND_AT = datetime(2030, 1, 9, 9, tzinfo=timezone.utc)
+
+
+@override_settings(TASK_REMINDER_DAYS_BEFORE=1, TASK_REMINDER_TIME="09:00")
+class TestTaskReminderSchedule(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        self.task = TaskFactory(owner=self.user, status="pending", due_date=DUE_DATE)
+
+    def remind_at(self, task=None):
+        return Task.objects.values_list("remind_at", flat=True).get(
+            pk=(task or self.task).pk
+        )
+
+    def test_new_tasks_are_scheduled_unless_completed(self):
+        completed = TaskFactory(owner=self.user, status="completed")
+
+        self.assertEqual(self.remind_at(), REMIND_AT)
+        self.assertIsNone(self.remind_at(completed))
+
+    def test_save_reschedules_on_due_date_and_completion_changes(self):
+        self.task.due_date = "2030-02-01"
+        self.task.save()
+        self.assertEqual(self.remind_at(), datetime(2030, 1, 31, 9, tzinfo=timezone.utc))
+
+        self.task.status = "completed"
+        self.task.save()
+        self.assertIsNone(self.remind_at())
+
+        self.task.status = "pending"
+        self.task.save()
+        self.assertEqual(self.remind_at(), datetime(2030, 1, 31, 9, tzinfo=timezone.utc))
+
+    def test_sent_reminder_is_not_scheduled_again_by_other_changes(self):
+        Task.objects.filter(pk=self.task.pk).update(remind_at=None)
+        task = Task.objects.get(pk=self.task.pk)
+
+        task.status = "in_progress"
+        task.priority = 1
+        task.save()
+
+        self.assertIsNone(self.remind_at())
+
+    def test_queryset_update_reschedules_from_the_new_values(self):
+        other = TaskFactory(owner=self.user, status="completed", due_date=DUE_DATE)
+        tasks = Task.objects.filter(pk__in=[self.task.pk, other.pk])
+
+        Task.objects.filter(pk=self.task.pk).update(remind_at=None)
+        tasks.update(due_date=F("due_date") + timedelta(days=1))
+
+        self.assertEqual(self.remind_at(), REMIND_AT + timedelta(days=1))
+        self.assertIsNone(self.remind_at(other))
+
+        tasks.update(status="pending")
+        self.assertEqual(self.remind_at(other), REMIND_AT + timedelta(days=1))
+
+        tasks.update(status="completed")
+        self.assertIsNone(self.remind_at())
+
+    def test_update_returning_reschedules_reopened_tasks(self):
+        Task.objects.filter(pk=self.task.pk).update(status="completed")
+
+        # The update, then the history insert
+        with self.assertNumQueries(2):
+            (task,) = Task.objects.filter(pk=self.task.pk).update_returning(
+                status="in_progress"
+            )
+
+        self.assertEqual(task.remind_at, REMIND_AT)
+
+    def test_bulk_update_reschedules_changed_tasks(self):
+        self.task.due_date = date(2030, 1, 20)
+
+        Task.objects.bulk_update([self.task], ["due_date"])
+
+        self.assertEqual(self.remind_at(), REMIND_AT + timedelta(days=10))
+
+    def test_bulk_create_schedules_new_tasks(self):
+        Task.objects.bulk_create([Task(owner=self.user, title="Bulk", due_date=DUE_DATE)])
+
+        self.assertEqual(
+            Task.objects.values_list("remind_at", flat=True).get(title="Bulk"),
+            REMIND_AT,
+        )
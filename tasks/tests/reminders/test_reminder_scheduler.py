@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.models import Task
+from tasks.reminders import (
+    ReminderNotifier,
+    claim_due_reminders,
+    run_reminder_scheduler,
+    send_due_reminders,
+)
+
+
+class RecordingNotifier(ReminderNotifier):
+    sent = []
+
+    def send(self, tasks):
+        self.sent.append(sorted(task.title for task in tasks))
+
+
+class FailingNotifier(ReminderNotifier):
+    def send(self, tasks):
+        raise ConnectionError("SMTP server unavailable")
+
+
+class TestReminderScheduler(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(email="owner@example.com")
+
+    def setUp(self):
+        RecordingNotifier.sent = []
+
+    def add_task(self, title, remind_in=-1, **kwargs):
+        """A task whose reminder is due `remind_in` minutes from now."""
+        kwargs.setdefault("due_date", timezone.localdate() + timedelta(days=1))
+        kwargs.setdefault("status", "pending")
+        task = TaskFactory(owner=self.user, title=title, **kwargs)
+        Task.objects.filter(pk=task.pk).update(
+            remind_at=timezone.now() + timedelta(minutes=remind_in)
+        )
+        return task
+
+    def test_only_due_reminders_are_claimed_oldest_first(self):
+        self.add_task("Later", remind_in=60)
+        self.add_task("Second", remind_in=-5)
+        self.add_task("First", remind_in=-10)
+
+        with self.assertNumQueries(4):  # in a savepoint of the test transaction
+            tasks = claim_due_reminders(batch_size=10)
+
+        self.assertEqual([task.title for task in tasks], ["First", "Second"])
+        self.assertEqual(
+            list(Task.objects.exclude(remind_at=None).values_list("title", flat=True)),
+            ["Later"],
+        )
+        self.assertEqual(claim_due_reminders(), [])
+
+    def test_reminders_of_closed_or_overdue_tasks_are_dropped(self):
+        self.add_task("Open")
+        self.add_task("Overdue", due_date=date(2020, 1, 1))
+        deleted = self.add_task("Deleted")
+        deleted.delete()
+        completed = self.add_task("Completed")
+        Task.objects.filter(pk=completed.pk).update(
+            status="completed", remind_at=timezone.now()
+        )
+
+        self.assertEqual(send_due_reminders(RecordingNotifier()), 4)
+
+        self.assertEqual(RecordingNotifier.sent, [["Open"]])
+        self.assertFalse(Task.objects.exclude(remind_at=None).exists())
+
+    @override_settings(TASK_REMINDER_RETRY_DELAY=300)
+    def test_failed_reminders_are_retried_later(self):
+        task = self.add_task("Open")
+
+        send_due_reminders(FailingNotifier())
+
+        task.refresh_from_db()
+        self.assertGreater(task.remind_at, timezone.now() + timedelta(seconds=250))
+        self.assertEqual(claim_due_reminders(), [])
+
+    @override_settings(TASK_REMINDER_NOTIFIER="tasks.reminders.EmailReminderNotifier")
+    def test_owners_get_one_email_listing_their_tasks(self):
+        self.add_task("Write report")
+        self.add_task("Book room")
+        TaskFactory(
+            owner=UserFactory(email=""), status="pending", due_date=timezone.localdate()
+        )
+        Task.objects.filter(owner__email="").update(remind_at=timezone.now())
+
+        self.assertEqual(run_reminder_scheduler(burst=True), 3)
+
+        (message,) = mail.outbox
+        self.assertEqual(message.to, ["owner@example.com"])
+        self.assertIn("Write report", message.body)
+        self.assertIn("Book room", message.body)
@@ -7,12 +7,15 @@ from tasks.serializers.task_serializer import TaskCSVSerializer, TaskSerializer
 
 
 class TestTaskSerializer(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.task = TaskFactory()
+
     def test_task_serializer_valid(self):
-        task = TaskFactory()
-        serializer = TaskSerializer(task)
+        serializer = TaskSerializer(self.task)
 
         self.assertIsNotNone(serializer.data["id"])
-        self.assertEqual(serializer.data["owner"], task.owner.username)
+        self.assertEqual(serializer.data["owner"], self.task.owner.username)
 
     def test_task_serializer_invalid_priority(self):
         payload = {
@@ -147,8 +150,7 @@ class TestTaskSerializer(TestCase):
         self.assertIn("priority", serializer.errors)
 
     def test_task_csv_serializer_fields(self):
-        task = TaskFactory()
-        serializer = TaskCSVSerializer(task)
+        serializer = TaskCSVSerializer(self.task)
         data = serializer.data
 
         expected = {
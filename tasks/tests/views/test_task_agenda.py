@@ -0,0 +1,103 @@
+import json
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.models import Task
+from tasks.serializers import TaskAgendaSerializer
+from tasks.views import TaskViewSet
+
+
+class TestTaskAgenda(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.first = TaskFactory(
+            owner=cls.user, status="in_progress", due_date=date(2030, 1, 1), priority=2
+        )
+        cls.second = TaskFactory(
+            owner=cls.user, status="pending", due_date=date(2030, 1, 2), priority=1
+        )
+        cls.urgent = TaskFactory(
+            owner=cls.user, status="pending", due_date=date(2030, 1, 1), priority=1
+        )
+        TaskFactory(owner=cls.user, status="completed", due_date=date(2029, 1, 1))
+        TaskFactory(owner=cls.user, status="pending", due_date=date(2029, 1, 1)).delete()
+        TaskFactory(status="pending", due_date=date(2029, 1, 1))  # of another user
+
+    def setUp(self):
+        cache.clear()
+
+    def call(self, method="get", action="agenda", data=None, **params):
+        factory = APIRequestFactory()
+        if method == "get":
+            request = factory.get("/tasks/agenda/", params)
+        else:
+            request = getattr(factory, method)("/tasks/", data, format="json")
+        force_authenticate(request, user=self.user)
+        response = TaskViewSet.as_view({method: action})(request)
+        # Cached agendas are served as already rendered responses
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def agenda(self, **params):
+        return json.loads(self.call(**params).content)
+
+    def test_open_tasks_by_due_date_then_priority(self):
+        agenda = self.agenda(limit=2)
+
+        self.assertEqual(
+            [item["id"] for item in agenda], [str(self.urgent.id), str(self.first.id)]
+        )
+        self.assertEqual(
+            set(agenda[0]), {"id", "title", "status", "priority", "due_date"}
+        )
+
+    def test_limit_is_validated(self):
+        for limit in ("0", "101", "ten"):
+            response = self.call(limit=limit)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("limit", response.data)
+
+    def test_agenda_is_cached_until_the_user_writes(self):
+        self.call()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.agenda()), 3)
+
+        self.call("post", "create", {"title": "New", "due_date": "2029-12-31"})
+
+        self.assertEqual(self.agenda()[0]["title"], "New")
+
+    def test_query_plan_is_a_top_k_scan_of_the_agenda_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.call(limit=5)
+        (query,) = queries.captured_queries
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE task")
+            # Test tables are small enough for a sequential scan to look cheaper
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            cursor.execute(f"EXPLAIN {query['sql']}")
+            plan = "\n".join(line for (line,) in cursor.fetchall())
+
+        # Whether it is an Index Only Scan depends on the visibility map, which
+        # VACUUM maintains and cannot run in the test transaction
+        self.assertRegex(plan, r"Index (Only )?Scan using task_agenda_idx")
+        self.assertNotIn("Sort", plan, plan)
+
+    def test_agenda_index_covers_the_agenda_columns(self):
+        (index,) = (i for i in Task._meta.indexes if i.name == "task_agenda_idx")
+        columns = {
+            Task._meta.get_field(name).attname
+            for name in TaskAgendaSerializer.Meta.fields
+        }
+
+        self.assertLessEqual(columns, {*index.fields, *index.include})
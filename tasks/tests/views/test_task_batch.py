@@ -0,0 +1,88 @@
+import uuid
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class TestTaskBatchRetrieve(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.tasks = TaskFactory.create_batch(3, owner=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def batch(self, ids=None, method="get", user=None, **params):
+        factory = APIRequestFactory()
+        if method == "post":
+            request = factory.post("/tasks/batch/", {"ids": ids}, format="json")
+        else:
+            if ids:
+                params["ids"] = ",".join(ids)
+            request = factory.get("/tasks/batch/", params)
+        force_authenticate(request, user=user or self.user)
+        return TaskViewSet.as_view({method: "batch"})(request)
+
+    def test_request_order_and_missing_ids(self):
+        other = TaskFactory()
+        unknown = str(uuid.uuid4())
+        ids = [str(self.tasks[2].id), unknown, str(self.tasks[0].id), str(other.id)]
+
+        response = self.batch(ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.data["items"]],
+            [str(self.tasks[2].id), str(self.tasks[0].id)],
+        )
+        self.assertEqual(
+            [str(pk) for pk in response.data["missing"]], [unknown, str(other.id)]
+        )
+
+    def test_hits_are_served_from_the_object_cache(self):
+        ids = [str(task.id) for task in self.tasks]
+        with self.assertNumQueries(1):
+            self.batch(ids[:2])
+
+        # Only the task that was not cached yet is queried
+        with self.assertNumQueries(1):
+            response = self.batch(ids)
+        self.assertEqual(len(response.data["items"]), 3)
+
+        with self.assertNumQueries(0):
+            response = self.batch(list(reversed(ids)), method="post")
+        self.assertEqual(
+            [item["id"] for item in response.data["items"]], list(reversed(ids))
+        )
+
+    def test_cached_objects_are_scoped_to_their_owner(self):
+        ids = [str(task.id) for task in self.tasks]
+        self.batch(ids)
+
+        response = self.batch(ids, user=UserFactory())
+        self.assertEqual(response.data["items"], [])
+        self.assertEqual(len(response.data["missing"]), 3)
+
+    def test_saves_invalidate_cached_objects(self):
+        task = self.tasks[0]
+        self.batch([str(task.id)])
+
+        task.title = "Renamed"
+        task.save()
+
+        response = self.batch([str(task.id)])
+        self.assertEqual(response.data["items"][0]["title"], "Renamed")
+
+    def test_sparse_fieldset(self):
+        response = self.batch([str(self.tasks[0].id)], fields="id,title")
+        self.assertEqual(set(response.data["items"][0]), {"id", "title"})
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.batch().status_code, 400)
+        self.assertEqual(self.batch(["not-a-uuid"]).status_code, 400)
@@ -0,0 +1,73 @@
+from datetime import date
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from jobs.models import Job
+from jobs.worker import run_next_job
+from tasks.cache import get_most_active_users, warm_user_task_cache
+from tasks.factories import TaskFactory
+from tasks.jobs import REFRESH_TASK_CACHE
+from tasks.views import TaskViewSet
+
+
+class TestTaskCacheWarming(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        TaskFactory.create_batch(3, owner=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, route, action):
+        request = APIRequestFactory().get(reverse(route), HTTP_ACCEPT_ENCODING="zstd")
+        force_authenticate(request, user=self.user)
+        return TaskViewSet.as_view({"get": action})(request)
+
+    def test_most_active_users(self):
+        busier = UserFactory()
+        TaskFactory.create_batch(5, owner=busier)
+        UserFactory()  # without tasks
+
+        self.assertEqual(get_most_active_users(10), [busier, self.user])
+        self.assertEqual(get_most_active_users(1), [busier])
+
+    def test_warmed_lists_are_served_without_queries(self):
+        self.assertEqual(warm_user_task_cache(self.user), 3)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get("task-list", "list").status_code, 200)
+            self.assertEqual(self.get("task-recent", "recent").status_code, 200)
+            self.assertEqual(self.get("task-agenda", "agenda").status_code, 200)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("warm_task_cache", "--workers=1", stdout=out)
+
+        self.assertIn("Warmed 3 task list(s) of 1 user(s)", out.getvalue())
+
+    @override_settings(TASK_CACHE_REFRESH_ON_WRITE=True)
+    def test_writes_schedule_one_refresh(self):
+        view = TaskViewSet.as_view({"post": "create"})
+        for title in ("First", "Second"):
+            request = APIRequestFactory().post(
+                reverse("task-list"),
+                {"title": title, "due_date": date.today().isoformat()},
+                format="json",
+            )
+            force_authenticate(request, user=self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(view(request).status_code, 201)
+
+        self.assertEqual(Job.objects.filter(kind=REFRESH_TASK_CACHE).count(), 1)
+        self.assertEqual(run_next_job().status, Job.STATUS_SUCCEEDED)
+
+        with self.assertNumQueries(0):
+            response = self.get("task-recent", "recent")
+        self.assertEqual(response["Content-Encoding"], "zstd")
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+
+class TestTaskFastPartialUpdate(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.task = TaskFactory(owner=cls.user, status="pending", priority=3)
+
+    def setUp(self):
+        cache.clear()
+
+    def call(self, method, action, data=None, task=None, user=None):
+        task = task or self.task
+        factory = APIRequestFactory()
+        if method == "get":
+            request = factory.get(f"/tasks/{task.id}/")
+        else:
+            request = getattr(factory, method)(f"/tasks/{task.id}/", data, format="json")
+        force_authenticate(request, user=user or self.user)
+        return TaskViewSet.as_view({method: action})(request, pk=str(task.id))
+
+    def patch(self, data, **kwargs):
+        return self.call("patch", "partial_update", data, **kwargs)
+
+    def test_single_update_returning_query(self):
+        # The UPDATE ... RETURNING, then the history and webhook outbox INSERTs
+        with self.assertNumQueries(3) as queries:
+            response = self.patch({"status": "completed", "priority": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries.captured_queries[0]["sql"].startswith("UPDATE"))
+        self.assertEqual(response.data["status"], "completed")
+        self.assertEqual(response.data["priority"], 1)
+        self.assertEqual(response.data["owner"], self.user.username)
+        self.assertEqual(response.data["title"], self.task.title)
+
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.status, self.task.priority), ("completed", 1))
+        self.assertGreater(self.task.updated_at, self.task.created_at)
+
+    def test_updated_object_is_written_through(self):
+        self.patch({"status": "in_progress"})
+
+        with self.assertNumQueries(0):
+            response = self.call("get", "retrieve")
+        self.assertEqual(response.data["status"], "in_progress")
+
+    def test_invalid_value_is_rejected_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.patch({"priority": 9})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("priority", response.data)
+
+    def test_tasks_of_other_users_are_not_found(self):
+        other_task = TaskFactory(status="pending")
+
+        response = self.patch({"status": "completed"}, task=other_task)
+
+        self.assertEqual(response.status_code, 404)
+        other_task.refresh_from_db()
+        self.assertEqual(other_task.status, "pending")
+
+    def test_other_fields_take_the_regular_path(self):
+        with self.assertNumQueries(4):
+            response = self.patch({"status": "completed", "title": "Renamed"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            Task.objects.values_list("title", "status").get(pk=self.task.pk),
+            ("Renamed", "completed"),
+        )
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class TestTaskHistoryEndpoint(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.task = TaskFactory(owner=cls.user, status="pending", priority=3)
+
+    def setUp(self):
+        cache.clear()
+
+    def call(self, method, action, data=None, user=None, **params):
+        factory = APIRequestFactory()
+        path = f"/tasks/{self.task.id}/"
+        if method == "get":
+            request = factory.get(path, params)
+        else:
+            request = getattr(factory, method)(path, data, format="json")
+        force_authenticate(request, user=user or self.user)
+        return TaskViewSet.as_view({method: action})(request, pk=str(self.task.id))
+
+    def test_changes_are_listed_newest_first_with_their_actor(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.call("patch", "partial_update", {"status": "in_progress"})
+            self.call("patch", "partial_update", {"status": "completed", "priority": 1})
+            self.call("patch", "partial_update", {"title": "Not watched"})
+
+        with self.assertNumQueries(3):
+            response = self.call("get", "history")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["paging"]["total_elements"], 2)
+        self.assertEqual(
+            [item["changes"] for item in response.data["items"]],
+            [
+                {"status": ["in_progress", "completed"], "priority": [3, 1]},
+                {"status": ["pending", "in_progress"]},
+            ],
+        )
+        self.assertEqual(response.data["items"][0]["actor"], self.user.username)
+
+    def test_history_is_paginated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for priority in (1, 2, 3):
+                self.call("patch", "partial_update", {"priority": priority})
+
+        response = self.call("get", "history", size=2, page=2)
+
+        self.assertEqual(response.data["paging"]["total_pages"], 2)
+        self.assertEqual(response.data["items"][0]["changes"], {"priority": [3, 1]})
+
+    def test_tasks_of_other_users_are_not_found(self):
+        response = self.call("get", "history", user=UserFactory())
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,196 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from core.idempotency import (
+    IDEMPOTENCY_CLAIM_MARGIN,
+    get_idempotency_cache_key,
+    get_request_fingerprint,
+)
+from tasks.factories import TaskFactory
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+CSV_BODY = b"title,description,priority,status,due_date\nImported,,2,pending,2030-01-01\n"
+
+
+class TestTaskIdempotencyKey(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.other_user = UserFactory()
+
+    def setUp(self):
+        cache.clear()
+
+    def create(self, key="create-1", user=None, title="New Task"):
+        payload = {
+            "title": title,
+            "priority": 3,
+            "status": "pending",
+            "due_date": str(date.today() + timedelta(days=1)),
+        }
+        headers = {} if key is None else {"Idempotency-Key": key}
+        request = APIRequestFactory().post(
+            "/tasks/", payload, format="json", headers=headers
+        )
+        force_authenticate(request, user=user or self.user)
+        return TaskViewSet.as_view({"post": "create"})(request)
+
+    def test_retry_replays_the_stored_response_without_queries(self):
+        first = self.create()
+        self.assertEqual(first.status_code, 201)
+
+        with self.assertNumQueries(0):
+            retry = self.create()
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Content-Type"], first["Content-Type"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        self.create(key=None)
+        self.create(key=None)
+
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 2)
+
+    def test_keys_are_scoped_to_the_user(self):
+        self.create()
+        response = self.create(user=self.other_user)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Task.objects.filter(owner=self.other_user).count(), 1)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.create()
+        response = self.create(title="Other Task")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data["detail"].code, "idempotency_key_mismatch")
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    def test_invalid_key_is_rejected(self):
+        response = self.create(key="x" * 256)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Idempotency-Key", response.data)
+
+    @override_settings(REQUEST_TIMEOUT=30)
+    def test_claim_is_held_for_the_request_timeout(self):
+        with mock.patch("core.idempotency.cache.add", wraps=cache.add) as add:
+            self.create()
+
+        claim = add.call_args_list[0]
+        self.assertEqual(
+            claim.args[0], get_idempotency_cache_key(self.user.pk, "create-1")
+        )
+        self.assertEqual(claim.kwargs["timeout"], 30 + IDEMPOTENCY_CLAIM_MARGIN)
+
+    def test_request_in_progress_gets_a_conflict(self):
+        request = APIRequestFactory().post(
+            "/tasks/",
+            {
+                "title": "New Task",
+                "priority": 3,
+                "status": "pending",
+                "due_date": str(date.today() + timedelta(days=1)),
+            },
+            format="json",
+        )
+        request = Request(request, parsers=[JSONParser()])
+        cache.add(
+            get_idempotency_cache_key(self.user.pk, "create-1"),
+            {"fingerprint": get_request_fingerprint(request), "status": None},
+        )
+
+        with mock.patch("core.idempotency.cache.get", wraps=cache.get) as get:
+            response = self.create()
+
+        # Answered at once, without waiting for the request holding the key
+        get.assert_called_once()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(Task.objects.filter(owner=self.user).exists())
+
+    def test_client_errors_are_replayed(self):
+        self.create(title="")
+
+        with self.assertNumQueries(0):
+            response = self.create(title="")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+
+    def test_failed_request_releases_the_key(self):
+        with (
+            mock.patch.object(
+                TaskViewSet, "perform_create", side_effect=RuntimeError("boom")
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            self.create()
+
+        response = self.create()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    def test_bulk_import_is_run_once(self):
+        def bulk_import(body=CSV_BODY):
+            request = APIRequestFactory().post(
+                "/tasks/bulk-import/",
+                body,
+                content_type="text/csv",
+                headers={"Idempotency-Key": "import-1"},
+            )
+            force_authenticate(request, user=self.user)
+            return TaskViewSet.as_view({"post": "bulk_import"})(request)
+
+        first = bulk_import()
+        retry = bulk_import()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data["created"], 1)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+        # The streamed body is part of the fingerprint
+        self.assertEqual(bulk_import(CSV_BODY.replace(b"2,", b"3,")).status_code, 422)
+
+    def test_uploads_are_part_of_the_fingerprint(self):
+        def bulk_import(body):
+            request = APIRequestFactory().post(
+                "/tasks/bulk-import/",
+                {"file": SimpleUploadedFile("tasks.csv", body, "text/csv")},
+                format="multipart",
+                headers={"Idempotency-Key": "import-1"},
+            )
+            force_authenticate(request, user=self.user)
+            return TaskViewSet.as_view({"post": "bulk_import"})(request)
+
+        self.assertEqual(bulk_import(CSV_BODY).data["created"], 1)
+        self.assertEqual(bulk_import(CSV_BODY)["Idempotent-Replayed"], "true")
+        self.assertEqual(bulk_import(CSV_BODY.replace(b"2,", b"3,")).status_code, 422)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+    def test_safe_requests_ignore_the_key(self):
+        task = TaskFactory(owner=self.user)
+        request = APIRequestFactory().get(
+            f"/tasks/{task.id}/", headers={"Idempotency-Key": "get-1"}
+        )
+        force_authenticate(request, user=self.user)
+
+        response = TaskViewSet.as_view({"get": "retrieve"})(request, pk=str(task.id))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(get_idempotency_cache_key(self.user.pk, "get-1")))
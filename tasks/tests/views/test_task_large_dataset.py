@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.constants import MAX_BATCH_IDS, MAX_ROWS_TO_DOWNLOAD
+from tasks.benchmarks import get_large_dataset_owner
+from tasks.models import Task
+from tasks.views import TaskViewSet
+
+
+class TestTaskLargeDataset(TestCase):
+    """
+    Hot endpoints on an owner with tens of thousands of tasks, within the query
+    budgets of TaskViewSet. Seeded once per class, or already in the database when
+    it is cloned from the build_test_db_template template.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = get_large_dataset_owner()
+        cls.total = Task.objects.filter(owner=cls.owner).count()
+        cls.ids = [
+            str(pk)
+            for pk in Task.objects.filter(owner=cls.owner).values_list("pk", flat=True)[
+                :MAX_BATCH_IDS
+            ]
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, action, params=None):
+        request = APIRequestFactory().get(url, params)
+        force_authenticate(request, user=self.owner)
+        response = TaskViewSet.as_view({"get": action})(request)
+        response.render()
+        return response
+
+    def test_list_paginates_in_sql(self):
+        response = self.get("/tasks/", "list", {"size": 100})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["items"]), 100)
+        self.assertEqual(response.data["paging"]["total_elements"], self.total)
+
+    def test_csv_download_is_capped(self):
+        response = self.get("/tasks/", "list", {"format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        # Header line and a trailing newline
+        self.assertEqual(
+            response.content.count(b"\r\n"), min(self.total, MAX_ROWS_TO_DOWNLOAD) + 1
+        )
+
+    def test_batch_retrieve_of_max_ids(self):
+        response = self.get("/tasks/batch/", "batch", {"ids": ",".join(self.ids)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.data["items"]], self.ids)
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class ObjectCachedTaskViewSet(TaskViewSet):
+    # Leave the rendered response cache out, hits must come from object entries
+    cache_enabled = False
+
+
+class TestTaskObjectCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.task, cls.other_task = TaskFactory.create_batch(2, owner=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def call(self, method, action, task, data=None, user=None, **params):
+        factory = APIRequestFactory()
+        if method == "get":
+            request = factory.get(f"/tasks/{task.id}/", params)
+        else:
+            request = getattr(factory, method)(f"/tasks/{task.id}/", data, format="json")
+        force_authenticate(request, user=user or self.user)
+        return ObjectCachedTaskViewSet.as_view({method: action})(request, pk=str(task.id))
+
+    def retrieve(self, task, **kwargs):
+        return self.call("get", "retrieve", task, **kwargs)
+
+    def test_retrieve_is_served_from_the_object_cache(self):
+        self.retrieve(self.task)
+
+        with self.assertNumQueries(0):
+            response = self.retrieve(self.task)
+        self.assertEqual(response.data["title"], self.task.title)
+
+        with self.assertNumQueries(0):
+            response = self.retrieve(self.task, fields="id,title")
+        self.assertEqual(set(response.data), {"id", "title"})
+
+    def test_update_writes_through(self):
+        self.retrieve(self.task)
+        self.retrieve(self.other_task)
+
+        response = self.call("patch", "partial_update", self.task, {"title": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+
+        # The updated task is refreshed and the unrelated one is kept
+        with self.assertNumQueries(0):
+            self.assertEqual(self.retrieve(self.task).data["title"], "Renamed")
+            self.assertEqual(
+                self.retrieve(self.other_task).data["title"], self.other_task.title
+            )
+
+    def test_destroy_drops_the_entry(self):
+        self.retrieve(self.task)
+
+        self.assertEqual(self.call("delete", "destroy", self.task).status_code, 204)
+        # Deletes are soft, the task is read again with its new state
+        with self.assertNumQueries(1):
+            self.assertTrue(self.retrieve(self.task).data["deleted"])
+
+    def test_entries_are_scoped_to_their_owner(self):
+        self.retrieve(self.task)
+
+        self.assertEqual(self.retrieve(self.task, user=UserFactory()).status_code, 404)
@@ -0,0 +1,132 @@
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import zstandard
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class CachedTaskViewSet(TaskViewSet):
+    cache_enabled = True
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class TestPrecompressedResponseCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        TaskFactory.create_batch(5, owner=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url="/tasks/", **headers):
+        request = APIRequestFactory().get(url, **headers)
+        force_authenticate(request, user=self.user)
+        response = CachedTaskViewSet.as_view({"get": "list"})(request)
+        # Cache hits are plain HttpResponses that are already rendered
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def test_hit_serves_stored_compressed_bytes(self):
+        miss = self.get(HTTP_ACCEPT_ENCODING="zstd")
+        self.assertEqual(miss["Content-Encoding"], "zstd")
+
+        with self.assertNumQueries(0):
+            hit = self.get(HTTP_ACCEPT_ENCODING="zstd")
+        self.assertEqual(hit["Content-Encoding"], "zstd")
+        self.assertEqual(hit.content, miss.content)
+        decompressed = (
+            zstandard.ZstdDecompressor().decompressobj().decompress(hit.content)
+        )
+        self.assertIn(b'"items"', decompressed)
+
+    def test_entries_are_per_encoding_and_format(self):
+        compressed = self.get(HTTP_ACCEPT_ENCODING="gzip")
+        plain = self.get()
+        csv = self.get("/tasks/?format=csv")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertIn(b'"items"', plain.content)
+        self.assertTrue(csv["Content-Type"].startswith("text/csv"))
+
+
+class ResponseCachedTaskViewSet(CachedTaskViewSet):
+    response_cache_enabled = True
+
+
+class TestResponseCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.task = TaskFactory(owner=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, method, url, action, data=None, **headers):
+        request = getattr(APIRequestFactory(), method)(url, data, **headers)
+        force_authenticate(request, user=self.user)
+        view = ResponseCachedTaskViewSet.as_view({method: action})
+        if action == "retrieve":
+            response = view(request, pk=self.task.pk)
+        else:
+            response = view(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def test_hit_skips_permissions_and_handler(self):
+        miss = self.request("get", "/tasks/?format=csv", "list")
+
+        with (
+            self.assertNumQueries(0),
+            patch.object(ResponseCachedTaskViewSet, "check_permissions") as permissions,
+            patch.object(ResponseCachedTaskViewSet, "filter_queryset") as queryset,
+        ):
+            hit = self.request("get", "/tasks/?format=csv", "list")
+        permissions.assert_not_called()
+        queryset.assert_not_called()
+
+        self.assertEqual(hit.content, miss.content)
+        for header in ("Content-Type", "Vary"):
+            self.assertEqual(hit[header], miss[header])
+
+    def test_hit_gets_a_filename_of_its_own(self):
+        responses = []
+        for day in (1, 2):
+            now = datetime(2030, 1, day, 9, tzinfo=timezone.utc)
+            with patch("core.views.timezone.now", return_value=now):
+                responses.append(self.request("get", "/tasks/?format=csv", "list"))
+        miss, hit = responses
+
+        self.assertEqual(hit.content, miss.content)
+        self.assertIn("tasks_2030-01-01_09_00_00.csv", miss["Content-Disposition"])
+        self.assertIn("tasks_2030-01-02_09_00_00.csv", hit["Content-Disposition"])
+
+    def test_retrieve_hit(self):
+        miss = self.request("get", f"/tasks/{self.task.pk}/", "retrieve")
+        with self.assertNumQueries(0):
+            hit = self.request("get", f"/tasks/{self.task.pk}/", "retrieve")
+        self.assertEqual(hit.content, miss.content)
+
+    def test_writes_invalidate_responses(self):
+        self.request("get", "/tasks/", "list")
+        created = self.request(
+            "post",
+            "/tasks/",
+            "create",
+            {"title": "New", "priority": 1, "due_date": date.today().isoformat()},
+            format="json",
+        )
+        self.assertEqual(created.status_code, 201)
+
+        response = self.request("get", "/tasks/", "list")
+        self.assertIn(b"New", response.content)
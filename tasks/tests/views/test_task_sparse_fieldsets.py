@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+
+
+class TestTaskSparseFieldsets(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.task = TaskFactory(owner=cls.user)
+
+    def get(self, url, actions=None, **kwargs):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=self.user)
+        return TaskViewSet.as_view(actions or {"get": "list"})(request, **kwargs)
+
+    def test_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/tasks/?fields=id,title,status")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["items"][0]), {"id", "title", "status"})
+        self.assertNotIn('"description"', queries[-1]["sql"])
+
+    def test_retrieve_exclude(self):
+        response = self.get(
+            f"/tasks/{self.task.id}/?exclude=description",
+            actions={"get": "retrieve"},
+            pk=self.task.id,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("description", response.data)
+        self.assertEqual(response.data["owner"], self.user.username)
+
+    def test_unknown_field(self):
+        response = self.get("/tasks/?fields=id,secret")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", str(response.data["fields"]))
+
+    def test_cache_key_ignores_field_order(self):
+        view = TaskViewSet()
+
+        def cache_key(url):
+            request = Request(APIRequestFactory().get(url))
+            request.user = self.user
+            return view.get_cache_key(request)
+
+        self.assertEqual(
+            cache_key("/tasks/?fields=title,id"), cache_key("/tasks/?fields=id,title")
+        )
+        self.assertNotEqual(cache_key("/tasks/?fields=id"), cache_key("/tasks/"))
+
+    def test_schema_documents_parameters(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        parameters = {
+            parameter["name"]
+            for parameter in schema["paths"]["/api/tasks/"]["get"]["parameters"]
+        }
+        self.assertTrue({"fields", "exclude"} <= parameters)
@@ -1,5 +1,8 @@
+import io
 from datetime import date, timedelta
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from django.test import TestCase
 from rest_framework.test import APIRequestFactory, force_authenticate
 
@@ -53,7 +56,7 @@ class TestTaskViewSet(TestCase):
         response = TaskViewSet.as_view({"post": "create"})(request)
         self.assertEqual(response.status_code, 201)
 
-        task = Task.objects.first()
+        task = Task.objects.get(owner=user)
         self.assertEqual(task.owner, user)
         self.assertEqual(task.title, "New Task")
 
@@ -87,8 +90,8 @@ class TestTaskViewSet(TestCase):
 
         response = TaskViewSet.as_view({"delete": "destroy"})(request, pk=task.id)
         self.assertEqual(response.status_code, 204)
-        self.assertEqual(Task.objects.active().count(), 0)
-        self.assertEqual(Task.objects.count(), 1)  # still exists in DB
+        self.assertEqual(Task.objects.filter(owner=user).active().count(), 0)
+        self.assertEqual(Task.objects.filter(owner=user).count(), 1)  # still exists in DB
 
     def test_tasks_list_filter_priority(self):
         user = UserFactory()
@@ -113,3 +116,54 @@ class TestTaskViewSet(TestCase):
         response = TaskViewSet.as_view({"get": "list"})(request)
         self.assertEqual(response.status_code, 200)
         self.assertIn("attachment; filename=", response["Content-Disposition"])
+        self.assertIn(user.username, response.rendered_content.decode())
+
+    def test_tasks_list_resolves_owners_without_queries(self):
+        """Owners come from the request identity map, whatever the number of rows."""
+        user = UserFactory()
+        TaskFactory.create_batch(5, owner=user)
+
+        request = APIRequestFactory().get("/tasks/")
+        force_authenticate(request, user=user)
+
+        # only the count and the page of tasks
+        with self.assertNumQueries(2):
+            response = TaskViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(
+            {item["owner"] for item in response.data["items"]}, {user.username}
+        )
+
+    def test_tasks_list_parquet_renderer(self):
+        user = UserFactory()
+        TaskFactory.create_batch(3, owner=user, priority=3)
+        TaskFactory(owner=user, priority=1)
+
+        request = APIRequestFactory().get("/tasks/?format=parquet&max_priority=1")
+        force_authenticate(request, user=user)
+
+        response = TaskViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(".parquet", response["Content-Disposition"])
+
+        table = pq.read_table(io.BytesIO(response.rendered_content))
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.schema.field("id").type, pa.uuid())
+        self.assertEqual(table.schema.field("priority").type, pa.int16())
+        self.assertEqual(table.schema.field("due_date").type, pa.date32())
+        self.assertEqual(table.schema.field("created_at").type, pa.timestamp("us", "UTC"))
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("status").type))
+        self.assertEqual(table.column("owner").to_pylist(), [user.username])
+
+    def test_tasks_list_arrow_renderer(self):
+        user = UserFactory()
+        TaskFactory.create_batch(2, owner=user)
+
+        request = APIRequestFactory().get("/tasks/?format=arrow")
+        force_authenticate(request, user=user)
+
+        response = TaskViewSet.as_view({"get": "list"})(request)
+        self.assertEqual(response.status_code, 200)
+
+        table = pa.ipc.open_stream(response.rendered_content).read_all()
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column_names, list(TaskViewSet.columnar_fields.keys()))
@@ -1,9 +1,15 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from core.events import event_stream
 from tasks.views import TaskViewSet
 
 router = DefaultRouter()
 router.register("tasks", TaskViewSet, basename="task")
 router.register("tasks/recent", TaskViewSet, basename="recent-tasks")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # Before the router, whose detail route would take "events" for a pk
+    path("tasks/events/", event_stream, name="task-events"),
+    *router.urls,
+]
@@ -1,16 +1,36 @@
 from django.conf import settings
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework_csv.renderers import CSVRenderer
 
-from core.decorators import cache_api_call
-from core.views import BaseMixin, BaseModelViewSet
+from core.importers import IMPORT_FORMATS, detect_import_format
+from core.renderers import ArrowIPCRenderer, ParquetRenderer
+from core.schema import OpenApiParameter, OpenApiTypes, extend_schema
+from core.views import SPARSE_FIELDSET_PARAMETERS, BaseMixin, BaseModelViewSet
+from jobs.queue import enqueue_job
+from jobs.serializers import JobSerializer
 from tasks.filters import TaskFilterSet
-from tasks.models import Task
-from tasks.serializers import TaskCSVSerializer, TaskSerializer
+from tasks.importers import TaskImporter
+from tasks.jobs import (
+    EXPORT_TASKS_CSV,
+    IMPORT_TASKS_CSV,
+    schedule_task_cache_refresh,
+)
+from tasks.models import OPEN_TASKS, Task
+from tasks.serializers import (
+    TaskAgendaSerializer,
+    TaskCSVSerializer,
+    TaskHistorySerializer,
+    TaskSerializer,
+)
+from webhooks.outbox import add_outbox_event
 
 
 class TaskViewSet(BaseMixin, BaseModelViewSet):
@@ -19,28 +39,225 @@ class TaskViewSet(BaseMixin, BaseModelViewSet):
     """
 
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    renderer_classes = [JSONRenderer, CSVRenderer]
+    renderer_classes = [JSONRenderer, CSVRenderer, ParquetRenderer, ArrowIPCRenderer]
     serializer_class = TaskSerializer
     csv_serializer_class = TaskCSVSerializer
+    history_serializer_class = TaskHistorySerializer
+    columnar_fields = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "priority": "priority",
+        "due_date": "due_date",
+        "status": "status",
+        "owner": "owner__username",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
     filterset_class = TaskFilterSet
     ordering_fields = ["created_at", "due_date", "priority"]
     ordering = ["-created_at"]
-    cache_enabled = False
+    cache_enabled = True
+    object_cache_enabled = True
+    # The most common writes, e.g. moving a task to another status
+    fast_update_fields = frozenset({"status", "priority"})
+    # One more than the action needs, for the user lookup of a cold auth cache
+    max_queries_per_request = {
+        "list": 3,
+        "retrieve": 2,
+        "recent": 2,
+        "agenda": 2,
+        "batch": 2,
+        # Writes include the webhook outbox INSERT
+        "create": 4,
+        "update": 5,
+        "partial_update": 5,
+        "history": 4,
+        "destroy": 4,
+        "export_csv": 2,
+        "import_csv": 2,
+    }
+    throttle_costs = {"batch": 5, "export_csv": 10, "import_csv": 10, "bulk_import": 20}
     cache_key_prefix = "task"
+    event_type_prefix = "task"
     file_name_prefix = "tasks"
 
     def get_queryset(self):
         return Task.objects.filter(owner=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        with transaction.atomic(savepoint=False):
+            instance = serializer.save(owner=self.request.user)
+            self.publish_change_event("created", instance)
+        self.invalidate_cache(self.request)
+        return instance
+
+    def publish_change_event(self, change, instance, data=None):
+        data = super().publish_change_event(change, instance, data)
+        add_outbox_event(
+            self.request.user.pk, f"task.{change}", data, object_id=instance.pk
+        )
+        return data
+
+    def invalidate_cache(self, request):
+        super().invalidate_cache(request)
+        if settings.TASK_CACHE_REFRESH_ON_WRITE:
+            schedule_task_cache_refresh(request.user)
 
     @action(detail=False, methods=["get"])
-    @cache_api_call("user_id")
     def recent(self, request):
         """Cached endpoint for recent tasks"""
-        queryset = self.get_queryset().order_by("-created_at")[
-            : settings.RECENT_TASKS_COUNT
-        ]
-        data = TaskSerializer(queryset, many=True).data
+        rendered = self.get_rendered_from_cache(request)
+        if rendered is not None:
+            return rendered
+
+        data = self.get_from_cache(request)
+        if data is None:
+            queryset = self.get_queryset().order_by("-created_at")[
+                : settings.RECENT_TASKS_COUNT
+            ]
+            data = self.serialize_data(queryset, many=True)
+            self.set_to_cache(request, data)
         return Response(data)
+
+    def get_agenda_limit(self, request) -> int:
+        """
+        `?limit=` of the agenda
+        :raises: ValidationError if it is not between 1 and TASK_AGENDA_MAX_LIMIT
+        """
+        limit = request.query_params.get("limit", settings.TASK_AGENDA_DEFAULT_LIMIT)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= settings.TASK_AGENDA_MAX_LIMIT:
+            raise ValidationError(
+                {"limit": f"Must be between 1 and {settings.TASK_AGENDA_MAX_LIMIT}."}
+            )
+        return limit
+
+    def get_agenda_queryset(self, limit):
+        """Next open tasks of the user, answered by an index-only scan of task_agenda_idx."""
+        return (
+            Task.objects.filter(OPEN_TASKS, owner=self.request.user)
+            .order_by("due_date", "priority")
+            .only(*TaskAgendaSerializer.Meta.fields)[:limit]
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description="Number of tasks, 10 by default and at most 100.",
+            )
+        ],
+        responses=TaskAgendaSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"], renderer_classes=[JSONRenderer])
+    def agenda(self, request):
+        """Next tasks to do, not completed, ordered by due date then priority."""
+        limit = self.get_agenda_limit(request)
+        rendered = self.get_rendered_from_cache(request)
+        if rendered is not None:
+            return rendered
+
+        data = self.get_from_cache(request)
+        if data is None:
+            data = self.serialize_data(
+                self.get_agenda_queryset(limit),
+                many=True,
+                serializer_class=TaskAgendaSerializer,
+            )
+            self.set_to_cache(request, data)
+        return Response(data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                OpenApiTypes.STR,
+                description="Comma separated task ids, or an `ids` list in the POST body.",
+            ),
+            *SPARSE_FIELDSET_PARAMETERS,
+        ]
+    )
+    @action(detail=False, methods=["get", "post"], renderer_classes=[JSONRenderer])
+    def batch(self, request):
+        """Tasks of a list of ids in request order, with the ids that were not found."""
+        return self.batch_retrieve(request)
+
+    @action(detail=True, methods=["get"], renderer_classes=[JSONRenderer])
+    def history(self, request, pk=None):
+        """Changes of the status, priority and due date of the task, newest first."""
+        return self.list_history(request)
+
+    # ---------------------------------------------------------
+    #                  BACKGROUND JOBS
+    # ---------------------------------------------------------
+
+    def job_accepted_response(self, job):
+        data = JobSerializer(job, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["post"], url_path="export")
+    def export_csv(self, request):
+        """Enqueue a full CSV export of the filtered tasks and return the job to poll."""
+        filters = request.query_params.dict()
+        for param in ("format", "page", "size"):
+            filters.pop(param, None)
+        job = enqueue_job(
+            EXPORT_TASKS_CSV, owner=request.user, params={"filters": filters}
+        )
+        return self.job_accepted_response(job)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_csv(self, request):
+        """Enqueue a bulk import of the uploaded CSV file and return the job to poll."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "A CSV file is required."})
+        job = enqueue_job(IMPORT_TASKS_CSV, owner=request.user, input_file=upload)
+        return self.job_accepted_response(job)
+
+    # ---------------------------------------------------------
+    #                   STREAMING IMPORT
+    # ---------------------------------------------------------
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-import",
+        renderer_classes=[JSONRenderer],
+    )
+    def bulk_import(self, request):
+        """
+        Synchronously import tasks from CSV or NDJSON and return the error report.
+
+        Accepts a multipart upload in the `file` field, or the raw file as the
+        request body (`text/csv` or `application/x-ndjson`), which is parsed
+        straight from the request stream. `?input_format=` overrides detection.
+        """
+        if request.content_type.startswith("multipart/"):
+            upload = request.FILES.get("file")
+            if upload is None:
+                raise ValidationError({"file": "A CSV or NDJSON file is required."})
+            lines = upload
+            fmt = detect_import_format(upload.name, upload.content_type)
+        else:
+            lines = self.get_request_stream(request) or []
+            fmt = detect_import_format(content_type=request.content_type)
+
+        fmt = request.query_params.get("input_format", fmt)
+        if fmt not in IMPORT_FORMATS:
+            raise ValidationError({"input_format": f"Must be one of {IMPORT_FORMATS}."})
+
+        report = TaskImporter(owner=request.user).run(lines, fmt)
+        if report["created"]:
+            self.invalidate_cache(request)
+        return Response(report)
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import WebhookDelivery, WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ("url", "owner", "is_active", "created_at")
+    list_filter = ("is_active",)
+    raw_id_fields = ("owner",)
+    readonly_fields = ("id", "created_at", "updated_at")
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    """Failed and dead-lettered deliveries, delivered ones are deleted."""
+
+    list_display = ("endpoint", "status", "attempts", "next_attempt_at", "last_error")
+    list_filter = ("status",)
+    raw_id_fields = ("endpoint",)
+    readonly_fields = ("events", "created_at")
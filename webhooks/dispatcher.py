@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+from datetime import timedelta
+
+import httpx
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from webhooks.models import OutboxEvent, WebhookDelivery, WebhookEndpoint
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+DELIVERY_HEADER = "X-Webhook-Delivery"
+# Key of the Postgres advisory lock taken while outbox events are fanned out
+FAN_OUT_LOCK_ID = 0x776562686F6F6B  # "webhook"
+
+
+def fan_out_outbox_events(batch_size=None) -> int:
+    """
+    Turn the oldest outbox events into one delivery per endpoint, and delete
+    them. Events of the same object are coalesced into the latest one, which
+    carries its current state. Returns the number of events taken.
+
+    Dispatchers fan out one at a time, under an advisory lock: deliveries of
+    an endpoint are sent in the order of their pk, which then follows the
+    order of the events. Batches fanned out concurrently could commit in
+    either order, and older states of objects be delivered after newer ones.
+    """
+    batch_size = batch_size or settings.WEBHOOKS_BATCH_SIZE
+    with transaction.atomic():
+        # Released with the transaction, once the deliveries are committed
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [FAN_OUT_LOCK_ID])
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True).order_by("id")[
+                :batch_size
+            ]
+        )
+        if not events:
+            return 0
+
+        endpoints = WebhookEndpoint.objects.active().filter(
+            owner_id__in={event.owner_id for event in events}, is_active=True
+        )
+        deliveries = []
+        for endpoint in endpoints:
+            latest = {}
+            for event in events:
+                if event.owner_id == endpoint.owner_id and endpoint.accepts(
+                    event.event_type
+                ):
+                    # Moved to the end: the batch keeps the order of the changes
+                    key = event.object_id or event.pk
+                    latest.pop(key, None)
+                    latest[key] = event
+            if latest:
+                deliveries.append(
+                    WebhookDelivery(
+                        endpoint=endpoint,
+                        events=[event.to_payload() for event in latest.values()],
+                    )
+                )
+        WebhookDelivery.objects.bulk_create(deliveries)
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+    return len(events)
+
+
+def claim_due_deliveries(limit=None) -> list:
+    """
+    Lease the pending deliveries due for an attempt: they are not due again
+    until the attempt has had time to time out, so a crashed dispatcher only
+    delays them.
+
+    Only the oldest pending delivery of an endpoint is taken, later ones wait
+    until it is delivered or dead-lettered. Batches carry the latest state of
+    objects, so a retried batch arriving after a newer one would roll the
+    subscriber back.
+    """
+    limit = limit or settings.WEBHOOKS_CONCURRENCY
+    now = timezone.now()
+    earlier = WebhookDelivery.objects.filter(
+        endpoint=OuterRef("endpoint"),
+        status=WebhookDelivery.STATUS_PENDING,
+        pk__lt=OuterRef("pk"),
+    )
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("endpoint")
+            .filter(
+                status=WebhookDelivery.STATUS_PENDING,
+                next_attempt_at__lte=now,
+                endpoint__is_active=True,
+                endpoint__deleted=False,
+            )
+            .exclude(Exists(earlier))
+            .order_by("next_attempt_at")[:limit]
+        )
+        if deliveries:
+            WebhookDelivery.objects.filter(
+                pk__in=[delivery.pk for delivery in deliveries]
+            ).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=settings.WEBHOOKS_TIMEOUT * 2),
+            )
+    for delivery in deliveries:
+        delivery.attempts += 1
+    return deliveries
+
+
+def get_signature(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def get_retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, so failed batches don't retry in step."""
+    delay = min(
+        settings.WEBHOOKS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.WEBHOOKS_MAX_RETRY_DELAY,
+    )
+    return delay * random.uniform(0.5, 1)  # noqa: S311
+
+
+async def post_delivery(client, semaphore, delivery) -> str | None:
+    """POST the events of the delivery, return the error or None when delivered."""
+    body = json.dumps(
+        {"delivery_id": delivery.pk, "events": delivery.events}, cls=DjangoJSONEncoder
+    ).encode()
+    headers = {
+        "Content-Type": "application/json",
+        DELIVERY_HEADER: str(delivery.pk),
+        SIGNATURE_HEADER: get_signature(delivery.endpoint.secret, body),
+    }
+    async with semaphore:
+        try:
+            response = await client.post(
+                delivery.endpoint.url, content=body, headers=headers
+            )
+        except httpx.HTTPError as e:
+            return f"{e.__class__.__name__}: {e}"
+    if not response.is_success:
+        return f"HTTP {response.status_code}"
+    return None
+
+
+async def post_deliveries(deliveries) -> list:
+    """POST the deliveries concurrently, return their errors in the same order."""
+    semaphore = asyncio.Semaphore(settings.WEBHOOKS_CONCURRENCY)
+    async with httpx.AsyncClient(
+        timeout=settings.WEBHOOKS_TIMEOUT, follow_redirects=False
+    ) as client:
+        return await asyncio.gather(
+            *(post_delivery(client, semaphore, delivery) for delivery in deliveries)
+        )
+
+
+def record_attempts(deliveries, errors) -> dict:
+    """Delete the delivered batches, schedule a retry or dead-letter the others."""
+    now = timezone.now()
+    delivered, failed = [], []
+    for delivery, error in zip(deliveries, errors, strict=True):
+        if error is None:
+            delivered.append(delivery.pk)
+            continue
+        logger.warning(
+            f"Webhook delivery {delivery.pk} to {delivery.endpoint.url} failed "
+            f"(attempt {delivery.attempts}): {error}"
+        )
+        delivery.last_error = error
+        if delivery.attempts >= settings.WEBHOOKS_MAX_ATTEMPTS:
+            delivery.status = WebhookDelivery.STATUS_DEAD
+        else:
+            delivery.next_attempt_at = now + timedelta(
+                seconds=get_retry_delay(delivery.attempts)
+            )
+        failed.append(delivery)
+
+    if delivered:
+        WebhookDelivery.objects.filter(pk__in=delivered).delete()
+    if failed:
+        WebhookDelivery.objects.bulk_update(
+            failed, ["status", "next_attempt_at", "last_error"]
+        )
+    return {
+        "delivered": len(delivered),
+        "failed": len(failed),
+        "dead": sum(
+            delivery.status == WebhookDelivery.STATUS_DEAD for delivery in failed
+        ),
+    }
+
+
+def dispatch_once(batch_size=None) -> dict:
+    """Fan out a batch of outbox events, then attempt the due deliveries."""
+    stats = {"events": fan_out_outbox_events(batch_size)}
+    deliveries = claim_due_deliveries()
+    errors = asyncio.run(post_deliveries(deliveries)) if deliveries else []
+    stats.update(record_attempts(deliveries, errors))
+    return stats
+
+
+def run_dispatcher(poll_interval=1.0, burst=False, batch_size=None) -> dict:
+    """
+    Dispatch webhooks until stopped, sleeping `poll_interval` seconds when
+    there was nothing to do. With `burst`, exit once there is nothing left.
+    Returns the totals.
+    """
+    totals = {"events": 0, "delivered": 0, "failed": 0, "dead": 0}
+    while True:
+        stats = dispatch_once(batch_size)
+        for name, count in stats.items():
+            totals[name] += count
+        if stats["events"] or stats["delivered"] or stats["failed"]:
+            continue
+        if burst:
+            break
+        # Drop broken or expired connections while idle, like jobs.worker does
+        close_old_connections()
+        time.sleep(poll_interval)
+    return totals
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from webhooks.dispatcher import run_dispatcher
+
+
+class Command(BaseCommand):
+    help = "Deliver the events of the outbox to the webhook endpoints of their owner."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.WEBHOOKS_BATCH_SIZE,
+            help="Outbox events taken per transaction.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.WEBHOOKS_POLL_INTERVAL,
+            help="Seconds to wait before polling an empty outbox again.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once nothing is left to deliver instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Dispatching webhooks, polling every {options['poll_interval']}s"
+        )
+        totals = run_dispatcher(
+            poll_interval=options["poll_interval"],
+            burst=options["burst"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dispatched {totals['events']} event(s): {totals['delivered']} "
+                f"delivery(ies) succeeded, {totals['failed']} failed, "
+                f"{totals['dead']} dead-lettered"
+            )
+        )
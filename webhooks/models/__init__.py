@@ -0,0 +1,3 @@
+from webhooks.models.outbox_event import *
+from webhooks.models.webhook_delivery import *
+from webhooks.models.webhook_endpoint import *
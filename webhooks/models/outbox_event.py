@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEvent(models.Model):
+    """
+    A change to report to the webhook endpoints of the owner, written in the
+    transaction of the change itself. `dispatch_webhooks` turns the rows into
+    webhook deliveries and deletes them, so the table stays small.
+    """
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    event_type = models.CharField(max_length=100)
+    # Events of the same object waiting for the same endpoint are coalesced
+    object_id = models.UUIDField(null=True, blank=True)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "outbox event"
+        verbose_name_plural = "outbox events"
+        db_table = "webhook_outbox"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.object_id})"
+
+    def to_payload(self) -> dict:
+        return {
+            "id": self.pk,
+            "type": self.event_type,
+            "object_id": self.object_id,
+            "data": self.data,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,49 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from webhooks.models.webhook_endpoint import WebhookEndpoint
+
+
+class WebhookDelivery(models.Model):
+    """
+    A batch of events POSTed to an endpoint. Delivered batches are deleted,
+    failed ones are retried with backoff until they are dead-lettered.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    endpoint = models.ForeignKey(
+        WebhookEndpoint, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    events = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "webhook delivery"
+        verbose_name_plural = "webhook deliveries"
+        db_table = "webhook_delivery"
+        ordering = ["id"]
+        indexes = [
+            # Dead letters are left out of the index the dispatcher polls
+            models.Index(
+                fields=["next_attempt_at"],
+                name="webhook_delivery_due_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint_id} ({self.status}, {len(self.events)} events)"
@@ -0,0 +1,36 @@
+import secrets
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from core.models import BaseModel
+
+
+def generate_webhook_secret() -> str:
+    return secrets.token_hex(32)
+
+
+class WebhookEndpoint(BaseModel):
+    """An URL the events of the owner are POSTed to by `dispatch_webhooks`."""
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="webhook_endpoints"
+    )
+    url = models.URLField(max_length=500)
+    # Key of the HMAC-SHA256 signature sent in the X-Webhook-Signature header
+    secret = models.CharField(max_length=64, default=generate_webhook_secret)
+    # Event types sent to the endpoint, all of them when empty
+    event_types = models.JSONField(default=list, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        verbose_name = "webhook endpoint"
+        verbose_name_plural = "webhook endpoints"
+        db_table = "webhook_endpoint"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return self.url
+
+    def accepts(self, event_type: str) -> bool:
+        return not self.event_types or event_type in self.event_types
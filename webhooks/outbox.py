@@ -0,0 +1,26 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from webhooks.models import OutboxEvent
+
+
+def add_outbox_event(
+    owner_id, event_type: str, data, object_id=None, using=DEFAULT_DB_ALIAS
+) -> OutboxEvent:
+    """
+    Queue an event for the webhook endpoints of the owner. Call it in the
+    transaction of the change it reports: the event is committed or rolled back
+    with it, and costs one INSERT however many endpoints will receive it.
+    """
+    return OutboxEvent.objects.using(using).create(
+        owner_id=owner_id, event_type=event_type, object_id=object_id, data=data
+    )
+
+
+def add_outbox_events(events, using=DEFAULT_DB_ALIAS) -> list:
+    """
+    `add_outbox_event` for several changes, given as dicts of its arguments,
+    queued with one INSERT.
+    """
+    return OutboxEvent.objects.using(using).bulk_create(
+        [OutboxEvent(**event) for event in events]
+    )
@@ -0,0 +1,220 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.factories import UserFactory
+from tasks.factories import TaskFactory
+from tasks.views import TaskViewSet
+from webhooks.dispatcher import (
+    FAN_OUT_LOCK_ID,
+    SIGNATURE_HEADER,
+    dispatch_once,
+    fan_out_outbox_events,
+    get_signature,
+    run_dispatcher,
+)
+from webhooks.models import OutboxEvent, WebhookDelivery, WebhookEndpoint
+from webhooks.outbox import add_outbox_event
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append((self.path, dict(self.headers), body))
+        self.send_response(self.server.statuses.get(self.path, 200))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class WebhookServerTestCase(TestCase):
+    """Endpoints pointing at a local HTTP server recording what it receives."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.received = []
+        cls.server.statuses = {}
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        self.server.received.clear()
+        self.server.statuses.clear()
+
+    def add_endpoint(self, path="/hook", **kwargs):
+        host, port = self.server.server_address
+        kwargs.setdefault("owner", self.user)
+        return WebhookEndpoint.objects.create(url=f"http://{host}:{port}{path}", **kwargs)
+
+
+class TestOutboxWrites(WebhookServerTestCase):
+    def test_task_writes_add_one_outbox_event_each(self):
+        factory = APIRequestFactory()
+        request = factory.post(
+            "/tasks/", {"title": "Ship", "due_date": "2030-01-01"}, format="json"
+        )
+        force_authenticate(request, user=self.user)
+        task_id = TaskViewSet.as_view({"post": "create"})(request).data["id"]
+        request = factory.patch(f"/tasks/{task_id}/", {"priority": 1}, format="json")
+        force_authenticate(request, user=self.user)
+        TaskViewSet.as_view({"patch": "partial_update"})(request, pk=task_id)
+
+        events = list(OutboxEvent.objects.values_list("event_type", "object_id"))
+        self.assertEqual(
+            [(event_type, str(object_id)) for event_type, object_id in events],
+            [("task.created", task_id), ("task.updated", task_id)],
+        )
+
+    def test_failed_write_adds_no_event(self):
+        request = APIRequestFactory().post("/tasks/", {"title": ""}, format="json")
+        force_authenticate(request, user=self.user)
+
+        response = TaskViewSet.as_view({"post": "create"})(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+class TestDispatcher(WebhookServerTestCase):
+    def test_events_are_coalesced_per_endpoint_and_object(self):
+        endpoint = self.add_endpoint()
+        self.add_endpoint("/deletions", event_types=["task.deleted"])
+        self.add_endpoint("/other", owner=UserFactory())
+        task, other_task = TaskFactory(owner=self.user), TaskFactory(owner=self.user)
+        add_outbox_event(self.user.pk, "task.updated", {"v": 1}, object_id=task.pk)
+        add_outbox_event(self.user.pk, "task.updated", {"v": 1}, object_id=other_task.pk)
+        add_outbox_event(self.user.pk, "task.updated", {"v": 2}, object_id=task.pk)
+        add_outbox_event(self.user.pk, "task.imported", {"created": 3})
+
+        # Advisory lock, row locks, endpoints, INSERT, DELETE, in the savepoint
+        # of the test transaction
+        with self.assertNumQueries(7):
+            self.assertEqual(fan_out_outbox_events(), 4)
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual(delivery.endpoint, endpoint)
+        self.assertEqual(
+            [(event["object_id"], event["data"]) for event in delivery.events],
+            [
+                (str(other_task.pk), {"v": 1}),
+                (str(task.pk), {"v": 2}),
+                (None, {"created": 3}),
+            ],
+        )
+
+    def test_dispatchers_fan_out_one_at_a_time(self):
+        self.add_endpoint()
+        add_outbox_event(self.user.pk, "task.imported", {"created": 1})
+        # Another dispatcher, fanning out on a connection of its own
+        other = connection.get_new_connection(connection.get_connection_params())
+        self.addCleanup(other.close)
+        with other.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [FAN_OUT_LOCK_ID])
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL lock_timeout = '100ms'")
+        with self.assertRaises(OperationalError):
+            fan_out_outbox_events()
+
+        other.rollback()
+        self.assertEqual(fan_out_outbox_events(), 1)
+
+    def test_deliveries_are_posted_signed_and_deleted(self):
+        first = self.add_endpoint("/first")
+        self.add_endpoint("/second")
+        add_outbox_event(self.user.pk, "task.imported", {"created": 3})
+
+        stats = dispatch_once()
+
+        self.assertEqual(stats, {"events": 1, "delivered": 2, "failed": 0, "dead": 0})
+        self.assertFalse(WebhookDelivery.objects.exists())
+        received = {path: (headers, body) for path, headers, body in self.server.received}
+        self.assertEqual(set(received), {"/first", "/second"})
+        headers, body = received["/first"]
+        self.assertEqual(headers[SIGNATURE_HEADER], get_signature(first.secret, body))
+        self.assertNotEqual(
+            received["/second"][0][SIGNATURE_HEADER], get_signature(first.secret, body)
+        )
+        self.assertEqual(json.loads(body)["events"][0]["type"], "task.imported")
+
+    @override_settings(WEBHOOKS_MAX_ATTEMPTS=2, WEBHOOKS_RETRY_DELAY=60)
+    def test_failed_deliveries_are_retried_with_backoff_then_dead_lettered(self):
+        self.server.statuses["/hook"] = 500
+        self.add_endpoint()
+        add_outbox_event(self.user.pk, "task.imported", {"created": 3})
+
+        stats = run_dispatcher(burst=True)
+
+        self.assertEqual(stats, {"events": 1, "delivered": 0, "failed": 1, "dead": 0})
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual(
+            (delivery.status, delivery.attempts, delivery.last_error),
+            (WebhookDelivery.STATUS_PENDING, 1, "HTTP 500"),
+        )
+        delay = delivery.next_attempt_at - timezone.now()
+        self.assertTrue(timedelta(seconds=25) < delay <= timedelta(seconds=60))
+
+        WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+        stats = dispatch_once()
+
+        self.assertEqual(stats["dead"], 1)
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts), ("dead", 2))
+        self.assertEqual(dispatch_once()["failed"], 0)
+        self.assertEqual(len(self.server.received), 2)
+
+    @override_settings(WEBHOOKS_RETRY_DELAY=60)
+    def test_endpoint_gets_one_delivery_at_a_time_oldest_first(self):
+        self.server.statuses["/hook"] = 500
+        self.add_endpoint()
+        self.add_endpoint("/other")
+        add_outbox_event(self.user.pk, "task.imported", {"created": 1})
+        fan_out_outbox_events()
+        add_outbox_event(self.user.pk, "task.imported", {"created": 2})
+
+        stats = dispatch_once()
+
+        # Each endpoint got its older batch, the one to /hook failed
+        self.assertEqual((stats["delivered"], stats["failed"]), (1, 1))
+        # The newer batch to /hook waits for the retry of the older one
+        self.assertEqual(
+            dispatch_once(), {"events": 0, "delivered": 1, "failed": 0, "dead": 0}
+        )
+
+        self.server.statuses.clear()
+        WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(dispatch_once()["delivered"], 1)
+        self.assertEqual(dispatch_once()["delivered"], 1)
+        created = [
+            json.loads(body)["events"][0]["data"]["created"]
+            for path, _, body in self.server.received
+            if path == "/hook"
+        ]
+        self.assertEqual(created, [1, 1, 2])
+
+    @override_settings(WEBHOOKS_TIMEOUT=1)
+    def test_unreachable_endpoint_does_not_hold_up_the_others(self):
+        self.add_endpoint()
+        WebhookEndpoint.objects.create(owner=self.user, url="http://127.0.0.1:9/hook")
+        add_outbox_event(self.user.pk, "task.imported", {"created": 3})
+
+        stats = dispatch_once()
+
+        self.assertEqual((stats["delivered"], stats["failed"]), (1, 1))
+        self.assertIn("ConnectError", WebhookDelivery.objects.get().last_error)